@@ -0,0 +1,91 @@
+"""
+Benchmark the disk space used by highlights, when the same figures are shown in many tiers and cells are re-run.
+
+Each of `--exps` experiments gets `--figures` highlights. Half the figures are shared by every experiment (e.g. a
+reference pattern), and every highlight is re-added `--reruns` times with the same outputs, as re-running a cell does.
+
+Usage:
+
+    python benchmarks/bench_blobs.py [--exps 20] [--figures 6] [--reruns 3] [--size 200000]
+"""
+
+import argparse
+import base64
+import contextlib
+import io
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from cassini import DEFAULT_TIERS, Project
+from cassini.config import config
+
+
+def figure(data: bytes):
+    return [
+        {
+            "data": {
+                "image/png": base64.b64encode(data).decode(),
+                "text/plain": "<Figure size 640x480 with 1 Axes>",
+            },
+            "metadata": {},
+        }
+    ]
+
+
+def disk_usage(folder: Path) -> int:
+    return sum(path.stat().st_size for path in folder.rglob("*") if path.is_file())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--exps", type=int, default=20)
+    parser.add_argument("--figures", type=int, default=6)
+    parser.add_argument("--reruns", type=int, default=3)
+    parser.add_argument("--size", type=int, default=200_000)
+    args = parser.parse_args()
+
+    shared = [figure(os.urandom(args.size)) for _ in range(args.figures // 2)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        project = Project(DEFAULT_TIERS, root)
+        exps = [project[f"WP1.{i}"] for i in range(1, args.exps + 1)]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            project.setup_files()
+            project["WP1"].setup_files()
+            for exp in exps:
+                exp.setup_files()
+
+        start = time.perf_counter()
+
+        for exp in exps:
+            own = [
+                figure(os.urandom(args.size)) for _ in range(args.figures - len(shared))
+            ]
+            for _ in range(args.reruns):
+                for i, outputs in enumerate(shared + own):
+                    exp.add_highlight(f"Figure {i}", outputs)
+
+        added = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for exp in exps:
+            exp.get_highlights()
+        read = time.perf_counter() - start
+
+        highlights = disk_usage(root / "WorkPackages")
+        blobs_folder = root / config.CASSINI_DIR / "blobs"
+        blobs = disk_usage(blobs_folder) if blobs_folder.exists() else 0
+
+        print(f"add highlights   {added:>8.3f}s")
+        print(f"read highlights  {read:>8.3f}s")
+        print(f"highlights files {highlights / 2**20:>8.1f}MiB")
+        print(f"blobs            {blobs / 2**20:>8.1f}MiB")
+        print(f"total            {(highlights + blobs) / 2**20:>8.1f}MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark constructing tiers: repeated lookups of the same tier, and iterating over a tier with many children, along
+with the memory allocated while doing so.
+
+Usage:
+
+    python benchmarks/bench_construct.py [--children 10000] [--lookups 100000]
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from cassini import DEFAULT_TIERS, Project
+
+from bench_walk import make_tier
+
+
+def timed(label, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<26} {elapsed:>8.3f}s  peak {peak / 2**20:>7.1f}MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--children", type=int, default=10_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        home = root / "WorkPackages"
+        home.mkdir()
+        make_tier(home, ".wps", "WP1")
+        make_tier(home / "WP1", ".exps", "WP1.1")
+
+        for i in range(args.children):
+            make_tier(home / "WP1" / "WP1.1", ".smpls", f"WP1.1s{i}", has_folder=False)
+
+        project = Project(DEFAULT_TIERS, root)
+        exp = project["WP1.1"]
+
+        def lookups():
+            for _ in range(args.lookups):
+                project["WP1.1s1"]
+
+        def iterate():
+            for smpl in exp:
+                smpl.meta
+
+        timed(f"{args.lookups} lookups", lookups)
+        timed(f"iterate {args.children} (first)", iterate)
+        timed(f"iterate {args.children} (again)", iterate)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark listing the datasets of every sample in an experiment, as rendering each sample's header does.
+
+An experiment with `--smpls` samples is laid out on disk, with a folder for each of `--techniques` techniques, each
+holding a dataset for every other sample.
+
+Usage:
+
+    python benchmarks/bench_datasets.py [--smpls 300] [--techniques 15] [--repeats 5]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from cassini import DEFAULT_TIERS, Project
+
+from bench_walk import make_tier
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--smpls", type=int, default=300)
+    parser.add_argument("--techniques", type=int, default=15)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        home = root / "WorkPackages"
+        home.mkdir()
+        make_tier(home, ".wps", "WP1")
+        make_tier(home / "WP1", ".exps", "WP1.1")
+        exp_folder = home / "WP1" / "WP1.1"
+
+        for i in range(args.smpls):
+            make_tier(exp_folder, ".smpls", f"WP1.1s{i}", has_folder=False)
+
+        for t in range(args.techniques):
+            (exp_folder / f"tech{t}").mkdir()
+            for i in range(0, args.smpls, 2):
+                (exp_folder / f"tech{t}" / f"s{i}").mkdir()
+
+        project = Project(DEFAULT_TIERS, root)
+        smpls = list(project["WP1.1"])
+
+        for repeat in range(args.repeats):
+            start = time.perf_counter()
+            count = sum(len(smpl.datasets) for smpl in smpls)
+            elapsed = time.perf_counter() - start
+            print(
+                f"pass {repeat}: {len(smpls)} samples, {count} datasets in {elapsed:.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
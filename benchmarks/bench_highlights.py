@@ -0,0 +1,89 @@
+"""
+Benchmark adding a highlight to, and listing the titles of, a tier with many large highlights (e.g. matplotlib
+figures, stored as base64 pngs).
+
+Uses `tier.highlights` for listing titles if available, otherwise `tier.get_highlights()`. If highlights can be added in
+the background (as the `%%hlt` magic does), the time the caller waits for that is reported too.
+
+Usage:
+
+    python benchmarks/bench_highlights.py [--highlights 50] [--size 500000] [--repeats 20]
+"""
+
+import argparse
+import base64
+import contextlib
+import io
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from cassini import DEFAULT_TIERS, Project
+
+
+def figure(size: int):
+    return [
+        {
+            "data": {
+                "image/png": base64.b64encode(os.urandom(size)).decode(),
+                "text/plain": "<Figure size 640x480 with 1 Axes>",
+            },
+            "metadata": {},
+        }
+    ]
+
+
+def timed(label, func, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    elapsed = (time.perf_counter() - start) / repeats
+    print(f"{label:<20} {elapsed * 1000:>9.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--highlights", type=int, default=50)
+    parser.add_argument("--size", type=int, default=500_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Project(DEFAULT_TIERS, Path(tmp))
+        tier = project["WP1.1"]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            project.setup_files()
+            project["WP1"].setup_files()
+            tier.setup_files()
+
+        for i in range(args.highlights):
+            tier.add_highlight(f"Figure {i}", figure(args.size))
+
+        store = getattr(tier, "highlights", None)
+
+        def titles():
+            if store is not None:
+                return store.titles()
+            return list(tier.get_highlights())
+
+        new = figure(args.size)
+        size = sum(f.stat().st_size for f in tier.highlights_file.parent.rglob("*"))
+
+        print(f"{args.highlights} highlights, {size / 2**20:.1f}MiB on disk")
+        timed("list titles", titles, args.repeats)
+        timed("add highlight", lambda: tier.add_highlight("New", new), args.repeats)
+        timed("remove highlight", lambda: tier.remove_highlight("Figure 0"), 1)
+
+        if store is not None and hasattr(store, "flush"):
+            timed(
+                "add in background",
+                lambda: tier.add_highlight("New", new, background=True),
+                args.repeats,
+            )
+            timed("flush", store.flush, 1)
+
+
+if __name__ == "__main__":
+    main()
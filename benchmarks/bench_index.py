@@ -0,0 +1,70 @@
+"""
+Benchmark listing a whole project, with descriptions, from the filesystem against from `project.index`.
+
+Uses the same synthetic project as `bench_walk.py`. "cold" times are for a fresh interpreter state, i.e. with cassini's
+caches cleared and a new connection to the index.
+
+Usage:
+
+    python benchmarks/bench_index.py [--wps 20] [--exps 25] [--smpls 20]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from cassini import DEFAULT_TIERS, NotebookTierBase, Project
+
+from bench_walk import clear, make_project
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<22} {time.perf_counter() - start:>8.3f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--wps", type=int, default=20)
+    parser.add_argument("--exps", type=int, default=25)
+    parser.add_argument("--smpls", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        count = make_project(root, args.wps, args.exps, args.smpls)
+        project = Project(DEFAULT_TIERS, root)
+
+        def walk():
+            return [
+                (
+                    tier.name,
+                    tier.description if isinstance(tier, NotebookTierBase) else None,
+                )
+                for tier in project.walk(workers=8)
+            ]
+
+        def from_index():
+            project.index.close()
+            return [
+                (entry.name, entry.meta.get("description")) for entry in project.index
+            ]
+
+        clear()
+        walked = timed("walk + read meta", walk)
+
+        clear()
+        timed("index.rebuild", lambda: project.index.rebuild(workers=8))
+        timed("index.refresh", lambda: project.index.refresh(workers=8))
+
+        clear()
+        listed = timed("list from index", from_index)
+
+        assert len(walked) == len(listed) == count
+
+
+if __name__ == "__main__":
+    main()
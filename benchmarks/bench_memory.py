@@ -0,0 +1,57 @@
+"""
+Benchmark the memory cassini keeps hold of after walking a whole project and reading every tier's meta, as a long
+running kernel or batch job would.
+
+Uses the same synthetic project as `bench_walk.py`. Memory is measured with `tracemalloc` after the walk, once
+nothing outside cassini references any tiers.
+
+Usage:
+
+    python benchmarks/bench_memory.py [--wps 20] [--exps 25] [--smpls 20]
+"""
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from cassini import DEFAULT_TIERS, NotebookTierBase, Project
+
+from bench_walk import make_project
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--wps", type=int, default=20)
+    parser.add_argument("--exps", type=int, default=25)
+    parser.add_argument("--smpls", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        count = make_project(root, args.wps, args.exps, args.smpls)
+        project = Project(DEFAULT_TIERS, root)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+
+        for tier in project.walk(workers=8):
+            if isinstance(tier, NotebookTierBase):
+                tier.description
+
+        del tier
+        elapsed = time.perf_counter() - start
+        gc.collect()
+
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"walked {count} tiers in {elapsed:.3f}s")
+        print(f"peak     {peak / 2**20:>7.1f}MiB")
+        print(f"retained {current / 2**20:>7.1f}MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark the `FileMetaBackend` against the `SQLiteMetaBackend` for projects with many tiers.
+
+For each size, this times writing the meta of that many tiers, reading it all back with fresh `Meta` objects and
+listing the names in the meta folder (as `iter_siblings` does).
+
+Usage:
+
+    python benchmarks/bench_meta_backends.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import datetime
+import tempfile
+import time
+from pathlib import Path
+
+from cassini.backends import FileMetaBackend, SQLiteMetaBackend
+from cassini.meta import Meta
+
+
+def bench(backend, folder: Path, size: int):
+    files = [folder / f"WP{i}.json" for i in range(size)]
+    started = datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+    start = time.perf_counter()
+    for i, file in enumerate(files):
+        meta = Meta(file, backend=backend)
+        with meta.transaction():
+            meta["description"] = f"Work package {i}"
+            meta["started"] = started
+    write = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for file in files:
+        Meta(file, backend=backend)["description"]
+    read = time.perf_counter() - start
+
+    start = time.perf_counter()
+    names = list(backend.iter_names(folder))
+    listing = time.perf_counter() - start
+
+    assert len(names) == size
+
+    return write, read, listing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    args = parser.parse_args()
+
+    print(f"{'backend':<8} {'tiers':>7} {'write':>9} {'read':>9} {'list':>9}")
+
+    for size in args.sizes:
+        for label in ["file", "sqlite"]:
+            with tempfile.TemporaryDirectory() as tmp:
+                root = Path(tmp)
+                folder = root / ".wps"
+                folder.mkdir()
+
+                if label == "file":
+                    backend = FileMetaBackend()
+                else:
+                    backend = SQLiteMetaBackend(root)
+
+                write, read, listing = bench(backend, folder, size)
+
+                if isinstance(backend, SQLiteMetaBackend):
+                    backend.close()
+
+            print(
+                f"{label:<8} {size:>7} {write:>8.2f}s {read:>8.2f}s {listing:>8.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark the per-read cost of `Meta` for a model with the default `description`/ `conclusion`/ `started` fields.
+
+Each read invalidates the cache first, so every access goes through `Meta.fetch`, as it would when a fresh `Meta`
+object is created for a tier, or a stale cache is refreshed.
+
+Usage:
+
+    python benchmarks/bench_meta_reads.py [--reads N] [--extra-kb K]
+
+`--extra-kb` adds an extra field of roughly that size, to show the effect of larger meta files.
+"""
+
+import argparse
+import datetime
+import tempfile
+import timeit
+from pathlib import Path
+
+from pydantic import AwareDatetime
+
+from cassini.meta import Meta, MetaAttr
+
+
+class Tier:
+    description = MetaAttr(str, str)
+    conclusion = MetaAttr(str, str)
+    started = MetaAttr(AwareDatetime, datetime.datetime)
+
+
+def bench(file: Path, reads: int, **policies) -> float:
+    meta = Meta(file, Meta.build_meta_model(Tier), **policies)
+
+    def read():
+        meta.invalidate()
+        return meta["description"]
+
+    read()  # warm up
+    return timeit.timeit(read, number=reads) / reads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reads", type=int, default=20_000)
+    parser.add_argument("--extra-kb", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file = Path(tmp) / "WP1.json"
+
+        meta = Meta(file, Meta.build_meta_model(Tier))
+        with meta.transaction():
+            meta["description"] = "Anneal the samples at increasing temperatures. " * 4
+            meta["conclusion"] = "Peak shift observed above 400C."
+            meta["started"] = datetime.datetime.now(datetime.timezone.utc)
+            if args.extra_kb:
+                meta["fit_params"] = [0.123456789] * (args.extra_kb * 1024 // 13)
+
+        print(f"meta file size: {file.stat().st_size} bytes, {args.reads} reads")
+
+        for label, policies in [
+            ("validation='always'", dict(validation="always")),
+            ("validation='cached'", dict(validation="cached")),
+        ]:
+            per_read = bench(file, args.reads, **policies)
+            print(f"{label:<24} {per_read * 1e6:8.2f} us/read")
+
+
+if __name__ == "__main__":
+    main()
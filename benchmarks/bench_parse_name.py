@@ -0,0 +1,85 @@
+"""
+Micro-benchmark of `Project.parse_name` on synthetic names from the default hierarchy.
+
+Compares the original implementation (`re.search` with pattern strings, slicing after each level), the compiled parser
+without its memo, and `parse_name` itself, where names repeat as they do when the same tiers are looked up over and
+over.
+
+Usage:
+
+    python benchmarks/bench_parse_name.py [--names 1000000] [--unique 10000]
+"""
+
+import argparse
+import random
+import re
+import tempfile
+import time
+from typing import List, Tuple
+
+from cassini import DEFAULT_TIERS, Project
+
+
+def original_parse_name(project: Project, name: str) -> Tuple[str, ...]:
+    ids: List[str] = []
+    for tier_cls in project.hierarchy[1:]:
+        match = re.search(tier_cls.name_part_regex, name)
+        if match and match.start(0) == 0:
+            ids.append(match.group(1))
+            name = name[match.end(0) :]
+        else:
+            break
+    if name:
+        return tuple()
+    else:
+        return tuple(ids)
+
+
+def make_names(count: int, unique: int) -> List[str]:
+    rng = random.Random(0)
+    pool = []
+
+    for _ in range(unique):
+        name = f"WP{rng.randint(1, 50)}"
+        depth = rng.randint(0, 3)
+        if depth > 0:
+            name += f".{rng.randint(1, 40)}"
+        if depth > 1:
+            name += rng.choice("abcdefgh") + str(rng.randint(0, 9))
+        if depth > 2:
+            name += f"-{rng.choice(['xrd', 'sem', 'raman'])}"
+        if rng.random() < 0.1:
+            name = "X" + name  # invalid
+        pool.append(name)
+
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def timed(label, func, names):
+    start = time.perf_counter()
+    results = [func(name) for name in names]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed:>8.3f}s  {elapsed / len(names) * 1e9:>6.0f}ns/name")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--names", type=int, default=1_000_000)
+    parser.add_argument("--unique", type=int, default=10_000)
+    args = parser.parse_args()
+
+    names = make_names(args.names, args.unique)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Project(DEFAULT_TIERS, tmp)
+
+        expected = timed(
+            "original", lambda name: original_parse_name(project, name), names
+        )
+        assert timed("compiled", project._parse_name, names) == expected
+        assert timed("compiled + memo", project.parse_name, names) == expected
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark finding samples by their meta with `Project.query`, against looping over every tier by hand.
+
+Uses the same synthetic project as `bench_walk.py`, with a description and start date written to each sample's meta.
+
+Usage:
+
+    python benchmarks/bench_query.py [--wps 20] [--exps 25] [--smpls 20]
+"""
+
+import argparse
+import datetime
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from cassini import DEFAULT_TIERS, Project, Sample
+
+from bench_walk import clear, make_project, recurse
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<22} {time.perf_counter() - start:>8.3f}s")
+    return result
+
+
+def fill_meta(root: Path) -> None:
+    start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+    for i, file in enumerate(sorted(root.glob("**/.smpls/*.json"))):
+        started = start + datetime.timedelta(hours=i)
+        description = "annealed" if i % 7 == 0 else "as deposited"
+        file.write_text(
+            json.dumps({"description": description, "started": started.isoformat()})
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--wps", type=int, default=20)
+    parser.add_argument("--exps", type=int, default=25)
+    parser.add_argument("--smpls", type=int, default=20)
+    args = parser.parse_args()
+
+    march = datetime.datetime(2024, 3, 1, tzinfo=datetime.timezone.utc)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_project(root, args.wps, args.exps, args.smpls)
+        fill_meta(root)
+        project = Project(DEFAULT_TIERS, root)
+
+        def by_hand():
+            found = [
+                tier
+                for tier in recurse(project.home)
+                if isinstance(tier, Sample)
+                and tier.started
+                and tier.started >= march
+                and "anneal" in tier.description
+            ]
+            found.sort(key=lambda tier: tier.started, reverse=True)
+            return [tier.name for tier in found[:50]]
+
+        def query():
+            return [
+                row.name
+                for row in project.query(Sample, workers=8)
+                .where(started__gte=march, description__contains="anneal")
+                .order_by("-started")
+                .limit(50)
+                .fields("description")
+            ]
+
+        clear()
+        expected = timed("by hand", by_hand)
+
+        clear()
+        assert timed("query (scan)", query) == expected
+
+        project.index.rebuild(workers=8)
+        project.index.serve = True
+
+        clear()
+        assert timed("query (index)", query) == expected
+
+
+if __name__ == "__main__":
+    main()
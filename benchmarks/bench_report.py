@@ -0,0 +1,87 @@
+"""
+Benchmark building a highlights report of a whole project, then rebuilding it after one tier's highlights are edited.
+
+A project is laid out as in `bench_walk.py`, and each experiment and sample is given a highlight with a small figure
+and a caption. For reference, the time taken to just read every tier's highlights with `get_highlights()` is also
+reported.
+
+Usage:
+
+    python benchmarks/bench_report.py [--wps 10] [--exps 20] [--smpls 24] [--size 20000] [--format html]
+"""
+
+import argparse
+import base64
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from cassini import DEFAULT_TIERS, Experiment, NotebookTierBase, Project, Sample
+
+from bench_walk import make_project
+
+
+def highlight(size: int):
+    return [
+        {"data": {"image/png": base64.b64encode(os.urandom(size)).decode()}},
+        {"data": {"text/markdown": "Peak shifts by *0.2 degrees*"}},
+    ]
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<28} {time.perf_counter() - start:>7.2f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--wps", type=int, default=10)
+    parser.add_argument("--exps", type=int, default=20)
+    parser.add_argument("--smpls", type=int, default=24)
+    parser.add_argument("--size", type=int, default=20_000)
+    parser.add_argument("--format", default="html")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "project"
+        root.mkdir()
+        count = make_project(root, args.wps, args.exps, args.smpls)
+        project = Project(DEFAULT_TIERS, root)
+
+        tiers = [
+            tier for tier in project.walk() if isinstance(tier, (Experiment, Sample))
+        ]
+
+        for tier in tiers:
+            tier.add_highlight("Figure", highlight(args.size))
+
+        print(f"{count} tiers, {len(tiers)} with highlights")
+        out = Path(tmp) / "report"
+
+        def read_all():
+            for tier in project.walk():
+                if isinstance(tier, NotebookTierBase):
+                    tier.get_highlights()
+
+        timed("get_highlights() every tier", read_all)
+        timed(
+            "build report",
+            lambda: project.highlights_report(None, out, format=args.format),
+        )
+        timed(
+            "rebuild, nothing changed",
+            lambda: project.highlights_report(None, out, format=args.format),
+        )
+
+        tiers[len(tiers) // 2].add_highlight("Edit", highlight(args.size))
+        timed(
+            "rebuild after one edit",
+            lambda: project.highlights_report(None, out, format=args.format),
+        )
+
+
+if __name__ == "__main__":
+    main()
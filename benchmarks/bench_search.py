@@ -0,0 +1,92 @@
+"""
+Benchmark full-text search with `Project.search`, against scanning every tier's meta for the words.
+
+Uses the same synthetic project as `bench_walk.py`, with a random description and conclusion written to each tier's
+meta.
+
+Usage:
+
+    python benchmarks/bench_search.py [--wps 20] [--exps 25] [--smpls 20]
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from cassini import DEFAULT_TIERS, Experiment, NotebookTierBase, Project
+
+from bench_walk import clear, make_project
+
+WORDS = (
+    "xrd peak shift anneal annealed strain film substrate deposited sputtered oxide thickness roughness "
+    "afm sem tem raman spectrum band gap absorption grain boundary crack temperature pressure sample repeat"
+).split()
+
+
+def timed(label, func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    print(f"{label:<22} {(time.perf_counter() - start) / repeat:>8.4f}s")
+    return result
+
+
+def fill_meta(root: Path) -> None:
+    rng = random.Random(0)
+
+    for file in root.glob("**/.*/*.json"):
+        file.write_text(
+            json.dumps(
+                {
+                    "description": " ".join(rng.choices(WORDS, k=12)),
+                    "conclusion": " ".join(rng.choices(WORDS, k=20)),
+                }
+            )
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--wps", type=int, default=20)
+    parser.add_argument("--exps", type=int, default=25)
+    parser.add_argument("--smpls", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_project(root, args.wps, args.exps, args.smpls)
+        fill_meta(root)
+        project = Project(DEFAULT_TIERS, root)
+
+        def scan():
+            return [
+                tier.name
+                for tier in project.walk(workers=8)
+                if isinstance(tier, NotebookTierBase)
+                and all(
+                    word in f"{tier.description} {tier.conclusion}".split()
+                    for word in ("xrd", "peak", "shift")
+                )
+            ]
+
+        clear()
+        timed("scan", scan)
+
+        clear()
+        timed("search_index.rebuild", lambda: project.search_index.rebuild(workers=8))
+        timed("search_index.update", lambda: project.search_index.update(workers=8))
+
+        timed("search", lambda: project.search("XRD peak shift"), repeat=20)
+        timed(
+            "search experiments",
+            lambda: project.search("XRD peak shift", tier_types=[Experiment]),
+            repeat=20,
+        )
+        timed("search prefix", lambda: project.search("anneal*"), repeat=20)
+
+
+if __name__ == "__main__":
+    main()
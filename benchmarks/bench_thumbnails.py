@@ -0,0 +1,87 @@
+"""
+Benchmark loading the highlights of a tier with many plots for its header, with full size images against thumbnails.
+
+Each highlight is a random noise png of `--pixels` square (noise doesn't compress, so is a worst case for size). The
+amount of data that would be sent to the browser, and the time taken to load it, is reported for full size images,
+for thumbnails made for the first time, and for cached thumbnails. Requires Pillow.
+
+Usage:
+
+    python benchmarks/bench_thumbnails.py [--highlights 30] [--pixels 800] [--repeats 5]
+"""
+
+import argparse
+import base64
+import contextlib
+import io
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from cassini import DEFAULT_TIERS, Project
+
+
+def figure(pixels: int):
+    image = Image.frombytes("RGB", (pixels, pixels), os.urandom(pixels * pixels * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return [
+        {
+            "data": {
+                "image/png": base64.b64encode(buffer.getvalue()).decode(),
+                "text/plain": "<Figure size 800x800 with 1 Axes>",
+            },
+            "metadata": {},
+        }
+    ]
+
+
+def load_all(store, thumbnails):
+    sent = 0
+    for name in store.titles():
+        for output in store.load(name, thumbnails=thumbnails):
+            sent += sum(len(value) for value in output["data"].values())
+    return sent
+
+
+def timed(label, func, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        sent = func()
+    elapsed = (time.perf_counter() - start) / repeats
+    print(f"{label:<20} {sent / 2**20:>7.2f}MiB {elapsed * 1000:>9.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--highlights", type=int, default=30)
+    parser.add_argument("--pixels", type=int, default=800)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Project(DEFAULT_TIERS, Path(tmp))
+        tier = project["WP1.1"]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            project.setup_files()
+            project["WP1"].setup_files()
+            tier.setup_files()
+
+        for i in range(args.highlights):
+            tier.add_highlight(f"Figure {i}", figure(args.pixels))
+
+        store = tier.highlights
+        thumbnails = project.thumbnails
+
+        print(f"{args.highlights} highlights, thumbnails {thumbnails.max_size}px")
+        timed("full size", lambda: load_all(store, None), args.repeats)
+        timed("thumbnails, new", lambda: load_all(store, thumbnails), 1)
+        timed("thumbnails, cached", lambda: load_all(store, thumbnails), args.repeats)
+
+
+if __name__ == "__main__":
+    main()
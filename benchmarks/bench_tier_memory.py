@@ -0,0 +1,52 @@
+"""
+Benchmark the memory used by each tier object, measured with `tracemalloc`.
+
+Creates samples in a single experiment by name, as a notebook or the index would, and reports the bytes allocated per
+tier while they're all alive: just after construction, and again once their paths (`folder`, `file`, `meta_file`,
+`highlights_file`) have been used.
+
+Usage:
+
+    python benchmarks/bench_tier_memory.py [--tiers 100000]
+"""
+
+import argparse
+import gc
+import tempfile
+import tracemalloc
+
+from cassini import DEFAULT_TIERS, Project
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tiers", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Project(DEFAULT_TIERS, tmp)
+        names = [f"WP1.1s{i}" for i in range(args.tiers)]
+        exp = project["WP1.1"]
+        exp.folder  # the shared parent, isn't counted.
+
+        gc.collect()
+        tracemalloc.start()
+        start, _ = tracemalloc.get_traced_memory()
+
+        tiers = [project[name] for name in names]
+        constructed, _ = tracemalloc.get_traced_memory()
+
+        for tier in tiers:
+            tier.folder, tier.file, tier.meta_file, tier.highlights_file
+
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        per_tier = (constructed - start) / len(tiers)
+        print(f"constructed  {per_tier:>7.0f} bytes/tier")
+        per_tier = (used - start) / len(tiers)
+        print(f"paths used   {per_tier:>7.0f} bytes/tier")
+
+
+if __name__ == "__main__":
+    main()
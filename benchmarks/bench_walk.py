@@ -0,0 +1,109 @@
+"""
+Benchmark walking a whole project with `Project.walk`, against recursively iterating over each tier's children.
+
+A project with the default tiers is laid out on disk directly (without rendering notebooks), with `--wps` work
+packages, each with `--exps` experiments, each with `--smpls` samples.
+
+`--latency` adds a delay to each `os.scandir` call, to simulate a network drive.
+
+Usage:
+
+    python benchmarks/bench_walk.py [--wps 20] [--exps 25] [--smpls 20] [--workers 1 8 32] [--latency 0.002]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from cassini import DEFAULT_TIERS, Project, env
+
+
+def make_tier(folder: Path, meta_folder: str, name: str, has_folder: bool = True):
+    (folder / meta_folder).mkdir(exist_ok=True)
+    (folder / meta_folder / f"{name}.json").write_text("{}")
+    (folder / f"{name}.ipynb").write_text("{}")
+    if has_folder:
+        (folder / name).mkdir()
+
+
+def make_project(root: Path, wps: int, exps: int, smpls: int) -> int:
+    home = root / "WorkPackages"
+    home.mkdir()
+    count = 1
+
+    for i in range(1, wps + 1):
+        wp = f"WP{i}"
+        make_tier(home, ".wps", wp)
+        count += 1
+
+        for j in range(1, exps + 1):
+            exp = f"{wp}.{j}"
+            make_tier(home / wp, ".exps", exp)
+            count += 1
+
+            for k in range(smpls):
+                make_tier(home / wp / exp, ".smpls", f"{exp}s{k}", has_folder=False)
+                count += 1
+
+    return count
+
+
+def recurse(tier):
+    yield tier
+
+    if tier.child_cls:
+        for child in tier:
+            yield from recurse(child)
+
+
+def clear():
+    for cache in env._caches:
+        cache.clear()
+
+
+def add_latency(latency: float):
+    scandir = os.scandir
+
+    def slow_scandir(path):
+        time.sleep(latency)
+        return scandir(path)
+
+    os.scandir = slow_scandir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--wps", type=int, default=20)
+    parser.add_argument("--exps", type=int, default=25)
+    parser.add_argument("--smpls", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        count = make_project(root, args.wps, args.exps, args.smpls)
+        project = Project(DEFAULT_TIERS, root)
+
+        if args.latency:
+            add_latency(args.latency)
+
+        clear()
+        start = time.perf_counter()
+        found = sum(1 for _ in recurse(project.home))
+        print(f"{'recursive':<14} {found:>7} tiers {time.perf_counter() - start:>8.3f}s")
+        assert found == count
+
+        for workers in args.workers:
+            clear()
+            start = time.perf_counter()
+            found = sum(1 for _ in project.walk(workers=workers))
+            label = f"walk({workers})"
+            print(f"{label:<14} {found:>7} tiers {time.perf_counter() - start:>8.3f}s")
+            assert found == count
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,14 @@
 import functools
+import types
+import weakref
 
 from typing import (
     Callable,
     Union,
     Any,
     cast,
-    Dict,
     List,
+    MutableMapping,
     Tuple,
     TypeVar,
     Generic,
@@ -21,6 +23,10 @@ from .environment import env
 T = TypeVar("T")
 V = TypeVar("V")
 
+_missing: Any = object()
+
+_prop_counter = env.create_counter("cached_prop")
+
 
 class _SoftProp(Generic[T, V]):
     """
@@ -78,15 +84,27 @@ class _CachedProp(Generic[T, V]):
     """
     Like a read only property, except it's only evaluated once.
 
-    Cached value is stored in the _CachedProp instance, which is maybe a bad idea, idk.
+    Cached value is stored in the instance's `__dict__` under `_cached_<name>`, so it lives only as long as the instance
+    does. Classes using `__slots__` can instead declare a slot of the same name, which is used if the instance has one.
+
+    Instances with neither (e.g. of a subclass defining `__slots__ = ()`) have their value kept in a
+    `weakref.WeakKeyDictionary` belonging to the property, so must support weak references.
     """
 
     def __init__(self, func: Callable[[T], V]):
         self.func = func
-        self.cache: Dict[T, V] = env.create_cache()
+        self.key = f"_cached_{func.__name__}"
+        self.slot: Optional[Any] = None
+        self.values: MutableMapping[Any, V] = weakref.WeakKeyDictionary()
 
         self.__wrapped__ = func
 
+    def __set_name__(self, owner: Type[T], name: str) -> None:
+        slot = getattr(owner, self.key, None)
+
+        if isinstance(slot, types.MemberDescriptorType):
+            self.slot = slot
+
     @overload
     def __get__(self, instance: None, owner: Type[T]) -> Self:
         pass
@@ -99,13 +117,50 @@ class _CachedProp(Generic[T, V]):
         if instance is None:
             return self
 
-        if instance in self.cache:
-            return self.cache[instance]
+        slot = self.slot
+
+        if slot is not None:
+            try:
+                value = slot.__get__(instance, owner)
+            except AttributeError:
+                _prop_counter.miss()
+                value = self.func(instance)
+                slot.__set__(instance, value)
+                return value
+
+            _prop_counter.hit()
+            return value
+
+        cache = getattr(instance, "__dict__", None)
+
+        if cache is None:
+            return self._get_weak(instance)
+
+        try:
+            value = cache[self.key]
+        except KeyError:
+            _prop_counter.miss()
+            return cache.setdefault(self.key, self.func(instance))
+
+        _prop_counter.hit()
+        return value
+
+    def _get_weak(self, instance: T) -> V:
+        values = self.values
 
-        val = self.func(instance)
-        self.cache[instance] = val
+        try:
+            value = values[instance]
+        except KeyError:
+            _prop_counter.miss()
+            return values.setdefault(instance, self.func(instance))
+        except TypeError:
+            raise TypeError(
+                f"Can't cache {self.func.__qualname__} for {type(instance).__name__}, it has no __dict__, "
+                f"{self.key} slot or __weakref__"
+            ) from None
 
-        return val
+        _prop_counter.hit()
+        return value
 
     def __set__(self, instance: Optional[T], value: Any) -> None:
         raise AttributeError("Trying to set a cached property - naughty!")
@@ -152,18 +207,20 @@ class _CachedClassProp(Generic[T, V]):
 
     def __init__(self, func: Callable[[Type[T]], V]):
         self.func = func
-        self.cache: Dict[Type[T], V] = env.create_cache()
+        self.cache: MutableMapping[Type[T], V] = env.create_cache(
+            f"class_prop.{func.__qualname__}"
+        )
 
         self.__wrapped__ = func
 
     def __get__(self, instance: T, owner: Type[T]) -> V:
-        if owner in self.cache:
-            return self.cache[owner]
+        val = self.cache.get(owner, _missing)
 
-        val = self.func(owner)
-        self.cache[owner] = val
+        if val is _missing:
+            val = self.func(owner)
+            self.cache[owner] = val
 
-        return val
+        return cast(V, val)
 
     def __set__(self, instance: T, value: Any) -> Any:
         raise AttributeError("Trying to set a cached class property - naughty!")
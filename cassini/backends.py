@@ -0,0 +1,575 @@
+"""
+Storage backends for [Meta][cassini.meta.Meta] objects.
+
+By default, each tier's meta is stored in its own json file (see [FileMetaBackend][cassini.backends.FileMetaBackend]).
+
+For projects with very many tiers, this can mean a lot of tiny files, which can be slow on network drives and to back
+up. [SQLiteMetaBackend][cassini.backends.SQLiteMetaBackend] instead stores all the meta of a project in a single
+SQLite database, and [ConsolidatedMetaBackend][cassini.backends.ConsolidatedMetaBackend] stores the meta of all the
+children of a tier in a single file.
+
+A `Project` can be told which backend to use:
+
+```python
+from cassini import Project, DEFAULT_TIERS
+from cassini.backends import SQLiteMetaBackend
+
+project = Project(DEFAULT_TIERS, __file__, meta_backend=SQLiteMetaBackend(Path(__file__).parent))
+```
+
+And an existing project can be converted from one backend to another with
+[convert_meta_backend][cassini.backends.convert_meta_backend].
+
+Backends are keyed by the path to where the meta file would be, i.e. `Meta.file`, so the rest of cassini doesn't need to
+know which one is being used.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import (
+    ClassVar,
+    ContextManager,
+    Dict,
+    Hashable,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
+
+from .config import config
+from .utils import (
+    FileLock,
+    FileMaker,
+    StatSignature,
+    atomic_write,
+    stat_signature,
+)
+
+if TYPE_CHECKING:
+    from .core import Project
+
+
+_folder_locks: Dict[Path, FileLock] = {}
+_folder_locks_lock = threading.Lock()
+
+
+def folder_lock(folder: Path) -> FileLock:
+    """
+    Get the lock for the entries stored in `folder`.
+
+    The folder itself is locked, so nothing is added to it, except on Windows, where folders can't be locked, so the
+    file `folder / config.LOCK_NAME` is used instead.
+
+    The same `FileLock` is returned for the same folder, so it can be safely re-acquired within a thread.
+    """
+    with _folder_locks_lock:
+        lock = _folder_locks.get(folder)
+        if lock is None:
+            if sys.platform == "win32":
+                lock = FileLock(folder / config.LOCK_NAME)
+            else:
+                lock = FileLock(folder, folder=True)
+            _folder_locks[folder] = lock
+        return lock
+
+
+class MetaBackend(ABC):
+    """
+    Base class for storing the contents of `Meta` objects.
+
+    Each entry is identified by the path to its meta file. Backends that don't store meta in files just use this path
+    as a key.
+    """
+
+    @abstractmethod
+    def signature(self, file: Path) -> Optional[Hashable]:
+        """
+        Cheap fingerprint of the stored entry, that changes whenever its contents does.
+
+        Returns `None` if the entry doesn't exist.
+        """
+
+    @abstractmethod
+    def read(self, file: Path) -> Optional[bytes]:
+        """
+        Read the json contents of an entry. Returns `None` if it doesn't exist.
+        """
+
+    @abstractmethod
+    def write(self, file: Path, data: bytes) -> Optional[Hashable]:
+        """
+        Overwrite the json contents of an entry, creating it if needed.
+
+        Returns
+        -------
+        signature : Optional[Hashable]
+            The signature of the entry after writing.
+        """
+
+    @abstractmethod
+    def delete(self, file: Path) -> None:
+        """
+        Remove an entry.
+        """
+
+    @abstractmethod
+    def iter_names(self, folder: Path, suffix: str = ".json") -> Iterator[str]:
+        """
+        Iterate over the names of the entries in `folder`, that end in `suffix`. The `suffix` is removed from the names.
+        """
+
+    def lock(self, file: Path) -> ContextManager:
+        """
+        Context manager that holds an exclusive lock on an entry, shared between processes, so it can be read, modified
+        and written without anyone else writing to it in between.
+
+        Must be re-entrant. By default no locking is done.
+        """
+        return contextlib.nullcontext()
+
+    def exists(self, file: Path) -> bool:
+        """
+        Check if an entry exists.
+        """
+        return self.signature(file) is not None
+
+    def create(self, file: Path, data: bytes, maker: FileMaker) -> None:
+        """
+        Create a new entry, as part of setting up a tier's files.
+
+        The entry is removed if `maker` rolls back.
+        """
+        if self.exists(file):
+            raise FileExistsError(file)
+
+        self.write(file, data)
+        maker.add_rollback(lambda: self.delete(file))
+
+
+class FileMetaBackend(MetaBackend):
+    """
+    Default backend, that stores each entry as a json file on disk.
+
+    Writes go to a temporary file which then replaces the entry, so readers never see a partially written file. Locks
+    are held on a single lock file in the folder of the entry.
+    """
+
+    def lock(self, file: Path) -> ContextManager:
+        return folder_lock(file.parent)
+
+    def signature(self, file: Path) -> Optional[Hashable]:
+        return stat_signature(file)
+
+    def read(self, file: Path) -> Optional[bytes]:
+        try:
+            return file.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def write(self, file: Path, data: bytes) -> Optional[Hashable]:
+        atomic_write(file, data)
+        return stat_signature(file)
+
+    def delete(self, file: Path) -> None:
+        file.unlink()
+
+    def iter_names(self, folder: Path, suffix: str = ".json") -> Iterator[str]:
+        try:
+            entries = list(os.scandir(folder))
+        except (FileNotFoundError, NotADirectoryError):
+            return
+
+        for entry in entries:
+            if entry.name.endswith(suffix) and entry.is_file():
+                yield entry.name[: -len(suffix)]
+
+    def create(self, file: Path, data: bytes, maker: FileMaker) -> None:
+        maker.mkdir(file.parent, exist_ok=True)
+        maker.write_file(file, data.decode("utf-8"))
+
+
+class SQLiteMetaBackend(MetaBackend):
+    """
+    Backend that stores all entries in one SQLite database, with one row per entry.
+
+    The database uses WAL mode, so readers don't block writers. Each thread gets its own connection. Locking an entry
+    starts an immediate transaction, which locks the whole database for writing until it's released.
+
+    Parameters
+    ----------
+    root : Union[str, Path]
+        Folder entries are stored relative to, usually `project.project_folder`.
+    database : Optional[Union[str, Path]]
+        Path to the database file. Defaults to `root / config.CASSINI_DIR / 'meta.sqlite'`.
+    """
+
+    def __init__(
+        self, root: Union[str, Path], database: Optional[Union[str, Path]] = None
+    ):
+        self.root: Path = Path(root).resolve()
+        self.database: Path = (
+            Path(database)
+            if database
+            else self.root / config.CASSINI_DIR / "meta.sqlite"
+        )
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        Connection to the database for the current thread. Creates the database if needed.
+        """
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            self.database.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.database, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta ("
+                "path TEXT PRIMARY KEY, folder TEXT NOT NULL, name TEXT NOT NULL, "
+                "version INTEGER NOT NULL, data TEXT NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS meta_folder ON meta (folder)"
+            )
+            self._local.connection = connection
+
+        return connection
+
+    @contextlib.contextmanager
+    def lock(self, file: Path) -> Iterator[None]:
+        depth = getattr(self._local, "depth", 0)
+
+        if depth:
+            self._local.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._local.depth = depth
+            return
+
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+
+        try:
+            yield
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        else:
+            connection.execute("COMMIT")
+        finally:
+            self._local.depth = 0
+
+    def _key(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def signature(self, file: Path) -> Optional[Hashable]:
+        row = self.connection.execute(
+            "SELECT version, length(data) FROM meta WHERE path = ?", (self._key(file),)
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def read(self, file: Path) -> Optional[bytes]:
+        row = self.connection.execute(
+            "SELECT data FROM meta WHERE path = ?", (self._key(file),)
+        ).fetchone()
+        return row[0].encode("utf-8") if row else None
+
+    def write(self, file: Path, data: bytes) -> Optional[Hashable]:
+        self.connection.execute(
+            "INSERT INTO meta (path, folder, name, version, data) VALUES (?, ?, ?, 1, ?) "
+            "ON CONFLICT (path) DO UPDATE SET version = version + 1, data = excluded.data",
+            (
+                self._key(file),
+                self._key(file.parent),
+                file.name,
+                data.decode("utf-8"),
+            ),
+        )
+        return self.signature(file)
+
+    def delete(self, file: Path) -> None:
+        cursor = self.connection.execute(
+            "DELETE FROM meta WHERE path = ?", (self._key(file),)
+        )
+        if not cursor.rowcount:
+            raise FileNotFoundError(file)
+
+    def iter_names(self, folder: Path, suffix: str = ".json") -> Iterator[str]:
+        rows = self.connection.execute(
+            "SELECT name FROM meta WHERE folder = ?", (self._key(folder),)
+        ).fetchall()
+        for (name,) in rows:
+            if name.endswith(suffix):
+                yield name[: -len(suffix)]
+
+    def close(self) -> None:
+        """
+        Close this thread's connection to the database.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class _RecordGroup:
+    """
+    In-memory copy of a consolidated record file, with an index of where each entry's latest record is.
+    """
+
+    def __init__(self, signature: Optional[StatSignature], buffer: bytearray) -> None:
+        self.signature = signature
+        self.buffer = buffer
+        self.index: Dict[str, Tuple[int, int]] = {}
+        self.dead = 0
+
+        offset = 0
+        end = buffer.find(b"\n")
+        while end != -1:
+            self.add(bytes(buffer[offset : end + 1]), offset)
+            offset = end + 1
+            end = buffer.find(b"\n", offset)
+
+    def add(self, line: bytes, offset: int) -> None:
+        """
+        Index the record `line`, found at `offset`.
+        """
+        tab = line.find(b"\t")
+
+        if tab == -1 or not line.endswith(b"\n"):  # partially written record
+            return
+
+        name = line[:tab].decode("utf-8")
+        length = len(line) - tab - 2  # exclude the tab and newline
+
+        if name in self.index:
+            self.dead += 1
+
+        if length > 0:
+            self.index[name] = (offset + tab + 1, length)
+        elif self.index.pop(name, None) is not None:  # tombstone
+            self.dead += 1
+
+
+class ConsolidatedMetaBackend(MetaBackend):
+    """
+    Backend that stores the meta of all the entries in a folder in a single record file, `folder / 'meta.jsonl'`,
+    rather than one file per entry.
+
+    Each line of the record file is a record of the form `<name>\t<json>\n`. Writes append a new record, and deletions
+    append a record with no json. The latest record for each name wins.
+
+    Each record file is read in one go, and kept in memory along with an index of where each entry is. This means
+    iterating over the children of a tier and reading all their meta costs one open and one read. The record file is
+    only re-read if its stat signature changes, i.e. if another process writes to it.
+
+    Old records are cleaned up by compaction, which happens automatically once there are more than
+    `compact_threshold` dead records, and they outnumber the live ones. It can also be done explicitly with `compact`.
+
+    Appending and compaction hold the lock on the folder, so records aren't appended to a file that's being replaced.
+
+    Parameters
+    ----------
+    compact_threshold : int
+        Minimum number of dead records in a file before it's compacted automatically.
+    """
+
+    record_name: ClassVar[str] = "meta.jsonl"
+
+    def __init__(self, compact_threshold: int = 64) -> None:
+        self.compact_threshold = compact_threshold
+        self._groups: Dict[Path, _RecordGroup] = {}
+        self._lock = threading.RLock()
+
+    def lock(self, file: Path) -> ContextManager:
+        return folder_lock(file.parent)
+
+    def _group(self, folder: Path) -> _RecordGroup:
+        """
+        Get the group for `folder`, (re-)reading the record file if it's changed.
+        """
+        record_file = folder / self.record_name
+        signature = stat_signature(record_file)
+        group = self._groups.get(folder)
+
+        if group is None or group.signature != signature:
+            try:
+                buffer = bytearray(record_file.read_bytes())
+            except FileNotFoundError:
+                buffer = bytearray()
+            group = self._groups[folder] = _RecordGroup(signature, buffer)
+
+        return group
+
+    def signature(self, file: Path) -> Optional[Tuple[int, int, int]]:
+        """
+        Signature of the latest record of `file`, made from the inode of the record file, and the record's offset and
+        length within it.
+        """
+        with self._lock:
+            group = self._group(file.parent)
+            location = group.index.get(file.name)
+            if location is None or group.signature is None:
+                return None
+            return (group.signature[2], *location)
+
+    def read(self, file: Path) -> Optional[bytes]:
+        with self._lock:
+            group = self._group(file.parent)
+            location = group.index.get(file.name)
+
+            if location is None:
+                return None
+
+            offset, length = location
+            return bytes(group.buffer[offset : offset + length])
+
+    def _append(self, folder: Path, name: str, data: bytes) -> _RecordGroup:
+        group = self._group(folder)
+        record = name.encode("utf-8") + b"\t" + data + b"\n"
+
+        folder.mkdir(parents=True, exist_ok=True)
+        with (folder / self.record_name).open("ab") as f:
+            offset = f.tell()
+            f.write(record)
+
+        # someone else has written to it since we read it.
+        if offset != len(group.buffer):
+            group = self._groups[folder] = _RecordGroup(
+                None, bytearray((folder / self.record_name).read_bytes())
+            )
+        else:
+            group.buffer += record
+            group.add(record, offset)
+
+        group.signature = stat_signature(folder / self.record_name)
+
+        if group.dead > self.compact_threshold and group.dead > len(group.index):
+            self.compact(folder)
+
+        return group
+
+    def write(self, file: Path, data: bytes) -> Optional[Tuple[int, int, int]]:
+        if b"\n" in data:  # make sure it's on one line
+            data = json.dumps(json.loads(data)).encode("utf-8")
+
+        file.parent.mkdir(parents=True, exist_ok=True)
+
+        with folder_lock(file.parent), self._lock:
+            self._append(file.parent, file.name, data)
+            return self.signature(file)
+
+    def delete(self, file: Path) -> None:
+        with folder_lock(file.parent), self._lock:
+            if file.name not in self._group(file.parent).index:
+                raise FileNotFoundError(file)
+
+            self._append(file.parent, file.name, b"")
+
+    def iter_names(self, folder: Path, suffix: str = ".json") -> Iterator[str]:
+        with self._lock:
+            names = list(self._group(folder).index)
+
+        for name in names:
+            if name.endswith(suffix):
+                yield name[: -len(suffix)]
+
+    def compact(self, folder: Path) -> None:
+        """
+        Rewrite the record file for `folder`, keeping only the latest record for each live entry.
+        """
+        if not folder.exists():
+            return
+
+        with folder_lock(folder), self._lock:
+            group = self._group(folder)
+            record_file = folder / self.record_name
+
+            if not group.signature:
+                return
+
+            buffer = bytearray()
+            for name, (offset, length) in group.index.items():
+                buffer += name.encode("utf-8") + b"\t"
+                buffer += group.buffer[offset : offset + length] + b"\n"
+
+            temp_file = record_file.with_name(f"{self.record_name}.tmp")
+            temp_file.write_bytes(buffer)
+            os.replace(temp_file, record_file)
+
+            self._groups[folder] = _RecordGroup(stat_signature(record_file), buffer)
+
+
+def convert_meta_backend(
+    project: Project, destination: MetaBackend, delete: bool = False
+) -> int:
+    """
+    Copy the meta of every tier in `project` from `project.meta_backend` into `destination`, then set
+    `project.meta_backend = destination`.
+
+    Works in both directions, e.g. from files to SQLite, or back again.
+
+    Warnings
+    --------
+    `Meta` objects that already exist keep using the old backend. It's best to do this in a fresh interpreter, before
+    accessing any tiers.
+
+    Parameters
+    ----------
+    project : Project
+        The project to convert.
+    destination : MetaBackend
+        The backend to copy meta into.
+    delete : bool
+        If `True`, entries are removed from the old backend once copied. Default is `False`.
+
+    Returns
+    -------
+    count : int
+        Number of entries copied.
+    """
+    from .core import NotebookTierBase
+
+    source = project.meta_backend
+    count = 0
+
+    for tier in project.walk():
+        if not isinstance(tier, NotebookTierBase):
+            continue
+
+        meta_file = tier.meta_file
+        data = source.read(meta_file)
+
+        if data is None:
+            continue
+
+        if isinstance(destination, FileMetaBackend):
+            meta_file.parent.mkdir(parents=True, exist_ok=True)
+
+        destination.write(meta_file, data)
+        count += 1
+
+        if delete:
+            source.delete(meta_file)
+
+    project.meta_backend = destination
+
+    return count
@@ -0,0 +1,212 @@
+"""
+Content-addressed store for large values, shared by a whole project, e.g. the images in highlights.
+
+Each blob is named after the sha256 of its contents, so the same value is only ever stored once, however many times
+it's added: re-running a cell that makes the same figure, or showing the same figure in two tiers' highlights, doesn't
+store it again.
+
+Blobs are kept in `project_folder / config.CASSINI_DIR / 'blobs'`, in sub-folders named after the first 2 characters
+of their digest (so no one folder gets too big):
+
+```
+.cassini/
+    blobs/
+        3f/
+            3f2a...
+```
+
+Highlights only store their outputs here if `config.HIGHLIGHT_BLOB_THRESHOLD` is set, see
+[cassini.highlights][cassini.highlights].
+
+Blobs can optionally be compressed, see `config.BLOB_COMPRESSION`. `'zstd'` compression needs the optional `zstandard`
+package, installed with `pip install cassini[zstd]`.
+
+Blobs aren't removed when the things using them are, as they may be used elsewhere. Instead, unused blobs are removed
+by [Project.gc_blobs][cassini.core.Project.gc_blobs].
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterator, Literal, Optional
+
+from .utils import atomic_write
+
+Compression = Literal["zlib", "zstd"]
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError:
+        raise ImportError(
+            "zstd compression of blobs requires the zstandard package, install it with `pip install cassini[zstd]`"
+        ) from None
+
+    return zstandard
+
+
+def _compress(data: bytes, compression: Optional[Compression]) -> bytes:
+    if compression == "zlib":
+        return zlib.compress(data)
+    elif compression == "zstd":
+        return _zstandard().ZstdCompressor().compress(data)
+    return data
+
+
+def _decompress(data: bytes, compression: Optional[Compression]) -> bytes:
+    if compression == "zlib":
+        return zlib.decompress(data)
+    elif compression == "zstd":
+        return _zstandard().ZstdDecompressor().decompress(data)
+    return data
+
+
+class BlobStore:
+    """
+    Content-addressed store of blobs in `folder`. Usually accessed via `project.blobs`.
+
+    Parameters
+    ----------
+    folder : Path
+        Folder the blobs are kept in.
+    compression : Optional[Compression]
+        How new blobs are compressed, `'zlib'`, `'zstd'` (requires the `zstandard` package) or `None` for not at all.
+        Blobs are read however they were written.
+
+    Attributes
+    ----------
+    SUFFIXES : Dict[Optional[Compression], str]
+        (class attribute) Suffix added to the name of blobs with each compression.
+    """
+
+    SUFFIXES: Dict[Optional[Compression], str] = {
+        None: "",
+        "zlib": ".zlib",
+        "zstd": ".zst",
+    }
+
+    def __init__(self, folder: Path, compression: Optional[Compression] = None) -> None:
+        if compression not in self.SUFFIXES:
+            raise ValueError(f"Unknown blob compression {compression}")
+
+        if compression == "zstd":
+            _zstandard()  # fail early, rather than on the first write.
+
+        self.folder = folder
+        self.compression = compression
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        """
+        Get the digest that `data` is stored under.
+        """
+        return hashlib.sha256(data).hexdigest()
+
+    def _path(self, digest: str, compression: Optional[Compression]) -> Path:
+        return self.folder / digest[:2] / (digest + self.SUFFIXES[compression])
+
+    def _find(self, digest: str) -> Optional[Path]:
+        """
+        Get the path to the blob with `digest`, whichever compression it was written with, `None` if it doesn't exist.
+        """
+        for compression in self.SUFFIXES:
+            path = self._path(digest, compression)
+            if path.exists():
+                return path
+        return None
+
+    def put(self, data: bytes) -> str:
+        """
+        Store `data`, if it isn't already, returning its digest.
+        """
+        digest = self.digest(data)
+        existing = self._find(digest)
+
+        if existing is not None:
+            # marks it as recently used, so gc_blobs doesn't remove it before whatever uses it is written.
+            os.utime(existing)
+            return digest
+
+        path = self._path(digest, self.compression)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, _compress(data, self.compression))
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """
+        Get the contents of the blob with `digest`.
+
+        Raises
+        ------
+        KeyError
+            If there is no blob with `digest`.
+        """
+        for compression in self.SUFFIXES:
+            try:
+                data = self._path(digest, compression).read_bytes()
+            except FileNotFoundError:
+                continue
+            return _decompress(data, compression)
+
+        raise KeyError(digest)
+
+    def __contains__(self, digest: object) -> bool:
+        return isinstance(digest, str) and self._find(digest) is not None
+
+    def _paths(self) -> Iterator[Path]:
+        try:
+            shards = list(os.scandir(self.folder))
+        except FileNotFoundError:
+            return
+
+        for shard in shards:
+            if not shard.is_dir():
+                continue
+
+            for entry in os.scandir(shard.path):
+                if entry.is_file() and not entry.name.startswith("."):
+                    yield Path(entry.path)
+
+    def __iter__(self) -> Iterator[str]:
+        for path in self._paths():
+            yield path.name.split(".")[0]
+
+    def gc(self, referenced: Collection[str], grace: float = 3600) -> int:
+        """
+        Remove the blobs that aren't in `referenced`.
+
+        Parameters
+        ----------
+        referenced : Collection[str]
+            Digests of the blobs that are still used.
+        grace : float
+            Blobs added or re-used within this many seconds are kept, as whatever uses them may not have been written
+            yet.
+
+        Returns
+        -------
+        removed : int
+            Number of blobs removed.
+        """
+        cutoff = time.time() - grace
+        removed = 0
+
+        for path in self._paths():
+            if path.name.split(".")[0] in referenced:
+                continue
+
+            try:
+                if path.stat().st_mtime > cutoff:
+                    continue
+                path.unlink()
+            except FileNotFoundError:
+                continue
+
+            removed += 1
+
+        return removed
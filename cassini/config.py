@@ -1,5 +1,6 @@
 from pathlib import Path
 from dataclasses import dataclass
+from typing import Literal, Optional
 
 
 SCIFY_DIR = Path(__file__).parent
@@ -16,6 +17,26 @@ class Config:
         Path to cassini module. (Called SCIFY for legacy reasons).
     META_DIR_TEMPLATE : str
         Template filled in to name folder a tier's meta goes into.
+    CASSINI_DIR : str
+        Name of the folder within `project_folder` cassini keeps its own files in e.g. databases and caches.
+    LOCK_NAME : str
+        Name of the file within a meta folder that's locked while writing meta on Windows. Elsewhere the folder itself
+        is locked.
+    TIER_CACHE_SIZE : int
+        Number of recently used tiers of each type that are kept in memory. Other tiers are only kept while they're
+        referenced elsewhere.
+    META_CACHE_SIZE : int
+        Number of meta files whose validated contents are kept in memory, to be shared between `Meta` objects.
+    BLOB_COMPRESSION : Optional[str]
+        How blobs (e.g. images in highlights) are compressed when they're written, `'zlib'`, `'zstd'` (requires the
+        `zstandard` package) or `None` for not at all. See [cassini.blobs][cassini.blobs].
+    HIGHLIGHT_BLOB_THRESHOLD : Optional[int]
+        Highlight outputs whose json is bigger than this many bytes are stored in the project's blob store, rather than
+        inline, or `None` (the default) to keep every output inline. Readers that don't know about blobs, such as the
+        JupyterLab extension, can't show outputs stored in blobs. See [cassini.highlights][cassini.highlights].
+    THUMBNAIL_SIZE : Optional[int]
+        Size in pixels of the square that thumbnails of highlight images are shrunk to fit, or `None` to show full size
+        images instead. See [cassini.thumbnails][cassini.thumbnails].
     DEFAULT_TEMPLATE_DIR : Path
         Path to where the default templates are stored.
     TEMPLATE_EXT : str
@@ -26,6 +47,13 @@ class Config:
 
     SCIFY_DIR = SCIFY_DIR
     META_DIR_TEMPLATE = ".{}s"
+    CASSINI_DIR = ".cassini"
+    LOCK_NAME = ".lock"
+    TIER_CACHE_SIZE = 1024
+    META_CACHE_SIZE = 4096
+    BLOB_COMPRESSION: Optional[Literal["zlib", "zstd"]] = None
+    HIGHLIGHT_BLOB_THRESHOLD: Optional[int] = None
+    THUMBNAIL_SIZE: Optional[int] = 320
 
     DEFAULT_TEMPLATE_DIR = SCIFY_DIR / "defaults" / "templates"
     TEMPLATE_EXT = ".tmplt.ipynb"
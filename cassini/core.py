@@ -1,27 +1,38 @@
 from __future__ import annotations
 
 import datetime
+import functools
 import html
 import json
+import operator
 import os
 from pathlib import Path
 from abc import ABC, abstractmethod
 import re
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from typing import (
     Any,
+    Collection,
+    Iterable,
     List,
     Sequence,
     Type,
     Tuple,
     Iterator,
+    Set,
     Union,
     Dict,
+    MutableMapping,
     ClassVar,
     Optional,
     Callable,
     cast,
     Protocol,
+    ContextManager,
+    TYPE_CHECKING,
 )
 from warnings import warn
 from jupyterlab.labapp import LabApp  # type: ignore[import-untyped]
@@ -31,6 +42,9 @@ import jinja2
 from pydantic import JsonValue, AwareDatetime
 
 from .meta import Meta, MetaAttr
+from .backends import MetaBackend, FileMetaBackend
+from .blobs import BlobStore
+from .highlights import HighlightStore, HighlightType, HighlightsType
 from .accessors import cached_prop, cached_class_prop, soft_prop
 from .utils import (
     FileMaker,
@@ -42,6 +56,14 @@ from .environment import env
 from .config import config
 from .jlgui import JLGui
 
+if TYPE_CHECKING:
+    from .index import ProjectIndex
+    from .query import Query
+    from .report import ReportFormat
+    from .search import SearchIndex, SearchResult
+    from .thumbnails import ThumbnailCache
+    from .names import NameIndex
+
 
 class TierGuiProtocol(Protocol):
     """
@@ -63,10 +85,6 @@ class TierGuiProtocol(Protocol):
 MetaDict = Dict[str, JsonValue]
 
 
-HighlightType = List[Dict[str, Dict[str, Any]]]
-HighlightsType = Dict[str, HighlightType]
-
-
 class TierABC(ABC):
     """
     Abstract Base class for creating Tiers objects. Tiers should correspond to a folder on your disk.
@@ -87,8 +105,8 @@ class TierABC(ABC):
         (class attribute) regex used to restrict form of `Tier` object ids. Should contain 1 group that captures the id.
         See [Project.parse_name][cassini.core.Project] for more details.
     gui_cls : TierGuiProtocol
-        (class attribute) The class called upon initialisation to use as gui for this object. Constructor should take ``self``
-        as first argument.
+        (class attribute) The class called, the first time `gui` is accessed, to make the gui for this object. Constructor
+        should take ``self`` as first argument.
     pretty_type : str
         Long name for the tier type, defaults to the class name. Used in dialogues/ ui.
     short_type : str
@@ -99,13 +117,37 @@ class TierABC(ABC):
         Regex where first group matches ``id`` part of string. Default is fill in ``cls.name_part_template`` with
         ``cls.id_regex``.
 
+    Notes
+    -----
+    Projects can have a lot of tiers, so to keep them small tiers use `__slots__`, with identifiers interned and paths
+    worked out from the parent's `folder` when they're needed, rather than stored.
+
+    Subclasses that don't define `__slots__` get a `__dict__` as usual, so can store whatever attributes they like.
+    Define `__slots__ = ()` (as the default tiers, other than `Home`, do) to keep them compact. A `cached_prop` defined
+    on such a subclass stores its value in a slot called `_cached_<name>` if one is declared, otherwise in a weak
+    mapping held by the property.
     """
 
-    _cache: ClassVar[Dict[Tuple[str, ...], TierABC]] = env.create_cache()
+    __slots__ = (
+        "project",
+        "_identifiers",
+        "_initialised_for",
+        "_gui",
+        "_cached_name",
+        "_cached_parent",
+        "__weakref__",
+    )
+
+    _cache: ClassVar[MutableMapping[Tuple[str, ...], TierABC]] = env.create_cache(
+        "tiers.TierABC", "weak", config.TIER_CACHE_SIZE
+    )
 
     def __init_subclass__(cls, *args: Any, **kwargs: Any) -> None:
         super().__init_subclass__(*args, **kwargs)
-        cls._cache = env.create_cache()  # ensures each TierBase class has its own cache
+        # ensures each TierBase class has its own cache
+        cls._cache = env.create_cache(
+            f"tiers.{cls.__name__}", "weak", config.TIER_CACHE_SIZE
+        )
 
     id_regex: ClassVar[str] = r"(\d+)"
 
@@ -165,17 +207,31 @@ class TierABC(ABC):
         if obj:
             return obj
         obj = object.__new__(cls)
+        obj._identifiers = args
         cls._cache[args] = obj
         return obj
 
     _identifiers: Tuple[str, ...]
-    gui: TierGuiProtocol
 
     def __init__(self: Self, *identifiers: str, project: Project):
+        # __new__ returns cached tiers, which have already been initialised.
+        if getattr(self, "_initialised_for", None) is not project:
+            self._initialise(identifiers, project, validate=True)
+
+    def _initialise(
+        self, identifiers: Sequence[str], project: Project, validate: bool
+    ) -> None:
         self.project = project
 
-        self._identifiers = tuple(filter(None, identifiers))
-        self.gui = self.gui_cls(self)
+        ids = tuple(map(sys.intern, filter(None, identifiers)))
+        key = getattr(self, "_identifiers", None)
+
+        # if the identifiers were already interned (e.g. by parse_name), keep the tuple __new__ cached this tier under,
+        # rather than a copy.
+        if key is not None and ids == key and all(map(operator.is_, ids, key)):
+            ids = key
+
+        self._identifiers = ids
 
         rank = self.project.rank_map[self.__class__]
 
@@ -184,12 +240,39 @@ class TierABC(ABC):
                 f"Invalid number of identifiers in {self._identifiers}, expecting {rank}."
             )
 
-        if self.parse_name(self.name) != self.identifiers:
+        if validate and self.parse_name(self.name) != self.identifiers:
             raise ValueError(
                 f"Invalid identifiers - {self._identifiers}, resulting name ('{self.name}') not in a parsable form "
             )
 
-    @cached_prop
+        self._initialised_for = project
+
+    @classmethod
+    def _trusted(cls, identifiers: Sequence[str], project: Project) -> Self:
+        """
+        Get the tier with `identifiers`, without checking they make a parsable name. Only for identifiers that come from
+        parsing a name, e.g. when scanning the project's folders.
+        """
+        tier = cast(Self, cls.__new__(cls, *identifiers))
+
+        if getattr(tier, "_initialised_for", None) is not project:
+            tier._initialise(identifiers, project, validate=False)
+
+        return tier
+
+    @property
+    def gui(self) -> TierGuiProtocol:
+        """
+        Gui for this tier, made from `gui_cls` the first time it's accessed.
+        """
+        gui = getattr(self, "_gui", None)
+
+        if type(gui) is not self.gui_cls:
+            gui = self._gui = self.gui_cls(self)
+
+        return gui
+
+    @property
     def _parent_cls(self) -> Union[Type[TierABC], None]:
         """
         `Tier` above this `Tier`, `None` if doesn't have one
@@ -198,7 +281,7 @@ class TierABC(ABC):
 
     parent_cls = _parent_cls
 
-    @cached_prop
+    @property
     def _child_cls(self) -> Union[Type[TierABC], None]:
         """
         `Tier` below this `Tier`, `None` if doesn't have one
@@ -231,7 +314,7 @@ class TierABC(ABC):
         """
         pass
 
-    @cached_prop
+    @property
     def identifiers(self) -> Tuple[str, ...]:
         """
         Read only copy of identifiers that make up this `Tier` object.
@@ -283,7 +366,7 @@ class TierABC(ABC):
         """
         open_file(self.folder)
 
-    @cached_prop
+    @property
     def id(self) -> str:
         """
         Shortcut for getting final identifier.
@@ -309,7 +392,7 @@ class TierABC(ABC):
             return self.parent_cls(*self._identifiers[:-1], project=self.project)
         return None
 
-    @cached_prop
+    @property
     @abstractmethod
     def href(self) -> Union[str, None]:
         """
@@ -375,8 +458,37 @@ class TierABC(ABC):
         if not self.child_cls:
             raise NotImplementedError()
 
+        index = self.project._index
+
+        if index is not None and index.serving:
+            children = index.children(self)
+            if children is not None:
+                yield from children
+                return
+
         yield from self.child_cls.iter_siblings(self)
 
+    def children(
+        self, prefetch_meta: bool = False, workers: Optional[int] = None
+    ) -> List[TierABC]:
+        """
+        Get a list of all this `Tier`'s children (in no particular order).
+
+        Parameters
+        ----------
+        prefetch_meta : bool
+            If `True`, the meta of all the children is loaded up front, in parallel, using
+            [Project.load_meta][cassini.core.Project.load_meta]. Default is `False`.
+        workers : Optional[int]
+            Number of threads used to prefetch meta. Default lets `ThreadPoolExecutor` decide.
+        """
+        children = list(self)
+
+        if prefetch_meta:
+            self.project.load_meta(children, workers=workers)
+
+        return children
+
     def __repr__(self) -> str:
         return f'<{self.__class__.__name__} "{self.name}">'
 
@@ -394,24 +506,61 @@ class TierABC(ABC):
         """
         pass
 
+    def _indexed_exists(self) -> Optional[bool]:
+        """
+        Whether this tier exists according to `project.index`, `None` if the index isn't being served or doesn't know.
+        """
+        index = self.project._index
+
+        if index is None or not index.serving:
+            return None
+
+        return index.exists(self)
+
+    def _update_index(self, removed: bool = False) -> None:
+        """
+        Update this tier's entry in `project.index` and `project.names`, if they're being used.
+        """
+        names = self.project._names
+
+        if names is not None:
+            if removed:
+                names.discard(self.name)
+            else:
+                names.add(self.name)
+
+        index = self.project._index
+
+        if index is None:
+            return
+
+        if removed:
+            index.remove(self)
+        else:
+            index.update(self)
+
 
 class FolderTierBase(TierABC):
     """
     Base class for a tier which has a folder, but not notebook/ meta.
     """
 
+    __slots__ = ("_cached_folder",)
+
     gui_cls = JLGui
 
     @classmethod
     def iter_siblings(cls, parent: TierABC) -> Iterator[TierABC]:
         # TODO: shouldn't project also handle this?
-        if not parent.folder.exists():
+        try:
+            entries = list(os.scandir(parent.folder))
+        except (FileNotFoundError, NotADirectoryError):
             return
 
-        for folder in os.scandir(parent.folder):
+        for folder in entries:
             if not folder.is_dir():
                 continue
-            yield cls(*parent.parse_name(folder.name), project=parent.project)
+            yield cls._trusted(parent.parse_name(folder.name), parent.project)
 
     @cached_prop
     def folder(self) -> Path:
@@ -432,6 +581,8 @@ class FolderTierBase(TierABC):
             maker.mkdir(self.folder.parent, exist_ok=True)
             maker.mkdir(self.folder)
 
+        self._update_index()
+
         print("Success")
 
     def remove_files(self) -> None:
@@ -441,9 +592,14 @@ class FolderTierBase(TierABC):
         """
         returns True if ``self.folder`` exists.
         """
+        indexed = self._indexed_exists()
+
+        if indexed is not None:
+            return indexed
+
         return self.folder.exists()
 
-    @cached_prop
+    @property
     def href(self) -> Union[str, None]:
         return html.escape(Path(os.path.relpath(self.folder, os.getcwd())).as_posix())
 
@@ -462,7 +618,9 @@ class NotebookTierBase(FolderTierBase):
 
     """
 
-    meta: Meta
+    __slots__ = ("_meta", "_cached_highlights")
+
+    _meta_lock: ClassVar[threading.Lock] = threading.Lock()
 
     @cached_class_prop
     def meta_model(cls):
@@ -490,19 +648,26 @@ class NotebookTierBase(FolderTierBase):
     def iter_siblings(cls, parent):
         meta_folder = parent.folder / config.META_DIR_TEMPLATE.format(cls.short_type)
 
-        if not meta_folder.exists():
-            return
+        for name in parent.project.meta_backend.iter_names(meta_folder, ".json"):
+            yield cls._trusted(parent.parse_name(name), parent.project)
 
-        for meta_file in os.scandir(meta_folder):
-            if not meta_file.is_file() or not meta_file.name.endswith(".json"):
-                continue
-            yield cls(
-                *parent.parse_name(meta_file.name[:-5]), project=parent.project
-            )  # I don't like this.
+    @property
+    def meta(self) -> Meta:
+        """
+        Object for storing meta data for this tier, created the first time it's accessed.
+        """
+        meta = getattr(self, "_meta", None)
+
+        if meta is None:
+            with self._meta_lock:
+                meta = getattr(self, "_meta", None)
+
+                if meta is None:
+                    meta = self._meta = Meta.create_meta(
+                        self.meta_file, owner=self, backend=self.project.meta_backend
+                    )
 
-    def __init__(self, *identifiers: str, project: Project):
-        super().__init__(*identifiers, project=project)
-        self.meta: Meta = Meta.create_meta(self.meta_file, owner=self)
+        return meta
 
     def setup_files(
         self, template: Union[Path, None] = None, meta: Optional[MetaDict] = None
@@ -539,8 +704,9 @@ class NotebookTierBase(FolderTierBase):
         print(f"Meta ({self.meta_file})")
 
         with FileMaker() as maker:
-            maker.mkdir(self.meta.file.parent, exist_ok=True)
-            maker.write_file(self.meta.file, json.dumps(meta))
+            self.meta._backend.create(
+                self.meta.file, json.dumps(meta).encode("utf-8"), maker
+            )
 
             print("Writing Meta Data")
 
@@ -558,19 +724,42 @@ class NotebookTierBase(FolderTierBase):
 
             print("Success")
 
+        self._update_index()
+
         print("All Done")
 
     def exists(self) -> bool:
         """
         returns True if this `Tier` object has already been setup (e.g. by `self.setup_files`)
         """
-        return bool(self.file and self.folder.exists() and self.meta_file.exists())
+        indexed = self._indexed_exists()
+
+        if indexed is not None:
+            return indexed
+
+        return bool(self.file and self.folder.exists() and self.meta.exists())
+
+    def batch(self) -> ContextManager[Meta]:
+        """
+        Make several changes to this `Tier`'s meta with a single read and write of its meta file.
+
+        Shortcut for [self.meta.transaction()][cassini.meta.Meta.transaction].
+
+        Example
+        -------
+        ```python
+        with tier.batch():
+            tier.description = 'A new description'
+            tier.conclusion = 'It worked!'
+        ```
+        """
+        return self.meta.transaction()
 
     description = MetaAttr(str, str, cas_field="core")
     conclusion = MetaAttr(str, str, cas_field="core")
     started = MetaAttr(AwareDatetime, datetime.datetime, cas_field="core")
 
-    @cached_prop
+    @property
     def meta_file(self) -> Path:
         """
         Path to where meta file for this `Tier` object should be.
@@ -583,7 +772,7 @@ class NotebookTierBase(FolderTierBase):
         assert self.parent
         return self.parent.folder / self.meta_folder_name / (self.name + ".json")
 
-    @cached_prop
+    @property
     def highlights_file(self) -> Union[Path, None]:
         """
         Path to where highlights file for this `Tier` object should be.
@@ -596,7 +785,7 @@ class NotebookTierBase(FolderTierBase):
         assert self.parent
         return self.parent.folder / self._meta_folder_name / (self.name + ".hlts")
 
-    @cached_prop
+    @property
     def file(self) -> Path:
         """
         Path to where `.ipynb` file for this `Tier` instance will be.
@@ -637,6 +826,22 @@ class NotebookTierBase(FolderTierBase):
         template = self.project.template_env.get_template(template_path)
         return template.render(**{self.short_type: self, "tier": self})
 
+    @cached_prop
+    def highlights(self) -> Union[HighlightStore, None]:
+        """
+        Store of the highlights of this `Tier` instance, kept at `self.highlights_file`. Unlike `get_highlights`, the
+        outputs of each highlight are only read when accessed.
+
+        `None` if this tier doesn't have a `highlights_file`.
+        """
+        if self.highlights_file:
+            return HighlightStore(
+                self.highlights_file,
+                blobs=self.project.blobs,
+                blob_threshold=config.HIGHLIGHT_BLOB_THRESHOLD,
+            )
+        return None
+
     def get_highlights(self) -> Union[HighlightsType, None]:
         """
         Get dictionary of highlights for this `Tier` instance.
@@ -644,6 +849,8 @@ class NotebookTierBase(FolderTierBase):
         This dictionary is in a form that can be rendered in the notebook using `IPython.display.publish_display_data`
         see Examples.
 
+        This reads the outputs of every highlight, to only read the ones needed, use `self.highlights`.
+
         Returns
         -------
         highlights : dict
@@ -659,16 +866,17 @@ class NotebookTierBase(FolderTierBase):
             ...     for output in outputs:
             ...         IPython.display.publish_display_data(**output)
         """
-        if self.highlights_file and self.highlights_file.exists():
-            highlights = cast(
-                HighlightsType, json.loads(self.highlights_file.read_text())
-            )
-            return highlights
+        if self.highlights:
+            return dict(self.highlights.items())
         else:
             return {}
 
     def add_highlight(
-        self, name: str, data: HighlightType, overwrite: bool = True
+        self,
+        name: str,
+        data: HighlightType,
+        overwrite: bool = True,
+        background: bool = False,
     ) -> None:
         """
         Add a highlight to `self.highlights_file`.
@@ -683,34 +891,24 @@ class NotebookTierBase(FolderTierBase):
             list of data and metadata that can be passed to `IPython.display.publish_display_data` to render.
         overwrite : bool
             If `False` will raise an exception if a highlight of the same `name` exists. Default is `True`
+        background : bool
+            If `True`, return straight away, and serialise and write the highlight in a background thread. See
+            [HighlightStore.add][cassini.highlights.HighlightStore.add].
         """
-        highlights = self.get_highlights()
-
-        if self.highlights_file and highlights is not None:
-            highlights = highlights.copy()
-        else:
-            return
-
-        if not overwrite and name in highlights:
-            raise KeyError("Attempting to overwrite existing meta value")
-
-        highlights[name] = data
-        self.highlights_file.write_text(json.dumps(highlights), encoding="utf-8")
+        if self.highlights is not None:
+            self.highlights.add(name, data, overwrite=overwrite, background=background)
 
     def remove_highlight(self, name: str) -> None:
         """
-        Remove highlight from highlight file. Performed by calling `get_highlights()`, then deleting the key `name` from
-        the dictionary, then re-writing the highlights... if you're interested!
+        Remove highlight from highlight file. Only the highlights file, the removed highlight's payload and the index of
+        highlights are touched, see [HighlightStore][cassini.highlights.HighlightStore].
         """
-        highlights = self.get_highlights()
-
-        if not highlights or not self.highlights_file:
+        if not self.highlights:
             return
 
-        del highlights[name]
-        self.highlights_file.write_text(json.dumps(highlights), encoding="utf-8")
+        self.highlights.remove(name)
 
-    @cached_prop
+    @property
     def href(self) -> Union[str, None]:
         """
         href usable in notebook HTML giving link to `self.file`.
@@ -735,7 +933,9 @@ class NotebookTierBase(FolderTierBase):
             self.file.unlink()
 
         if self.meta_file:
-            self.meta_file.unlink()
+            self.meta.delete()
+
+        self._update_index(removed=True)
 
 
 class HomeTierBase(FolderTierBase):
@@ -746,6 +946,8 @@ class HomeTierBase(FolderTierBase):
     level folder in your hierarchy.
 
     Creates the `Home.ipynb` notebook that allows easy navigation of your project.
+
+    There's only one home tier, so it doesn't use `__slots__`, and its attributes can be set like any object's.
     """
 
     @cached_prop
@@ -769,6 +971,27 @@ class HomeTierBase(FolderTierBase):
             maker.mkdir(self.folder, exist_ok=True)
             print("Success")
 
+        self._update_index()
+
+
+def _natural_key(id: str) -> List[Union[str, int]]:
+    """
+    Sort key that orders numbers in `id` by value, so e.g. `'2'` comes before `'10'`.
+    """
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", id)]
+
+
+def _sorted_children(tier: TierABC) -> List[TierABC]:
+    """
+    Get the children of `tier`, in order of their ids.
+    """
+    try:
+        children = list(tier)
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+    return sorted(children, key=lambda child: _natural_key(child.id))
+
 
 class Project:
     """
@@ -785,10 +1008,15 @@ class Project:
     project_folder : Union[str, Path]
         path to home directory. Note this also accepts a path to a file, but will take `project_folder.parent` in that
         case. This enables `__file__` to be used if you want `project_folder` to be based in the same dir.
+    meta_backend : Optional[MetaBackend]
+        Where to store the meta of tiers. Defaults to a `FileMetaBackend`, which stores each tier's meta in its own
+        json file. See [cassini.backends][cassini.backends].
 
 
     Attributes
     ----------
+    meta_backend : MetaBackend
+        Where the meta of tiers is stored.
     __before_setup_files__ : List[Callable[[Project], None]]
         Sequence of callables that are called, in order, first thing when `project.setup_files()` is called.
         `Project` is the calling project instance.
@@ -811,6 +1039,11 @@ class Project:
     This class is a singleton i.e. only 1 instance per interpreter can be created.
     """
 
+    parse_name_cache_size: ClassVar[int] = 2**16
+    """
+    Maximum number of names `parse_name` remembers the result for.
+    """
+
     def __new__(cls, *args: Any, **kwargs: Any) -> Project:
         if env.project:
             raise RuntimeError(
@@ -821,7 +1054,10 @@ class Project:
         return instance
 
     def __init__(
-        self, hierarchy: Sequence[Type[TierABC]], project_folder: Union[str, Path]
+        self,
+        hierarchy: Sequence[Type[TierABC]],
+        project_folder: Union[str, Path],
+        meta_backend: Optional[MetaBackend] = None,
     ) -> None:
         self._rank_map: Dict[Type[TierABC], int] = {}
         self._hierarchy: Sequence[Type[TierABC]] = []
@@ -843,6 +1079,16 @@ class Project:
             else project_folder_path.parent
         )
 
+        self.meta_backend: MetaBackend = (
+            meta_backend if meta_backend else FileMetaBackend()
+        )
+
+        self._index: Optional[ProjectIndex] = None
+        self._search_index: Optional[SearchIndex] = None
+        self._blobs: Optional[BlobStore] = None
+        self._thumbnails: Optional[ThumbnailCache] = None
+        self._names: Optional[NameIndex] = None
+
         self.template_env: PathLibEnv = PathLibEnv(
             autoescape=jinja2.select_autoescape(["html", "xml"]),
             loader=jinja2.FileSystemLoader(self.template_folder),
@@ -863,6 +1109,83 @@ class Project:
         for rank, tier_cls in enumerate(hierarchy):
             self._rank_map[tier_cls] = rank
 
+        # patterns are compiled, and names parsed, once per hierarchy.
+        self._name_patterns = [
+            re.compile(tier_cls.name_part_regex) for tier_cls in hierarchy[1:]
+        ]
+        self._parse_name_cached = functools.lru_cache(self.parse_name_cache_size)(
+            self._parse_name
+        )
+
+    @property
+    def index(self) -> ProjectIndex:
+        """
+        Persistent index of the tiers in this project, stored in `project_folder / config.CASSINI_DIR`. See
+        [cassini.index][cassini.index].
+        """
+        if self._index is None:
+            from .index import ProjectIndex
+
+            self._index = ProjectIndex(self)
+
+        return self._index
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """
+        Full-text index of the meta and highlights of the tiers in this project, stored in
+        `project_folder / config.CASSINI_DIR`. See [cassini.search][cassini.search].
+        """
+        if self._search_index is None:
+            from .search import SearchIndex
+
+            self._search_index = SearchIndex(self)
+
+        return self._search_index
+
+    @property
+    def blobs(self) -> BlobStore:
+        """
+        Content-addressed store of large values e.g. images in highlights, stored in
+        `project_folder / config.CASSINI_DIR`. See [cassini.blobs][cassini.blobs].
+        """
+        if self._blobs is None:
+            self._blobs = BlobStore(
+                self.project_folder / config.CASSINI_DIR / "blobs",
+                compression=config.BLOB_COMPRESSION,
+            )
+
+        return self._blobs
+
+    @property
+    def thumbnails(self) -> ThumbnailCache:
+        """
+        Cache of thumbnails of the images in highlights, stored in `project_folder / config.CASSINI_DIR`. See
+        [cassini.thumbnails][cassini.thumbnails].
+        """
+        if self._thumbnails is None:
+            from .thumbnails import ThumbnailCache
+
+            self._thumbnails = ThumbnailCache(
+                self.project_folder / config.CASSINI_DIR / "thumbnails",
+                max_size=config.THUMBNAIL_SIZE,
+                blobs=self.blobs,
+            )
+
+        return self._thumbnails
+
+    @property
+    def names(self) -> NameIndex:
+        """
+        In memory index of the names of the tiers that exist in this project. See [cassini.names][cassini.names].
+        """
+        if self._names is None:
+            from .names import NameIndex
+
+            self._names = NameIndex(self)
+
+        return self._names
+
     @property
     def rank_map(self):
         """
@@ -931,6 +1254,263 @@ class Project:
             cls = self.hierarchy[rank - 1]
             return cls
 
+    def load_meta(
+        self, tiers: Iterable[TierABC], workers: Optional[int] = None
+    ) -> List[TierABC]:
+        """
+        Load the meta of many tiers in parallel, using a thread pool.
+
+        This fills each tier's meta cache, so subsequent reads e.g. `tier.description` don't need to touch the disk.
+        Tiers without meta are ignored.
+
+        Meta using the default `'ttl'` freshness policy would go stale after `Meta.timeout`, and be re-read anyway, so
+        they're switched to the `'stat'` policy, which keeps their caches until their files change.
+
+        Parameters
+        ----------
+        tiers : Iterable[TierABC]
+            Tiers to load the meta of.
+        workers : Optional[int]
+            Number of threads to use. Default lets `ThreadPoolExecutor` decide.
+
+        Returns
+        -------
+        tiers : List[TierABC]
+            The tiers passed in.
+
+        Example
+        -------
+        ```python
+        smpls = project.load_meta(project['WP1.1'])
+        descriptions = [smpl.description for smpl in smpls]  # doesn't read any files.
+        ```
+        """
+        tiers = list(tiers)
+        metas = [tier.meta for tier in tiers if isinstance(tier, NotebookTierBase)]
+
+        for meta in metas:
+            if meta._freshness == "ttl":
+                meta._freshness = "stat"
+
+        if len(metas) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for _ in pool.map(Meta.fetch, metas):
+                    pass
+        elif metas:
+            metas[0].fetch()
+
+        return tiers
+
+    def walk(
+        self,
+        root: Optional[TierABC] = None,
+        max_depth: Optional[int] = None,
+        workers: Optional[int] = None,
+        prune: Collection[Type[TierABC]] = (),
+    ) -> Iterator[TierABC]:
+        """
+        Iterate over every tier in the project (or below `root`), parents before their children.
+
+        Finding the children of each tier is done by a pool of threads, so the folders of siblings are scanned in
+        parallel, while the tiers found so far are yielded. Siblings are yielded in order of their ids, so the order is
+        stable.
+
+        Parameters
+        ----------
+        root : Optional[TierABC]
+            Tier to start from, which is yielded first. Defaults to `self.home`.
+        max_depth : Optional[int]
+            How many tiers below `root` to go. e.g. `0` only yields `root`, `1` also yields its children. By default
+            there's no limit.
+        workers : Optional[int]
+            Number of threads used to scan folders. Default lets `ThreadPoolExecutor` decide.
+        prune : Collection[Type[TierABC]]
+            Tiers of these classes are yielded, but their children aren't.
+
+        Example
+        -------
+        ```python
+        # every work package and experiment, but no samples or datasets.
+        for tier in project.walk(max_depth=2):
+            print(tier.name)
+        ```
+        """
+        if root is None:
+            root = self.home
+
+        prune = tuple(prune)
+
+        def expand(tier: TierABC, depth: int) -> Optional[Future[List[TierABC]]]:
+            if max_depth is not None and depth >= max_depth:
+                return None
+
+            if not tier.child_cls or isinstance(tier, prune):
+                return None
+
+            return pool.submit(_sorted_children, tier)
+
+        def visit(
+            tier: TierABC, children: Optional[Future[List[TierABC]]], depth: int
+        ) -> Iterator[TierABC]:
+            yield tier
+
+            if children is None:
+                return
+
+            found = children.result()
+            # scan all the children's folders at once, while we go through them one by one.
+            grandchildren = [expand(child, depth + 1) for child in found]
+
+            for child, future in zip(found, grandchildren):
+                yield from visit(child, future, depth + 1)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            yield from visit(root, expand(root, 0), 0)
+
+    def query(
+        self,
+        tier_cls: Type[NotebookTierBase],
+        use_index: Optional[bool] = None,
+        workers: Optional[int] = None,
+    ) -> Query:
+        """
+        Start a query over the meta of every tier of type `tier_cls`. See [cassini.query][cassini.query].
+
+        Parameters
+        ----------
+        tier_cls : Type[NotebookTierBase]
+            Type of tier to query.
+        use_index : Optional[bool]
+            Whether to use `self.index` to find tiers and their meta. By default it's used if it is being served.
+        workers : Optional[int]
+            Number of threads used to read meta, if needed. Default lets `ThreadPoolExecutor` decide.
+
+        Example
+        -------
+        ```python
+        for smpl in project.query(Sample).where(description__icontains="anneal").order_by("-started").limit(50):
+            print(smpl.name)
+        ```
+        """
+        from .query import Query
+
+        return Query(self, tier_cls, use_index=use_index, workers=workers)
+
+    def search(
+        self,
+        text: str,
+        tier_types: Optional[Iterable[Type[TierABC]]] = None,
+        limit: Optional[int] = 20,
+    ) -> List[SearchResult]:
+        """
+        Find the tiers whose meta and highlights best match `text`, using `self.search_index`.
+
+        The search index isn't updated automatically, call `project.search_index.update()` to pick up changes. (The
+        search box of the gui does this before each search.)
+
+        Parameters
+        ----------
+        text : str
+            Terms to search for. Terms ending in `*` match any term they are the start of.
+        tier_types : Optional[Iterable[Type[TierABC]]]
+            Only find tiers of these types. By default, all tiers are searched.
+        limit : Optional[int]
+            Maximum number of results. `None` for all of them.
+
+        Example
+        -------
+        ```python
+        for result in project.search("XRD peak shift", tier_types=[Experiment]):
+            print(result.name, result.score)
+        ```
+        """
+        return self.search_index.search(text, tier_types=tier_types, limit=limit)
+
+    def gc_blobs(self, grace: float = 3600, workers: Optional[int] = None) -> int:
+        """
+        Remove the blobs in `self.blobs` that aren't used by any tier's highlights.
+
+        Only the index of each tier's highlights is read, which lists the blobs they use.
+
+        Parameters
+        ----------
+        grace : float
+            Blobs added or re-used within this many seconds are kept, as the highlights that use them may still be
+            being written.
+        workers : Optional[int]
+            Number of threads used to walk the project, see `walk`.
+
+        Returns
+        -------
+        removed : int
+            Number of blobs removed.
+        """
+        referenced: Set[str] = set()
+
+        for tier in self.walk(workers=workers):
+            if isinstance(tier, NotebookTierBase) and tier.highlights:
+                for name in tier.highlights:
+                    referenced.update(tier.highlights.info(name).blobs)
+
+        return self.blobs.gc(referenced, grace=grace)
+
+    def highlights_report(
+        self,
+        root: Optional[TierABC],
+        out_dir: Union[str, Path],
+        format: ReportFormat = "html",
+        workers: Optional[int] = None,
+    ) -> Path:
+        """
+        Write a static report of the highlights of `root` and every tier below it to `out_dir`, with the images they
+        contain written as separate files. See [cassini.report][cassini.report].
+
+        If a report has already been written to `out_dir`, only the tiers whose highlights have changed since are
+        re-rendered.
+
+        Parameters
+        ----------
+        root : Optional[TierABC]
+            Tier to report on. If `None`, the whole project is reported on.
+        out_dir : Union[str, Path]
+            Folder to write the report to.
+        format : ReportFormat
+            `'html'` or `'markdown'`. Markdown in `'html'` reports is rendered with the optional `mistune` package
+            (`pip install cassini[report]`), otherwise it's shown as plain text.
+        workers : Optional[int]
+            Number of threads used to walk the project and render tiers. Default lets `ThreadPoolExecutor` decide.
+
+        Returns
+        -------
+        document : Path
+            Path to the report's document, `out_dir / 'index.html'` or `out_dir / 'index.md'`.
+        """
+        from .report import HighlightsReport
+
+        report = HighlightsReport(self, Path(out_dir), format=format)
+        report.build(root, workers=workers)
+        return report.document
+
+    def complete(self, prefix: str, limit: Optional[int] = 20) -> List[str]:
+        """
+        Get the names of existing tiers that start with `prefix`, without touching the filesystem. See
+        [NameIndex.complete][cassini.names.NameIndex.complete].
+
+        Example
+        -------
+        ```python
+        project.complete("WP3.1")  # ['WP3.1', 'WP3.1a', 'WP3.1b', ...]
+        ```
+        """
+        return self.names.complete(prefix, limit=limit)
+
+    def exists_name(self, name: str) -> bool:
+        """
+        Check if a tier called `name` exists, without creating the tier or touching the filesystem. See
+        [cassini.names][cassini.names].
+        """
+        return name in self.names
+
     def __getitem__(self, name: str) -> TierABC:
         """
         Retrieve a tier object from the project by name.
@@ -954,6 +1534,14 @@ class Project:
             obj = self.get_tier(identifiers)
         return obj
 
+    def _ipython_key_completions_(self) -> List[str]:
+        """
+        Names offered when completing `project['...`, see [cassini.names][cassini.names].
+
+        Doesn't wait for the project to be scanned for names, so just the names found so far are offered.
+        """
+        return self.names.complete("", limit=None, wait=False)
+
     @soft_prop
     def template_folder(self) -> Path:
         """
@@ -1106,14 +1694,18 @@ class Project:
             ('2', '3')
             >>> TierBase.parse_name('WP2.u3')
             ()
+
+        Each `name_part_regex` is compiled once, when `hierarchy` is set, and the results for the last
+        `parse_name_cache_size` names are remembered.
         """
-        parts = self.hierarchy[1:]
+        return self._parse_name_cached(name)
+
+    def _parse_name(self, name: str) -> Tuple[str, ...]:
         ids: List[str] = []
-        for tier_cls in parts:
-            pattern = tier_cls.name_part_regex
-            match = re.search(pattern, name)
-            if match and match.start(0) == 0:
-                ids.append(match.group(1))
+        for pattern in self._name_patterns:
+            match = pattern.match(name)
+            if match:
+                ids.append(sys.intern(match.group(1)))
                 name = name[match.end(0) :]
             else:
                 break
@@ -0,0 +1,183 @@
+"""
+Index of the `DataSet`s in an `Experiment`, so listing a sample's datasets doesn't need a scan of the experiment folder
+and a stat per technique.
+
+```python
+exp.dataset_index[("XRD", "a")]  # <DataSet "WP1.1a-XRD">
+exp.dataset_index.datasets("a")  # all the datasets of sample 'a'
+```
+
+The index is built with one scan of the experiment folder, for its techniques, and one scan of each technique folder,
+for the samples with data in it. Adding or removing a folder changes the stat signature (i.e. mtime) of the folder it's
+in, so each scan is reused until the folder's signature changes.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+from ..utils import StatSignature, stat_signature
+
+if TYPE_CHECKING:
+    from ..core import TierABC
+
+
+def ignore_dir(name: str) -> bool:
+    if name.startswith("."):
+        return True
+    if name.startswith("_"):
+        return True
+    return False
+
+
+class DatasetIndex(Mapping):
+    """
+    Mapping of `(technique, sample id)` to the `DataSet`s in an `Experiment`. Usually accessed via
+    `experiment.dataset_index`.
+
+    Each access checks the stat signatures of the experiment folder and its technique folders, and only re-scans the
+    folders that have changed.
+
+    Parameters
+    ----------
+    experiment : TierABC
+        Experiment whose datasets are indexed.
+    """
+
+    def __init__(self, experiment: TierABC) -> None:
+        self.experiment = experiment
+        self._signature: Optional[StatSignature] = None
+        self._techniques: List[str] = []
+        self._folders: Dict[str, Tuple[Optional[StatSignature], Dict[str, TierABC]]] = (
+            {}
+        )
+        self._lock = threading.RLock()
+
+    def invalidate(self) -> None:
+        """
+        Forget the scanned folders, so they're scanned again next time the index is used.
+        """
+        with self._lock:
+            self._signature = None
+            self._folders.clear()
+
+    def _scan_techniques(self) -> List[str]:
+        try:
+            entries = list(os.scandir(self.experiment.folder))
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+
+        return [
+            entry.name
+            for entry in entries
+            if entry.is_dir() and not ignore_dir(entry.name)
+        ]
+
+    def _scan_samples(self, technique: str) -> Dict[str, TierABC]:
+        experiment = self.experiment
+        sample_cls = experiment.child_cls
+        assert sample_cls
+        dataset_cls = experiment.project.get_child_cls(sample_cls)
+        assert dataset_cls
+
+        try:
+            entries = list(os.scandir(experiment.folder / technique))
+        except (FileNotFoundError, NotADirectoryError):
+            return {}
+
+        datasets = {}
+
+        for entry in entries:
+            if not entry.is_dir() or ignore_dir(entry.name):
+                continue
+
+            try:
+                datasets[entry.name] = dataset_cls(
+                    *experiment.identifiers,
+                    entry.name,
+                    technique,
+                    project=experiment.project,
+                )
+            except ValueError:  # not named like a sample
+                continue
+
+        return datasets
+
+    def _refresh(self) -> List[str]:
+        folder = self.experiment.folder
+
+        with self._lock:
+            # signatures are taken before scanning, so changes made during a scan are picked up next time.
+            signature = stat_signature(folder)
+
+            if signature != self._signature:
+                self._techniques = self._scan_techniques()
+                self._signature = signature
+
+                for technique in list(self._folders):
+                    if technique not in self._techniques:
+                        del self._folders[technique]
+
+            for technique in self._techniques:
+                signature = stat_signature(folder / technique)
+                scanned = self._folders.get(technique)
+
+                if scanned is None or scanned[0] != signature:
+                    self._folders[technique] = (
+                        signature,
+                        self._scan_samples(technique),
+                    )
+
+            return self._techniques
+
+    def techniques(self) -> List[str]:
+        """
+        Get the names of the techniques in this experiment, i.e. the folders in the experiment folder.
+        """
+        return list(self._refresh())
+
+    def datasets(self, sample_id: str) -> List[TierABC]:
+        """
+        Get the datasets of the sample with id `sample_id`, in the same order as `techniques()`.
+        """
+        with self._lock:
+            techniques = self._refresh()
+            found = []
+
+            for technique in techniques:
+                dataset = self._folders[technique][1].get(sample_id)
+
+                if dataset is not None:
+                    found.append(dataset)
+
+            return found
+
+    def __getitem__(self, key: Tuple[str, str]) -> TierABC:
+        technique, sample_id = key
+
+        with self._lock:
+            self._refresh()
+
+            try:
+                return self._folders[technique][1][sample_id]
+            except KeyError:
+                raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        with self._lock:
+            techniques = self._refresh()
+            keys = [
+                (technique, sample_id)
+                for technique in techniques
+                for sample_id in self._folders[technique][1]
+            ]
+
+        return iter(keys)
+
+    def __len__(self) -> int:
+        with self._lock:
+            techniques = self._refresh()
+            return sum(len(self._folders[technique][1]) for technique in techniques)
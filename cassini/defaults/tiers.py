@@ -1,19 +1,22 @@
 from pathlib import Path
 import os
 
-from typing import Iterator, List, Any, Sequence, cast
+from typing import Iterator, List, Any, Optional, Sequence, Union, cast
 
-from ..core import TierABC, FolderTierBase, NotebookTierBase, HomeTierBase
+from ..core import TierABC, FolderTierBase, NotebookTierBase, HomeTierBase, MetaDict
 from ..accessors import cached_prop
 from ..utils import FileMaker
+from .datasets import DatasetIndex, ignore_dir
 
-
-def ignore_dir(name: str) -> bool:
-    if name.startswith("."):
-        return True
-    if name.startswith("_"):
-        return True
-    return False
+__all__ = [
+    "DEFAULT_TIERS",
+    "Home",
+    "WorkPackage",
+    "Experiment",
+    "Sample",
+    "DataSet",
+    "ignore_dir",
+]
 
 
 class Home(HomeTierBase):
@@ -36,6 +39,8 @@ class WorkPackage(NotebookTierBase):
     Next level down are `Experiment`s.
     """
 
+    __slots__ = ()
+
     pretty_type = "WorkPackage"
     name_part_template = "WP{}"
     short_type = "wp"
@@ -58,6 +63,8 @@ class Experiment(NotebookTierBase):
     Each `Experiment` has a number of samples.
     """
 
+    __slots__ = ("_cached_dataset_index",)
+
     pretty_type = "Experiment"
     name_part_template = ".{}"
     short_type = "exp"
@@ -71,11 +78,15 @@ class Experiment(NotebookTierBase):
         -----
         This just checks for the existence of DataSet folders, and not if they have anything in them!
         """
-        techs = []
-        for entry in os.scandir(self.folder):
-            if entry.is_dir() and not ignore_dir(entry.name):
-                techs.append(entry.name)
-        return techs
+        return self.dataset_index.techniques()
+
+    @cached_prop
+    def dataset_index(self) -> DatasetIndex:
+        """
+        Index of the `DataSet`s in this experiment, by `(technique, sample id)`. See
+        [DatasetIndex][cassini.defaults.datasets.DatasetIndex].
+        """
+        return DatasetIndex(self)
 
     def setup_technique(self, name: str) -> None:
         """
@@ -94,6 +105,8 @@ class Experiment(NotebookTierBase):
         with FileMaker() as maker:
             maker.mkdir(folder)
 
+        self.dataset_index.invalidate()
+
         print("Done")
 
     @property
@@ -117,11 +130,13 @@ class Sample(NotebookTierBase):
     A `Sample` id can't start with a number and can't contain `'-'` (dashes), as these confuse the name parser.
     """
 
+    __slots__ = ()
+
     pretty_type = "Sample"
     name_part_template = "{}"
     id_regex = r"([^0-9^-][^-]*)"
 
-    @cached_prop
+    @property
     def folder(self) -> Path:
         assert self.parent
         return self.parent.folder
@@ -132,15 +147,9 @@ class Sample(NotebookTierBase):
         Convenient way of getting a list of `DataSet`s this sample has.
         """
         assert self.parent
-        assert self.child_cls
         assert isinstance(self.parent, Experiment)
 
-        techs = []
-        for technique in self.parent.techniques:
-            dataset = self.child_cls(*self.identifiers, technique, project=self.project)
-            if dataset.exists():
-                techs.append(dataset)
-        return techs
+        return self.parent.dataset_index.datasets(self.id)
 
     def __iter__(self) -> Iterator[TierABC]:
         return iter(self.datasets)
@@ -153,6 +162,8 @@ class DataSet(FolderTierBase):
     The final tier, intended to represent a folder containing a collection of files relating to a particular `Sample`.
     """
 
+    __slots__ = ()
+
     pretty_type = "DataSet"
     short_type = "dset"
     name_part_template = "-{}"
@@ -168,6 +179,17 @@ class DataSet(FolderTierBase):
     def exists(self) -> bool:
         return self.folder.exists()
 
+    def setup_files(
+        self, template: Union[Path, None] = None, meta: Optional[MetaDict] = None
+    ) -> None:
+        super().setup_files(template, meta)
+
+        assert self.parent
+        experiment = self.parent.parent
+
+        if isinstance(experiment, Experiment):
+            experiment.dataset_index.invalidate()
+
     def __truediv__(self, other: Any) -> Path:
         return cast(Path, self.folder / other)
 
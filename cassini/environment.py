@@ -7,7 +7,23 @@ env : _Env
 
 from __future__ import annotations
 
-from typing import Union, TYPE_CHECKING, TypeVar, Any, List, Dict
+import fnmatch
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from typing import (
+    Union,
+    TYPE_CHECKING,
+    TypeVar,
+    Any,
+    List,
+    Literal,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    cast,
+)
 from typing_extensions import TypeGuard
 
 if TYPE_CHECKING:
@@ -15,6 +31,252 @@ if TYPE_CHECKING:
     from .sharing import ShareableProject
 
 
+CachePolicy = Literal["unbounded", "lru", "weak"]
+
+
+class CacheInfo(NamedTuple):
+    """
+    Statistics of a cache, see [env.cache_stats][cassini.environment._Env.cache_stats].
+
+    Hits and misses are counted by lookups using `cache.get`.
+    """
+
+    name: str
+    policy: str
+    hits: int
+    misses: int
+    evictions: int
+    size: Optional[int]
+    maxsize: Optional[int]
+    memory: Optional[int]
+    """
+    Approximate size in bytes, of the cache and the (shallow) size of its keys and values.
+    """
+
+
+class _CacheStats:
+    """
+    Counts kept by caches created by [env.create_cache][cassini.environment._Env.create_cache].
+    """
+
+    name: str = ""
+    policy: str = "unbounded"
+    maxsize: Optional[int] = None
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def evictions(self) -> int:
+        return 0
+
+    def reset_stats(self) -> None:
+        """
+        Zero the hits, misses and evictions counted so far.
+        """
+        self.hits = 0
+        self.misses = 0
+
+    def _memory(self) -> int:
+        items = list(cast(MutableMapping, self).items())
+        return sys.getsizeof(self) + sum(
+            sys.getsizeof(key) + sys.getsizeof(value) for key, value in items
+        )
+
+    def info(self) -> CacheInfo:
+        """
+        Get the statistics of this cache.
+        """
+        return CacheInfo(
+            self.name,
+            self.policy,
+            self.hits,
+            self.misses,
+            self.evictions,
+            len(cast(MutableMapping, self)),
+            self.maxsize,
+            self._memory(),
+        )
+
+
+class Cache(_CacheStats, dict):
+    """
+    Dictionary that counts hits and misses.
+    """
+
+    def __init__(self, name: str = "") -> None:
+        super().__init__()
+        self.name = name
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            value = dict.__getitem__(self, key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+
+class LRUCache(_CacheStats, OrderedDict):
+    """
+    Dictionary that only keeps its `maxsize` most recently used items. Setting or getting an item makes it the most
+    recently used.
+    """
+
+    policy = "lru"
+
+    def __init__(self, maxsize: int, name: str = "") -> None:
+        super().__init__()
+        self.name = name
+        self.maxsize = maxsize
+        self._evictions = 0
+        self._lock = threading.RLock()
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+    def reset_stats(self) -> None:
+        super().reset_stats()
+        self._evictions = 0
+
+    def __getitem__(self, key: Any) -> Any:
+        with self._lock:
+            value = super().__getitem__(key)
+            self.move_to_end(key)
+            return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            value = self[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        with self._lock:
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+
+            while len(self) > cast(int, self.maxsize):
+                self.popitem(last=False)
+                self._evictions += 1
+
+
+class WeakCache(_CacheStats, weakref.WeakValueDictionary):
+    """
+    Dictionary that only keeps its values while they are referenced elsewhere, as well as keeping the `keep` most
+    recently used alive.
+
+    Unlike an `LRUCache`, there's never more than one value for a key in use, as a value is only dropped once nothing
+    else references it.
+
+    Tiers are made from many threads at once (e.g. by `Project.walk`), so, as in an `LRUCache`, changes to the most
+    recently used are made holding a lock.
+    """
+
+    policy = "weak"
+
+    def __init__(self, keep: int = 0, name: str = "") -> None:
+        super().__init__()
+        self.name = name
+        self.maxsize = keep or None
+        self._recent: OrderedDict = OrderedDict()
+        # values dropped by the garbage collector aren't seen, so evictions are worked out from what was added.
+        self._added = 0
+        self._dropped = 0
+        self._lock = threading.RLock()
+
+    @property
+    def evictions(self) -> int:
+        return self._dropped + self._added - len(self)
+
+    def reset_stats(self) -> None:
+        super().reset_stats()
+        with self._lock:
+            self._dropped = 0
+            self._added = len(self)
+
+    def _keep(self, key: Any, value: Any) -> None:
+        with self._lock:
+            recent = self._recent
+            recent[key] = value
+            recent.move_to_end(key)
+
+            while len(recent) > cast(int, self.maxsize):
+                recent.popitem(last=False)
+
+    def __getitem__(self, key: Any) -> Any:
+        value = super().__getitem__(key)
+        if self.maxsize:
+            self._keep(key, value)
+        return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        # WeakValueDictionary.get gives None for values that have been dropped.
+        value = super().get(key)
+
+        if value is None:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+
+        if self.maxsize:
+            self._keep(key, value)
+
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        with self._lock:
+            if key not in self:
+                self._added += 1
+            super().__setitem__(key, value)
+            if self.maxsize:
+                self._keep(key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        with self._lock:
+            super().__delitem__(key)
+            self._recent.pop(key, None)
+            self._added -= 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._dropped = self.evictions
+            self._added = 0
+            super().clear()
+            self._recent.clear()
+
+
+class CacheCounter(_CacheStats):
+    """
+    Counts hits and misses of caching that isn't done in a cache made by `env.create_cache`, e.g. values stored on
+    instances. It holds no values, so has no size, and clearing it just zeros its counts.
+    """
+
+    policy = "instance"
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def hit(self) -> None:
+        self.hits += 1
+
+    def miss(self) -> None:
+        self.misses += 1
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            self.name, self.policy, self.hits, self.misses, 0, None, None, None
+        )
+
+    def clear(self) -> None:
+        self.reset_stats()
+
+
 class _Env:
     """
     Essentially a global object that describes the state of the project for this interpreter.
@@ -49,7 +311,7 @@ class _Env:
         self.project: Union[Project, None] = None
         self._o: Union[TierABC, None] = None
         self.shareable_project: Union[ShareableProject, None] = None
-        self._caches: List[Dict[Any, Any]] = []
+        self._caches: List[_CacheStats] = []
 
     @staticmethod
     def is_sharing(instance: _Env) -> TypeGuard["_SharingInstance"]:
@@ -69,18 +331,118 @@ class _Env:
     def update(self, obj: TierABC) -> None:
         self._o = obj
 
-    def create_cache(self):
+    def flush_meta(self, timeout: Union[float, None] = None) -> None:
+        """
+        Wait for any meta being written in the background to be written, see [Meta.flush][cassini.meta.Meta.flush].
+        """
+        from .meta import Meta
+
+        Meta.flush(timeout)
+
+    def flush_highlights(self, timeout: Union[float, None] = None) -> None:
+        """
+        Wait for any highlights being added in the background to be written, see
+        [HighlightStore.flush][cassini.highlights.HighlightStore.flush].
+        """
+        from .highlights import HighlightStore
+
+        HighlightStore.flush(timeout)
+
+    def create_cache(
+        self,
+        name: Optional[str] = None,
+        policy: CachePolicy = "unbounded",
+        maxsize: Optional[int] = None,
+    ) -> MutableMapping[Any, Any]:
         """
         Method for creating various caches throughout cassini.
 
         the env instances keeps track of these, to allow them to be cleared
-        cleanly during testing.
+        cleanly during testing, and to report their statistics, see `cache_stats`.
 
         This is an internal feature.
+
+        Parameters
+        ----------
+        name : Optional[str]
+            Name of the cache, used by `cache_stats` and `clear_caches`. By convention, dotted e.g. `'tiers.Sample'`.
+            If not given, the cache is named `'cache<n>'`, with `n` its position in the caches created so far.
+        policy : CachePolicy
+            How the cache is bounded:
+
+            - `'unbounded'`: a [Cache][cassini.environment.Cache], which keeps everything.
+            - `'lru'`: an [LRUCache][cassini.environment.LRUCache], which keeps the `maxsize` most recently used items.
+            - `'weak'`: a [WeakCache][cassini.environment.WeakCache], which keeps values while they are referenced
+              elsewhere, and the `maxsize` most recently used.
+        maxsize : Optional[int]
+            Size of the cache, required for `'lru'`.
         """
-        cache = dict()
+        cache: _CacheStats
+
+        if name is None:
+            name = f"cache{len(self._caches)}"
+
+        if policy == "unbounded":
+            cache = Cache(name)
+        elif policy == "lru":
+            if not maxsize:
+                raise ValueError("maxsize must be given for an 'lru' cache")
+            cache = LRUCache(maxsize, name=name)
+        elif policy == "weak":
+            cache = WeakCache(maxsize or 0, name=name)
+        else:
+            raise ValueError(f"Unknown cache policy {policy}")
+
         self._caches.append(cache)
-        return cache
+        return cast(MutableMapping[Any, Any], cache)
+
+    def create_counter(self, name: str) -> CacheCounter:
+        """
+        Create a [CacheCounter][cassini.environment.CacheCounter], for reporting the hits and misses of caching that
+        doesn't use a cache from `create_cache`.
+
+        This is an internal feature.
+        """
+        counter = CacheCounter(name)
+        self._caches.append(counter)
+        return counter
+
+    def cache_stats(self, name: Optional[str] = None) -> List[CacheInfo]:
+        """
+        Get the statistics of cassini's caches, to see whether they're helping.
+
+        Parameters
+        ----------
+        name : Optional[str]
+            Only include caches whose name matches this glob-style pattern e.g. `'tiers.*'`. By default all are
+            included.
+
+        Returns
+        -------
+        stats : List[CacheInfo]
+            One row per cache. Pass to `pandas.DataFrame` to get a table.
+        """
+        return [cache.info() for cache in self._matching(name)]
+
+    def clear_caches(self, name: Optional[str] = None) -> None:
+        """
+        Empty cassini's caches, and zero their statistics.
+
+        Parameters
+        ----------
+        name : Optional[str]
+            Only clear caches whose name matches this glob-style pattern e.g. `'tiers.*'`. By default all are cleared.
+        """
+        for cache in self._matching(name):
+            cast(MutableMapping, cache).clear()
+            cache.reset_stats()
+
+    def _matching(self, name: Optional[str]) -> List[_CacheStats]:
+        if name is None:
+            return list(self._caches)
+        return [
+            cache for cache in self._caches if fnmatch.fnmatchcase(cache.name, name)
+        ]
 
     def _reset(self):
         """
@@ -91,8 +453,7 @@ class _Env:
         self.shareable_project = None
         self.project = None
 
-        for cache in self._caches:
-            cache.clear()
+        self.clear_caches()
 
 
 class _SharingInstance(_Env):
@@ -29,6 +29,7 @@ from IPython.display import display, Markdown, publish_display_data  # type: ign
 from ...environment import env
 
 from ...core import TierABC, NotebookTierBase
+from ...thumbnails import THUMBNAIL_MIMETYPES, ThumbnailCache
 
 
 def create_children_df(
@@ -43,7 +44,8 @@ def create_children_df(
     if include and exclude:
         raise ValueError("Only one of include or exclude can be provided")
 
-    children = list(tier)
+    # only called for tiers whose children have meta.
+    children = cast(List[NotebookTierBase], tier.children(prefetch_meta=True))
 
     if not children:
         return None
@@ -265,7 +267,8 @@ class InputSequence:
 
 class SearchWidget:
     def __init__(self) -> None:
-        self.search = Text(placeholder="Name")
+        self.search = Text(placeholder="Name or text")
+        self.limit = 10
         self.go_btn = Button(description="Search")
         self.clear_btn = Button(description="Clear")
         self.out = Output()
@@ -286,12 +289,31 @@ class SearchWidget:
         self.out.clear_output()
 
         with self.out:
-            obj = env.project[name]
+            try:
+                obj = env.project[name]
+            except ValueError:
+                # not a name, so look for it in the text of each tier instead.
+                self.show_results(name)
+                return
+
             if obj.exists():
                 display(obj.gui.header())
             else:
                 print(f"{obj.name} valid, but doesn't exist")
 
+    def show_results(self, text: str) -> None:
+        assert env.project
+
+        # only re-reads the tiers changed since the last search.
+        env.project.search_index.update()
+        results = env.project.search(text, limit=self.limit)
+
+        if not results:
+            print(f"Nothing found matching {text}")
+
+        for result in results:
+            display(env.project.get_tier(result.identifiers).gui.header())
+
     def as_widget(self) -> VBox:
         return VBox([HBox([self.search, self.go_btn, self.clear_btn]), self.out])
 
@@ -370,23 +392,48 @@ class BaseTierGui(Generic[T]):
     def _build_highlights_accordion(self) -> Union[DOMWidget, None]:
         """
         Creates a widget that displays highlights for this `Tier` in an `ipywidgets.Accordion` - which is nice!
+
+        Images are shown as thumbnails (see [cassini.thumbnails][cassini.thumbnails]), with a button to show them full
+        size.
         """
         if not isinstance(self.tier, NotebookTierBase):
             return None
 
-        highlights = self.tier.get_highlights()
+        highlights = self.tier.highlights
 
         if not highlights:
             return None
 
+        thumbnails: Optional[ThumbnailCache] = self.tier.project.thumbnails
+
+        if thumbnails is not None and not thumbnails.enabled:
+            thumbnails = None
+
         widget = Accordion()
 
-        for i, (name, highlight) in enumerate(highlights.items()):
-            out = Output()
-            widget.children = (*widget.children, out)
+        def show(out: Output, name: str, full: bool) -> None:
+            out.clear_output()
             with out:
-                for item in highlight:
+                for item in highlights.load(
+                    name, thumbnails=None if full else thumbnails
+                ):
                     publish_display_data(**item)
+
+        for i, name in enumerate(highlights.titles()):
+            out = Output()
+            show(out, name, full=False)
+
+            if thumbnails and not THUMBNAIL_MIMETYPES.keys().isdisjoint(
+                highlights.info(name).mimetypes
+            ):
+                full_btn = Button(description="Full size")
+                full_btn.on_click(
+                    lambda btn, out=out, name=name: show(out, name, full=True)
+                )
+                widget.children = (*widget.children, VBox((out, full_btn)))
+            else:
+                widget.children = (*widget.children, out)
+
             widget.set_title(i, name)
         widget.selected_index = None
         return widget
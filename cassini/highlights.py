@@ -0,0 +1,487 @@
+"""
+Storage for the highlights of a tier, i.e. the outputs captured by the `%%hlt` magic.
+
+A tier's highlights are stored in a single json file at `tier.highlights_file`, mapping each highlight's title to its
+outputs, `{title: [outputs]}`, which is what other readers, such as the JupyterLab extension, open. Next to it, a folder
+holds a small index of the highlights' titles and metadata, `index.json`, and a payload file for each highlight, holding
+its outputs:
+
+```
+.exps/
+    WP1.1.hlts
+    WP1.1.hlts.d/
+        index.json
+        3f2a...json
+        9c1b...json
+```
+
+This means listing the titles of a tier's highlights only needs the index to be read, however big the outputs are
+(e.g. base64 encoded images). Payloads are only read when they're accessed:
+
+```python
+store = tier.highlights
+store.titles()  # reads index.json
+store["Peak fitting"]  # reads just this highlight's payload
+```
+
+Outputs can optionally be stored in the project's [BlobStore][cassini.blobs.BlobStore] instead, with the payload just
+holding a reference to them, by setting `config.HIGHLIGHT_BLOB_THRESHOLD` to the size in bytes above which outputs,
+such as images, are moved. This means identical outputs are only stored once, however many highlights they're in, and
+payloads stay small. It's off by default, as readers that don't know about blobs can't resolve these references.
+Either way, outputs are always stored inline in `tier.highlights_file`.
+
+Highlights can also be added by a background thread, with `add(..., background=True)`, so the caller doesn't wait for
+them to be serialised and written (this is what the `%%hlt` magic does). `HighlightStore.flush()` waits for them to be
+written, which also happens when the interpreter exits.
+
+The index records the stat signature of `tier.highlights_file` it was written alongside. If the highlights file has
+since been written by something else, e.g. an older version of cassini, or the highlights were copied without their
+index, it's read in full instead, and the index and payloads are rebuilt the next time a highlight is added or
+removed.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+from collections.abc import Mapping
+from pathlib import Path
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+from .backends import folder_lock
+from .blobs import BlobStore
+from .utils import BackgroundWriter, StatSignature, atomic_write, stat_signature
+
+if TYPE_CHECKING:
+    from .thumbnails import ThumbnailCache
+
+HighlightType = List[Dict[str, Dict[str, Any]]]
+HighlightsType = Dict[str, HighlightType]
+
+BLOB_KEY = "cassini/blob"
+"""
+Key of the reference that replaces an output stored in a blob, i.e. `{"cassini/blob": "<digest>"}`.
+"""
+
+
+class HighlightInfo(NamedTuple):
+    """
+    Entry in the index of a [HighlightStore][cassini.highlights.HighlightStore].
+    """
+
+    name: str
+    key: str
+    """
+    Name of the payload file, without its suffix.
+    """
+    size: int
+    """
+    Size of the payload in bytes.
+    """
+    mimetypes: Tuple[str, ...]
+    """
+    Mimetypes of the highlight's outputs.
+    """
+    blobs: Tuple[str, ...] = ()
+    """
+    Digests of the blobs the highlight's outputs are stored in.
+    """
+
+
+def _blob_ref(value: Any) -> Optional[str]:
+    if isinstance(value, dict) and len(value) == 1:
+        digest = value.get(BLOB_KEY)
+        if isinstance(digest, str):
+            return digest
+    return None
+
+
+def _mimetypes(data: HighlightType) -> Tuple[str, ...]:
+    mimetypes: Dict[str, None] = {}
+
+    for output in data:
+        if isinstance(output, dict) and isinstance(output.get("data"), dict):
+            mimetypes.update(dict.fromkeys(output["data"]))
+
+    return tuple(mimetypes)
+
+
+class HighlightStore(Mapping):
+    """
+    Mapping of the titles of a tier's highlights to their outputs, which are only read from disk when accessed. Usually
+    accessed via `tier.highlights`.
+
+    Parameters
+    ----------
+    path : Path
+        Json file the highlights are stored in. The index and payloads are kept in the folder `path.name + '.d'` next
+        to it.
+    blobs : Optional[BlobStore]
+        Where big outputs are stored, and where outputs already stored in blobs are read from.
+    blob_threshold : Optional[int]
+        Outputs whose json is bigger than this many bytes are stored in `blobs`. If `None` (the default), all outputs
+        are stored in the payloads.
+
+    Attributes
+    ----------
+    index_name : str
+        (class attribute) Name of the index file within `folder`.
+    """
+
+    index_name: ClassVar[str] = "index.json"
+
+    _writer: ClassVar[BackgroundWriter] = BackgroundWriter("highlights")
+
+    def __init__(
+        self,
+        path: Path,
+        blobs: Optional[BlobStore] = None,
+        blob_threshold: Optional[int] = None,
+    ) -> None:
+        self.path = path
+        self.blobs = blobs
+        self.blob_threshold = blob_threshold
+        self._signature: Optional[StatSignature] = None
+        self._index: Dict[str, HighlightInfo] = {}
+        self._highlights: Optional[HighlightsType] = None
+
+    @property
+    def folder(self) -> Path:
+        """
+        Folder the index and payloads are kept in, next to `path`.
+        """
+        return self.path.with_name(f"{self.path.name}.d")
+
+    @property
+    def index_file(self) -> Path:
+        return self.folder / self.index_name
+
+    @staticmethod
+    def key(name: str) -> str:
+        """
+        Get the name of the payload file for the highlight called `name`.
+        """
+        return hashlib.sha1(name.encode("utf-8")).hexdigest()
+
+    def _read(self) -> HighlightsType:
+        """
+        Read all the highlights from `path`.
+        """
+        try:
+            return json.loads(self.path.read_bytes() or b"{}")
+        except FileNotFoundError:
+            return {}
+
+    def _read_index(
+        self, signature: StatSignature
+    ) -> Optional[Dict[str, HighlightInfo]]:
+        """
+        Read the index, or get `None` if it wasn't written alongside the highlights file with `signature`.
+        """
+        try:
+            stored = json.loads(self.index_file.read_bytes())
+        except FileNotFoundError:
+            return None
+
+        if stored["signature"] != list(signature):
+            return None
+
+        return {
+            entry[0]: HighlightInfo(
+                entry[0], entry[1], entry[2], tuple(entry[3]), tuple(entry[4])
+            )
+            for entry in stored["entries"]
+        }
+
+    def _load(self) -> Dict[str, HighlightInfo]:
+        """
+        Get the index, re-reading it if the stat signature of the highlights file has changed.
+
+        If the index is out of date, the highlights file is read instead, and kept in `_highlights`.
+        """
+        signature = stat_signature(self.path)
+
+        if signature != self._signature:
+            index = self._read_index(signature) if signature is not None else {}
+            highlights = None
+
+            if index is None:
+                highlights = self._read()
+                index = {
+                    name: HighlightInfo(
+                        name, self.key(name), len(json.dumps(data)), _mimetypes(data)
+                    )
+                    for name, data in highlights.items()
+                }
+
+            self._index, self._highlights = index, highlights
+            self._signature = signature
+
+        return self._index
+
+    def signature(self) -> Optional[StatSignature]:
+        """
+        Fingerprint of the highlights on disk, which changes whenever one is added or removed. `None` if there aren't
+        any highlights yet.
+        """
+        return stat_signature(self.path)
+
+    def titles(self) -> List[str]:
+        """
+        Get the titles of the highlights, in the order they were added.
+        """
+        return list(self._load())
+
+    def info(self, name: str) -> HighlightInfo:
+        """
+        Get the index entry for the highlight called `name`, without reading its payload.
+        """
+        return self._load()[name]
+
+    def load(
+        self,
+        name: str,
+        resolve: bool = True,
+        thumbnails: Optional[ThumbnailCache] = None,
+    ) -> HighlightType:
+        """
+        Read the outputs of the highlight called `name`.
+
+        Parameters
+        ----------
+        name : str
+            Title of the highlight.
+        resolve : bool
+            If `False`, outputs stored in blobs are left as references, `{"cassini/blob": "<digest>"}`, rather than being
+            read.
+        thumbnails : Optional[ThumbnailCache]
+            If given, and enabled, `image/png` and `image/jpeg` outputs are replaced by their thumbnails, so the full
+            size images needn't be read. See [cassini.thumbnails][cassini.thumbnails].
+        """
+        info = self._load()[name]
+
+        if thumbnails is not None and not thumbnails.enabled:
+            thumbnails = None
+
+        if self._highlights is not None:
+            data = self._highlights[name]
+
+            if thumbnails is None:
+                return data
+
+            data = copy.deepcopy(data)  # as images are replaced below.
+        else:
+            try:
+                data = json.loads((self.folder / f"{info.key}.json").read_bytes())
+            except FileNotFoundError:  # removed since the index was read
+                raise KeyError(name) from None
+
+        if resolve and (info.blobs or thumbnails is not None):
+            from .thumbnails import THUMBNAIL_MIMETYPES
+
+            for output in data:
+                bundle = output.get("data") if isinstance(output, dict) else None
+
+                if not isinstance(bundle, dict):
+                    continue
+
+                for mimetype, value in bundle.items():
+                    if thumbnails is not None and mimetype in THUMBNAIL_MIMETYPES:
+                        bundle[mimetype] = thumbnails.get(mimetype, value)
+                        continue
+
+                    digest = _blob_ref(value)
+
+                    if digest is not None:
+                        if self.blobs is None:
+                            raise KeyError(
+                                f"Highlight {name} has outputs stored in blobs, but this store has no BlobStore"
+                            )
+                        bundle[mimetype] = json.loads(self.blobs.get(digest))
+
+        return data
+
+    def __getitem__(self, name: str) -> HighlightType:
+        return self.load(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.titles())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._load()
+
+    def _write(
+        self, highlights: HighlightsType, index: Dict[str, HighlightInfo]
+    ) -> None:
+        """
+        Write the highlights file, then the index, recording the signature of the highlights file it matches.
+        """
+        atomic_write(self.path, json.dumps(highlights).encode("utf-8"))
+        signature = stat_signature(self.path)
+
+        stored = {
+            "signature": signature,
+            "entries": [list(info) for info in index.values()],
+        }
+        atomic_write(self.index_file, json.dumps(stored).encode("utf-8"))
+
+        self._index, self._highlights = index, None
+        self._signature = signature
+
+    def _encode(self, name: str, data: HighlightType) -> Tuple[bytes, HighlightInfo]:
+        """
+        Serialise `data`, moving outputs bigger than `blob_threshold` into blobs.
+        """
+        threshold = self.blob_threshold
+        digests: Dict[str, None] = {}
+
+        if self.blobs is not None and threshold is not None:
+            outputs = []
+
+            for output in data:
+                bundle = output.get("data") if isinstance(output, dict) else None
+
+                if isinstance(bundle, dict):
+                    bundle = dict(bundle)
+
+                    for mimetype, value in bundle.items():
+                        encoded = json.dumps(value).encode("utf-8")
+
+                        if len(encoded) > threshold:
+                            digest = self.blobs.put(encoded)
+                            digests[digest] = None
+                            bundle[mimetype] = {BLOB_KEY: digest}
+
+                    output = {**output, "data": bundle}
+
+                outputs.append(output)
+
+            data = outputs
+
+        payload = json.dumps(data).encode("utf-8")
+        info = HighlightInfo(
+            name, self.key(name), len(payload), _mimetypes(data), tuple(digests)
+        )
+        return payload, info
+
+    def _sync(self) -> Tuple[HighlightsType, Dict[str, HighlightInfo]]:
+        """
+        Read all the highlights, and the index, rebuilding the index and payloads if they're out of date. Must be called
+        holding the lock.
+        """
+        index = dict(self._load())
+
+        if self._highlights is None:
+            return self._read(), index
+
+        highlights = dict(self._highlights)
+        self.folder.mkdir(exist_ok=True)
+
+        index = {}
+        for name, data in highlights.items():
+            payload, index[name] = self._encode(name, data)
+            atomic_write(self.folder / f"{index[name].key}.json", payload)
+
+        # payloads of highlights that have since been removed.
+        payloads = {f"{info.key}.json" for info in index.values()}
+        for file in self.folder.glob("*.json"):
+            if file.name != self.index_name and file.name not in payloads:
+                file.unlink(missing_ok=True)
+
+        return highlights, index
+
+    def add(
+        self,
+        name: str,
+        data: HighlightType,
+        overwrite: bool = True,
+        background: bool = False,
+    ) -> None:
+        """
+        Add the highlight called `name` with outputs `data`, replacing any existing highlight with that name.
+
+        The highlights file, the highlight's payload, the index, and any blobs that aren't already stored are written.
+
+        Parameters
+        ----------
+        name : str
+            Title of the highlight.
+        data : HighlightType
+            list of data and metadata that can be passed to `IPython.display.publish_display_data` to render. Must not
+            be changed afterwards if `background=True`.
+        overwrite : bool
+            If `False` will raise an exception if a highlight of the same `name` exists. Default is `True`
+        background : bool
+            If `True`, the highlight is serialised and written by a background thread, and isn't seen by readers until
+            it's written. If the same highlight is added again before then, only the latest is written. Any exception
+            is raised by the next call to `flush`.
+        """
+        if background:
+            self._writer.submit(
+                (self.path, name), lambda: self.add(name, data, overwrite=overwrite)
+            )
+            return
+
+        payload, info = self._encode(name, data)
+
+        # meta backends that don't use files may not have created the meta folder.
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with folder_lock(self.path.parent):
+            highlights, index = self._sync()
+
+            if not overwrite and name in index:
+                raise KeyError("Attempting to overwrite existing meta value")
+
+            self.folder.mkdir(exist_ok=True)
+            atomic_write(self.folder / f"{info.key}.json", payload)
+
+            highlights[name] = data
+            index[name] = info
+            self._write(highlights, index)
+
+    @classmethod
+    def flush(cls, timeout: Optional[float] = None) -> None:
+        """
+        Wait for all highlights being added in the background (to any store) to be written.
+
+        Raises the first exception any of them caused.
+
+        Parameters
+        ----------
+        timeout : Optional[float]
+            Maximum time to wait in secs. Raises `TimeoutError` if exceeded. By default waits forever.
+        """
+        cls._writer.flush(timeout)
+
+    def remove(self, name: str) -> None:
+        """
+        Remove the highlight called `name`. Only the highlights file, its payload and the index are touched.
+
+        Blobs it used aren't removed, as other highlights may use them too, see
+        [Project.gc_blobs][cassini.core.Project.gc_blobs].
+        """
+        if name not in self:
+            raise KeyError(name)
+
+        with folder_lock(self.path.parent):
+            highlights, index = self._sync()
+            info = index.pop(name)
+            highlights.pop(name)
+
+            self._write(highlights, index)
+            (self.folder / f"{info.key}.json").unlink(missing_ok=True)
@@ -0,0 +1,511 @@
+"""
+A persistent index of the tiers in a project, stored in an SQLite database.
+
+Finding all the tiers in a project means scanning every folder, and reading their meta means opening every meta file.
+For big projects, or projects on network drives, this can take a long time, and it's repeated by every kernel. The
+index records each tier's identifiers, type, paths, whether it exists and some of its meta, so they can be looked up
+without touching the rest of the filesystem:
+
+```python
+index = project.index
+index.rebuild()  # scan the whole project, in parallel.
+
+for entry in index.entries(tier_type="Experiment"):
+    print(entry.name, entry.meta.get("description"))
+
+index.refresh()  # re-scan, only re-reading meta files that have changed.
+```
+
+The index is stored in `project_folder / config.CASSINI_DIR / 'index.sqlite'`, so is shared by all kernels.
+
+By default, the index is only used when asked. Setting `project.index.serve = True` makes iterating over a tier's
+children and `tier.exists()` use the index, for tiers it knows about. Tiers created or removed in this interpreter
+update the index, but changes made elsewhere aren't seen until `refresh()` is called.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
+
+from pydantic import JsonValue
+
+from .config import config
+
+if TYPE_CHECKING:
+    from .core import Project, TierABC
+
+
+class IndexEntry:
+    """
+    What the index knows about a tier.
+
+    Paths are only made when they're accessed, as that's most of the cost of listing many entries.
+
+    Attributes
+    ----------
+    name : str
+        Name of the tier.
+    identifiers : Tuple[str, ...]
+        Identifiers of the tier.
+    tier_type : str
+        Name of the tier's class.
+    parent : Optional[str]
+        Name of the tier's parent, `None` for the home tier.
+    exists : bool
+        Whether the tier existed when it was indexed.
+    meta : Dict[str, JsonValue]
+        Values of `ProjectIndex.meta_fields` in the tier's meta.
+    """
+
+    __slots__ = (
+        "name",
+        "identifiers",
+        "tier_type",
+        "parent",
+        "exists",
+        "meta",
+        "_root",
+        "_folder",
+        "_file",
+        "_meta_file",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        identifiers: Tuple[str, ...],
+        tier_type: str,
+        parent: Optional[str],
+        exists: bool,
+        meta: Dict[str, JsonValue],
+        root: Path,
+        folder: Optional[str],
+        file: Optional[str],
+        meta_file: Optional[str],
+    ) -> None:
+        self.name = name
+        self.identifiers = identifiers
+        self.tier_type = tier_type
+        self.parent = parent
+        self.exists = exists
+        self.meta = meta
+        self._root = root
+        self._folder = folder
+        self._file = file
+        self._meta_file = meta_file
+
+    def _path(self, relative: Optional[str]) -> Optional[Path]:
+        return None if relative is None else self._root / relative
+
+    @property
+    def folder(self) -> Optional[Path]:
+        """
+        Folder of the tier.
+        """
+        return self._path(self._folder)
+
+    @property
+    def file(self) -> Optional[Path]:
+        """
+        Notebook of the tier, if it has one.
+        """
+        return self._path(self._file)
+
+    @property
+    def meta_file(self) -> Optional[Path]:
+        """
+        Meta file of the tier, if it has one.
+        """
+        return self._path(self._meta_file)
+
+    def __repr__(self) -> str:
+        return f'<IndexEntry "{self.name}" ({self.tier_type})>'
+
+
+def open_database(
+    database: Path, schema_version: int, schema: Sequence[str]
+) -> sqlite3.Connection:
+    """
+    Open a connection to an SQLite database used by cassini, creating it if needed.
+
+    If the database's `user_version` isn't `schema_version`, the `schema` statements are run to (re-)create it.
+
+    Parameters
+    ----------
+    database : Path
+        Path to the database.
+    schema_version : int
+        Version of the schema the caller expects.
+    schema : Sequence[str]
+        Statements that drop and create the tables of the database.
+    """
+    database.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(database, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+
+    (version,) = connection.execute("PRAGMA user_version").fetchone()
+
+    if version != schema_version:
+        for statement in schema:
+            connection.execute(statement)
+        connection.execute(f"PRAGMA user_version = {schema_version}")
+
+    return connection
+
+
+_COLUMNS = "name, identifiers, tier_type, parent, folder, file, meta_file, exists_, meta, signature"
+
+
+class ProjectIndex:
+    """
+    Persistent index of the tiers in a project. Usually accessed via `project.index`.
+
+    Parameters
+    ----------
+    project : Project
+        Project to index.
+    database : Optional[Union[str, Path]]
+        Path to the database. Defaults to `project.project_folder / config.CASSINI_DIR / 'index.sqlite'`.
+    meta_fields : Sequence[str]
+        Meta keys to store in the index.
+
+    Attributes
+    ----------
+    serve : bool
+        If `True`, iterating over a tier's children and `tier.exists()` use the index. Default is `False`. The index
+        should be built (see `rebuild`) before this is turned on.
+    """
+
+    schema_version = 1
+
+    def __init__(
+        self,
+        project: Project,
+        database: Optional[Union[str, Path]] = None,
+        meta_fields: Sequence[str] = ("description", "conclusion", "started"),
+    ) -> None:
+        self.project = project
+        self.database: Path = (
+            Path(database)
+            if database
+            else project.project_folder / config.CASSINI_DIR / "index.sqlite"
+        )
+        self.meta_fields: Tuple[str, ...] = tuple(meta_fields)
+        self.serve: bool = False
+        self._scanning = 0
+        self._local = threading.local()
+
+    @property
+    def serving(self) -> bool:
+        """
+        Whether the index is currently being used to answer queries about tiers. This is turned off while it's being
+        updated, so the filesystem is used instead.
+        """
+        return self.serve and not self._scanning
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        Connection to the database for the current thread. Creates the database if needed.
+        """
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            connection = open_database(
+                self.database,
+                self.schema_version,
+                [
+                    "DROP TABLE IF EXISTS tiers",
+                    "CREATE TABLE tiers ("
+                    "name TEXT PRIMARY KEY, identifiers TEXT NOT NULL, tier_type TEXT NOT NULL, parent TEXT, "
+                    "folder TEXT, file TEXT, meta_file TEXT, exists_ INTEGER NOT NULL, meta TEXT NOT NULL, "
+                    "signature TEXT)",
+                    "CREATE INDEX tiers_parent ON tiers (parent)",
+                ],
+            )
+            self._local.connection = connection
+
+        return connection
+
+    def close(self) -> None:
+        """
+        Close this thread's connection to the database.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _path(self, path: Optional[Path]) -> Optional[str]:
+        if path is None:
+            return None
+        try:
+            return path.relative_to(self.project.project_folder).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _entry(self, row: Sequence[Any]) -> IndexEntry:
+        name, identifiers, tier_type, parent, folder, file, meta_file, exists, meta = (
+            row[:9]
+        )
+        return IndexEntry(
+            name=name,
+            identifiers=tuple(json.loads(identifiers)),
+            tier_type=tier_type,
+            parent=parent,
+            exists=bool(exists),
+            meta=json.loads(meta),
+            root=self.project.project_folder,
+            folder=folder,
+            file=file,
+            meta_file=meta_file,
+        )
+
+    def _row(self, tier: TierABC, previous: Optional[Sequence[Any]] = None) -> Tuple:
+        """
+        Make the row for `tier`. If `previous` is given, and the meta hasn't changed since, its meta is reused.
+        """
+        from .core import NotebookTierBase
+
+        parent = tier.parent
+        file = meta_file = None
+        meta = "{}"
+        signature = None
+
+        if isinstance(tier, NotebookTierBase):
+            file, meta_file = tier.file, tier.meta_file
+            backend = tier.meta._backend
+            current = backend.signature(meta_file)
+            signature = None if current is None else json.dumps(current)
+
+            if previous is not None and previous[9] == signature:
+                meta = previous[8]
+            elif current is not None:
+                meta = json.dumps(self._read_meta_fields(backend.read(meta_file)))
+
+        return (
+            tier.name,
+            json.dumps(tier.identifiers),
+            type(tier).__name__,
+            parent.name if parent else None,
+            self._path(tier.folder),
+            self._path(file),
+            self._path(meta_file),
+            int(tier.exists()),
+            meta,
+            signature,
+        )
+
+    def _read_meta_fields(self, data: Optional[bytes]) -> Dict[str, JsonValue]:
+        if not data:
+            return {}
+
+        try:
+            contents = json.loads(data)
+        except ValueError:
+            return {}
+
+        return {key: contents[key] for key in self.meta_fields if key in contents}
+
+    @contextlib.contextmanager
+    def _scanning_files(self) -> Iterator[None]:
+        self._scanning += 1
+        try:
+            yield
+        finally:
+            self._scanning -= 1
+
+    def _scan(
+        self, workers: Optional[int], previous: Dict[str, Sequence[Any]]
+    ) -> List[Tuple]:
+        with self._scanning_files():
+            tiers = list(self.project.walk(workers=workers))
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return list(
+                    pool.map(
+                        lambda tier: self._row(tier, previous.get(tier.name)), tiers
+                    )
+                )
+
+    def _store(self, rows: List[Tuple], replace_all: bool) -> None:
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+
+        try:
+            if replace_all:
+                connection.execute("DELETE FROM tiers")
+            connection.executemany(
+                f"INSERT OR REPLACE INTO tiers ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        else:
+            connection.execute("COMMIT")
+
+    def rebuild(self, workers: Optional[int] = None) -> int:
+        """
+        Re-index the whole project from scratch, reading every meta file. Scanning is done in parallel, see
+        [Project.walk][cassini.core.Project.walk].
+
+        Parameters
+        ----------
+        workers : Optional[int]
+            Number of threads to use. Default lets `ThreadPoolExecutor` decide.
+
+        Returns
+        -------
+        count : int
+            Number of tiers indexed.
+        """
+        rows = self._scan(workers, {})
+        self._store(rows, replace_all=True)
+        return len(rows)
+
+    def refresh(self, workers: Optional[int] = None) -> int:
+        """
+        Re-scan the project, only re-reading meta files whose signature has changed since they were indexed. Tiers
+        that no longer exist are dropped from the index.
+
+        Parameters
+        ----------
+        workers : Optional[int]
+            Number of threads to use. Default lets `ThreadPoolExecutor` decide.
+
+        Returns
+        -------
+        count : int
+            Number of tiers whose meta was re-read, or which were added or removed.
+        """
+        previous = {
+            row[0]: row
+            for row in self.connection.execute(f"SELECT {_COLUMNS} FROM tiers")
+        }
+        rows = self._scan(workers, previous)
+
+        changed = len(previous.keys() - set(row[0] for row in rows))
+        for row in rows:
+            old = previous.get(row[0])
+            if old is None or old[9] != row[9]:
+                changed += 1
+
+        self._store(rows, replace_all=True)
+        return changed
+
+    def update(self, tier: TierABC) -> None:
+        """
+        Re-index a single tier.
+        """
+        with self._scanning_files():
+            row = self._row(tier)
+
+        self._store([row], replace_all=False)
+
+    def remove(self, tier: TierABC) -> None:
+        """
+        Remove a tier from the index.
+        """
+        self.connection.execute("DELETE FROM tiers WHERE name = ?", (tier.name,))
+
+    def get(self, name: str) -> Optional[IndexEntry]:
+        """
+        Get the entry for the tier called `name`, `None` if it's not in the index.
+        """
+        row = self.connection.execute(
+            f"SELECT {_COLUMNS} FROM tiers WHERE name = ?", (name,)
+        ).fetchone()
+        return self._entry(row) if row else None
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def __len__(self) -> int:
+        (count,) = self.connection.execute("SELECT count(*) FROM tiers").fetchone()
+        return count
+
+    def entries(
+        self, parent: Optional[str] = None, tier_type: Optional[str] = None
+    ) -> List[IndexEntry]:
+        """
+        Get entries from the index, in the order they were found in.
+
+        Parameters
+        ----------
+        parent : Optional[str]
+            Only get the children of the tier with this name.
+        tier_type : Optional[str]
+            Only get tiers of the class with this name, e.g. `'Experiment'`.
+        """
+        query = f"SELECT {_COLUMNS} FROM tiers"
+        conditions, params = [], []
+
+        if parent is not None:
+            conditions.append("parent = ?")
+            params.append(parent)
+
+        if tier_type is not None:
+            conditions.append("tier_type = ?")
+            params.append(tier_type)
+
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        rows = self.connection.execute(query + " ORDER BY rowid", params)
+        return [self._entry(row) for row in rows]
+
+    def __iter__(self) -> Iterator[IndexEntry]:
+        return iter(self.entries())
+
+    def tier(self, entry: IndexEntry) -> TierABC:
+        """
+        Get the tier object for an entry.
+        """
+        return self._tier(entry.identifiers)
+
+    def _tier(self, identifiers: Tuple[str, ...]) -> TierABC:
+        # identifiers in the index came from tiers, so don't need checking again.
+        cls = self.project.hierarchy[len(identifiers)]
+        return cls._trusted(identifiers, self.project)
+
+    def children(self, tier: TierABC) -> Optional[List[TierABC]]:
+        """
+        Get the children of `tier` from the index. Returns `None` if `tier` isn't in the index.
+        """
+        if not self.connection.execute(
+            "SELECT 1 FROM tiers WHERE name = ?", (tier.name,)
+        ).fetchone():
+            return None
+
+        rows = self.connection.execute(
+            "SELECT identifiers FROM tiers WHERE parent = ? ORDER BY rowid",
+            (tier.name,),
+        )
+        return [self._tier(tuple(json.loads(identifiers))) for (identifiers,) in rows]
+
+    def exists(self, tier: TierABC) -> Optional[bool]:
+        """
+        Check if `tier` exists according to the index. Returns `None` if it isn't in the index.
+        """
+        row = self.connection.execute(
+            "SELECT exists_ FROM tiers WHERE name = ?", (tier.name,)
+        ).fetchone()
+        return bool(row[0]) if row else None
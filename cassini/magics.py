@@ -1,6 +1,9 @@
+import hashlib
+import json
+from typing import Any, Dict, Optional
 from warnings import warn
 
-from IPython.core.magic import register_cell_magic
+from IPython.core.magic import register_cell_magic, register_line_magic
 from IPython.core.interactiveshell import InteractiveShell
 from IPython.display import Markdown, publish_display_data  # type: ignore[attr-defined]
 
@@ -8,6 +11,14 @@ from .environment import env
 from .core import NotebookTierBase
 
 
+def _bundle_key(data: Dict[str, Any]) -> str:
+    """
+    Digest of a mime bundle, so duplicate outputs can be spotted without comparing them.
+    """
+    encoded = json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
 def hlt(line: str, cell: str):
     """
     Highlight IPython cell magic. Captures the output of a cell and stores it in the [cassini.environment.env.o][cassini.environment._Env.o] highlights file.
@@ -15,6 +26,9 @@ def hlt(line: str, cell: str):
     If the cell returns a string, this is used as a caption for the output.
 
     A title argument must be provided.
+
+    The highlight is written by a background thread, so the cell doesn't wait for it. Use `%hlt_flush` to wait for it
+    to be written. Pending highlights are also written when the kernel shuts down.
     """
     if env.is_shared(env):
         warn(
@@ -33,10 +47,13 @@ def hlt(line: str, cell: str):
     assert env.o
 
     outputs = []
+    seen = set()
 
     def capture_display(msg):
-        if msg["content"]["data"] in outputs:  # display only once
+        key = _bundle_key(msg["content"]["data"])
+        if key in seen:  # display only once
             return None
+        seen.add(key)
         outputs.append(msg["content"])
         return msg
 
@@ -71,10 +88,19 @@ def hlt(line: str, cell: str):
 
     all_out = outputs
 
-    env.o.add_highlight(line, all_out)
+    env.o.add_highlight(line, all_out, background=True)
 
     return None
 
 
+def hlt_flush(line: str) -> None:
+    """
+    Wait for highlights added by `%%hlt` to be written. Takes an optional timeout in secs e.g. `%hlt_flush 10`.
+    """
+    timeout: Optional[float] = float(line) if line.strip() else None
+    env.flush_highlights(timeout)
+
+
 def register():
     register_cell_magic(hlt)
+    register_line_magic(hlt_flush)
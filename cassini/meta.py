@@ -123,8 +123,80 @@ Which includes a `from_json` field:
 
 This is done using the [Meta.build_meta_model][cassini.meta.Meta.build_meta_model] function, which looks through an objects attributes 
 (including those it inherited), finds all the `MetaAttr`, and then uses them to build fields of the model.
+
+Each assignment to a `Meta` object reads the file, validates it, updates it and writes it back. If you want to make
+many changes at once, use a transaction, which reads once on entry and writes once on exit:
+
+```pycon
+>>> with meta.transaction():
+...     meta['a'] = 1
+...     meta['b'] = 2
+...     del meta['key']
+```
+
+If an exception is raised inside the `with` block, nothing is written and the changes are discarded.
+
+`Meta` objects cache the contents of their file. How they decide the cache is stale is set by their `freshness` policy:
+
+- `'ttl'` (default) re-reads the file if the cache is older than `Meta.timeout` seconds.
+- `'stat'` calls `os.stat` on each access, and only re-reads the file if its mtime, size or inode changed.
+- `'trust'` never re-reads the file, until `meta.invalidate()` or `meta.fetch()` is called.
+
+```pycon
+>>> meta = Meta('data.json', freshness='stat')
+```
+
+Each re-read of a file normally validates its whole contents. With the `'cached'` validation policy, validated contents
+are shared between all `Meta` objects for the same file and model, keyed on the file's stat signature and content hash,
+so unchanged files are neither re-read nor re-validated:
+
+```pycon
+>>> meta = Meta('data.json', validation='cached')
+```
+
+Writing to disk can be slow e.g. on a network drive. With `write_behind=True`, changes update the cache immediately and
+are written to disk by a background thread. Repeated writes to the same file are coalesced. `Meta.flush()` waits
+for pending writes to finish, and raises any errors they caused. Pending writes are also flushed when the interpreter
+exits.
+
+```pycon
+>>> meta = Meta('data.json', write_behind=True)
+>>> meta['key'] = 'value'  # returns immediately
+>>> Meta.flush()  # make sure it's on disk.
+```
+
+Several processes (e.g. notebook kernels) can safely update the same meta at once. Writes hold an exclusive lock on the
+meta (see [MetaBackend.lock][cassini.backends.MetaBackend.lock]), and replace the file atomically, so readers never see
+a half-written file. If the file has changed since it was read, i.e. someone else has written to it (another kernel,
+the JupyterLab extension, or a text editor), the changes made in this transaction are merged key by key into the newer
+contents, rather than overwriting them. Changes are spotted by the file's stat signature, then confirmed by comparing
+its contents with what was last read or written, so nothing is added to the file to track them. The `"__blobs__"` key
+that references to blobs (see below) are stored under is reserved, as is `"__version__"`, which earlier versions of
+cassini stored a version number under, so setting them raises a `KeyError`.
+
+Large values can be moved out of the meta file into blob files, in a folder next to it (see
+[Meta.blob_folder][cassini.meta.Meta.blob_folder]), leaving a reference in the meta file. Values of `MetaAttr`s created
+with `external=True` are always moved. Setting `Meta.blob_threshold` also moves any value whose json is bigger than that
+many bytes. This is off by default, as anything else reading the meta file (e.g. the JupyterLab extension, or a `git
+diff`) only sees the reference. Blobs are only read when their key is accessed, so reading e.g. a tier's description
+stays quick however much else is stored in its meta:
+
+```pycon
+>>> Meta.blob_threshold = 64 * 1024
+>>> meta['fit'] = big_list  # stored in data.blobs/<digest>.json
+>>> meta.fetch()
+>>> meta['description']  # doesn't read the blob
+>>> meta['fit']  # reads the blob
+```
 """
 
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import shutil
+import threading
 import time
 from pathlib import Path
 from typing import (
@@ -132,9 +204,16 @@ from typing import (
     Callable,
     ClassVar,
     Dict,
+    FrozenSet,
     Generic,
+    Hashable,
+    Iterator,
     KeysView,
     List,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    Set,
     overload,
     TypeVar,
     Union,
@@ -152,16 +231,34 @@ from pydantic import (
 )
 from pydantic.fields import FieldInfo
 
+from .environment import env, CacheCounter
+from .config import config
+from .backends import MetaBackend, FileMetaBackend
+from .utils import BackgroundWriter, atomic_write
+
 
 JSONType = TypeVar("JSONType")
 AttrType = TypeVar("AttrType")
 
+FreshnessPolicy = Literal["ttl", "stat", "trust"]
+ValidationPolicy = Literal["always", "cached"]
+
 
 class MetaCache(BaseModel):
     """
     Base Model for Meta caches. Restricts fields to be json serialisable and performs validation on assignment.
+
+    Attributes
+    ----------
+    meta_freshness : Optional[FreshnessPolicy]
+        (class attribute) If set, the freshness policy `Meta` objects using this model default to.
+    meta_validation : Optional[ValidationPolicy]
+        (class attribute) If set, the validation policy `Meta` objects using this model default to.
     """
 
+    meta_freshness: ClassVar[Optional[FreshnessPolicy]] = None
+    meta_validation: ClassVar[Optional[ValidationPolicy]] = None
+
     __pydantic_extra__: Dict[str, JsonValue] = Field(init=False)
     model_config = ConfigDict(
         extra="allow",
@@ -191,6 +288,43 @@ class MetaValidationError(ValueError):
         self.validation_error = validation_error
 
 
+class _Stored(NamedTuple):
+    """
+    Validated contents of a meta file, along with the digest of the json they were read from, and references to blobs.
+    """
+
+    cache: MetaCache
+    digest: bytes
+    blobs: Dict[str, str]
+
+
+def _digest(data: bytes) -> bytes:
+    """
+    Digest of the serialised contents of a meta file, used to tell if it's been changed by someone else.
+    """
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _to_json(value: Any) -> bytes:
+    """
+    Serialise `value`, formatted the same way as pydantic does.
+    """
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=None)
+def _external_fields(model: Type[MetaCache]) -> FrozenSet[str]:
+    """
+    Names of the fields of `model` that are always stored in blobs, see `MetaAttr`'s `external` parameter.
+    """
+    return frozenset(
+        name
+        for name, field in model.model_fields.items()
+        if isinstance(field.json_schema_extra, dict)
+        and field.json_schema_extra.get("x-cas-external")
+    )
+
+
 class Meta:
     """
     Like a dictionary, except linked to a json file on disk. Caches the value of the json in itself.
@@ -205,6 +339,17 @@ class Meta:
            File Meta object stores information about.
     model : MetaCache
         Pydantic model representation of this meta object. Used to perform validation, and serial/deserialisation.
+    freshness : Optional[FreshnessPolicy]
+        How to decide if the cached contents are stale. One of `'ttl'`, `'stat'` or `'trust'`. Defaults to
+        `model.meta_freshness` if set, otherwise `Meta.default_freshness`.
+    validation : Optional[ValidationPolicy]
+        Either `'always'`, to validate the file every time it's read, or `'cached'`, to share validated contents between
+        `Meta` objects and only validate files whose contents changed. Defaults to `model.meta_validation` if set,
+        otherwise `Meta.default_validation`.
+    backend : Optional[MetaBackend]
+        Where the contents are stored. Defaults to `Meta.default_backend`, which stores them in `file`.
+    write_behind : Optional[bool]
+        If `True`, writes are done in a background thread. Defaults to `Meta.default_write_behind`.
 
     Attributes
     ----------
@@ -212,13 +357,74 @@ class Meta:
         Path to the meta file.
     model : MetaCache
         Pydantic model representation of this meta object. Used to perform validation, and serial/deserialisation.
+    timeout : float
+        (class attribute) Maximum age of the cache in secs, used by the `'ttl'` freshness policy.
+    default_freshness : FreshnessPolicy
+        (class attribute) Freshness policy used if not set by the model or constructor.
+    default_validation : ValidationPolicy
+        (class attribute) Validation policy used if not set by the model or constructor.
+    default_backend : MetaBackend
+        (class attribute) Backend used if not set by the constructor.
+    default_write_behind : bool
+        (class attribute) Whether to write in the background, if not set by the constructor.
+    blob_threshold : Optional[int]
+        (class attribute) Values whose json is bigger than this many bytes are stored in blobs. `None` (default)
+        disables this, so only values of `MetaAttr`s created with `external=True` are.
+    VERSION_KEY : str
+        (class attribute) Key earlier versions of cassini stored a version number under in the json. It's reserved, and
+        removed from files when they're next written.
+    BLOBS_KEY : str
+        (class attribute) Key the references to blobs are stored under in the json.
+
+    Notes
+    -----
+    Keys of the meta are accessed as attributes, so the policies given to the constructor are kept in private
+    attributes, `_freshness`, `_validation`, `_backend` and `_write_behind`, so they can't be confused with keys of the
+    same name.
     """
 
-    timeout: ClassVar[int] = 1
-    my_attrs: ClassVar[List[str]] = ["model", "_cache", "_cache_born", "file"]
+    timeout: ClassVar[float] = 1
+    default_freshness: ClassVar[FreshnessPolicy] = "ttl"
+    default_validation: ClassVar[ValidationPolicy] = "always"
+    default_backend: ClassVar[MetaBackend] = FileMetaBackend()
+    default_write_behind: ClassVar[bool] = False
+    blob_threshold: ClassVar[Optional[int]] = None
+    VERSION_KEY: ClassVar[str] = "__version__"
+    BLOBS_KEY: ClassVar[str] = "__blobs__"
+
+    _writer: ClassVar[BackgroundWriter] = BackgroundWriter("meta")
+
+    _validated: ClassVar[
+        MutableMapping[Tuple[Path, Type[MetaCache]], Tuple[Hashable, bytes, _Stored]]
+    ] = env.create_cache("meta.validated", "lru", config.META_CACHE_SIZE)
+    _counter: ClassVar[CacheCounter] = env.create_counter("meta")
+    my_attrs: ClassVar[List[str]] = [
+        "model",
+        "_cache",
+        "_cache_born",
+        "_signature",
+        "file",
+        "_freshness",
+        "_validation",
+        "_backend",
+        "_write_behind",
+        "_transaction_depth",
+        "_digest",
+        "_changes",
+        "_unsaved",
+        "_unsaved_lock",
+        "_blobs",
+        "_loaded",
+    ]
 
     def __init__(
-        self, file: Union[str, Path], model: Union[Type[MetaCache], None] = None
+        self,
+        file: Union[str, Path],
+        model: Union[Type[MetaCache], None] = None,
+        freshness: Optional[FreshnessPolicy] = None,
+        validation: Optional[ValidationPolicy] = None,
+        backend: Optional[MetaBackend] = None,
+        write_behind: Optional[bool] = None,
     ):
         if isinstance(file, str):
             file = Path(file)
@@ -226,9 +432,29 @@ class Meta:
         if model is None:
             model = MetaCache
 
+        if freshness is None:
+            freshness = model.meta_freshness or self.default_freshness
+
+        if validation is None:
+            validation = model.meta_validation or self.default_validation
+
         self._cache_born: float = 0.0
+        self._signature: Optional[Hashable] = None
+        self._transaction_depth: int = 0
+        self._digest: Optional[bytes] = None
+        self._changes: Dict[str, bool] = {}
+        self._unsaved: Dict[str, bool] = {}
+        self._unsaved_lock = threading.Lock()
+        self._blobs: Dict[str, str] = {}
+        self._loaded: Set[str] = set()
         self.file: Path = file
         self.model: Type[MetaCache] = model
+        self._freshness: FreshnessPolicy = freshness
+        self._validation: ValidationPolicy = validation
+        self._backend: MetaBackend = backend if backend else self.default_backend
+        self._write_behind: bool = (
+            self.default_write_behind if write_behind is None else write_behind
+        )
 
         self._cache: MetaCache = self.model()
 
@@ -239,6 +465,13 @@ class Meta:
         """
         return time.time() - self._cache_born
 
+    @property
+    def blob_folder(self) -> Path:
+        """
+        Folder values stored in blobs are kept in, `file.parent / (file.stem + '.blobs')`.
+        """
+        return self.file.parent / f"{self.file.stem}.blobs"
+
     def fetch(self) -> MetaCache:
         """
         Fetches values from the meta file and updates them into `self._cache`.
@@ -247,38 +480,453 @@ class Meta:
         -----
         This doesn't *overwrite* `self._cache` with meta contents, but updates it. Meaning new stuff to file won't be
         overwritten, it'll just be loaded.
+
+        If there's a pending background write, the cache is already newer than what's stored, so it's not re-read.
+
+        Values stored in blobs aren't loaded until they're accessed.
         """
-        if self.file.exists():
-            try:
-                self._cache = self.model.model_validate_json(
-                    self.file.read_text(encoding="utf-8"), strict=False
-                )
-            except ValidationError as e:
-                raise MetaValidationError(validation_error=e, file=self.file)
+        if self._write_behind and self._writer.is_pending(self._write_key):
+            return self._cache
+
+        # get signature before reading, so if the file changes in between we'll just re-read it next time.
+        signature = self._backend.signature(self.file)
 
+        stored = None
+
+        if signature is not None:
+            if self._validation == "cached":
+                stored = self._fetch_cached(signature)
+            else:
+                data = self._backend.read(self.file)
+                stored = None if data is None else self._validate_json(data)
+
+        if stored is not None:
+            self._cache, self._digest = stored.cache, stored.digest
+            self._blobs, self._loaded = dict(stored.blobs), set()
             self._cache_born = time.time()
+        elif signature is None:
+            self._digest = None
+
+        self._signature = signature
 
         return self._cache
 
+    def _validate_json(self, data: bytes, digest: Optional[bytes] = None) -> _Stored:
+        """
+        Validate the json `data`, returning the validated contents, along with its digest and blob references.
+        """
+        if digest is None:
+            digest = _digest(data)
+
+        try:
+            cache = self.model.model_validate_json(data, strict=False)
+        except ValidationError as e:
+            raise MetaValidationError(validation_error=e, file=self.file)
+
+        extra = cache.__pydantic_extra__
+
+        if not extra:
+            return _Stored(cache, digest, {})
+
+        extra.pop(self.VERSION_KEY, None)  # written by earlier versions.
+        blobs = extra.pop(self.BLOBS_KEY, None)
+
+        refs = {}
+
+        if isinstance(blobs, dict):
+            refs = {
+                key: digest for key, digest in blobs.items() if isinstance(digest, str)
+            }
+
+        return _Stored(cache, digest, refs)
+
+    def _fetch_cached(self, signature: Hashable) -> Optional[_Stored]:
+        """
+        Get the contents of the file from `Meta._validated`, only reading or validating if it's changed.
+        """
+        key = (self.file, self.model)
+        entry = self._validated.get(key)
+
+        if entry and entry[0] == signature:
+            return entry[2]._replace(cache=entry[2].cache.model_copy(deep=True))
+
+        data = self._backend.read(self.file)
+
+        if data is None:
+            return None
+
+        digest = _digest(data)
+
+        if entry and entry[1] == digest:
+            stored = entry[2]
+        else:
+            stored = self._validate_json(data, digest)
+
+        self._validated[key] = (signature, digest, stored)
+        # deep copies, so changes to mutable values (e.g. appending to a list) can't reach the shared entry.
+        return stored._replace(cache=stored.cache.model_copy(deep=True))
+
+    def _load_blob(self, key: str) -> None:
+        """
+        Load the value of `key` into the cache, if it's stored in a blob, and hasn't been loaded already.
+        """
+        digest = self._blobs.get(key)
+
+        if digest is None or key in self._loaded:
+            return
+
+        try:
+            data = (self.blob_folder / f"{digest}.json").read_bytes()
+        except FileNotFoundError:
+            if self._transaction_depth:
+                raise
+            # it's probably been replaced since we fetched, so try again.
+            self.fetch()
+            return self._load_blob(key) if self._blobs.get(key) != digest else None
+
+        partial = self._validate_json(
+            b"{" + json.dumps(key).encode("utf-8") + b":" + data + b"}"
+        ).cache
+        value = getattr(partial, key)
+
+        if key in self.model.model_fields:
+            self._cache.__dict__[key] = value
+        elif self._cache.__pydantic_extra__ is not None:
+            self._cache.__pydantic_extra__[key] = value
+
+        self._loaded.add(key)
+
+    def is_stale(self) -> bool:
+        """
+        Check if the cache needs re-fetching, according to `self._freshness`.
+        """
+        if not self._cache_born:
+            return True
+
+        if self._freshness == "stat":
+            return self._backend.signature(self.file) != self._signature
+        elif self._freshness == "ttl":
+            return self.age >= self.timeout
+        else:
+            return False
+
     def refresh(self) -> None:
         """
-        Check age of cache, if stale then re-fetch.
+        Check if cache is stale, if so then re-fetch.
+
+        Does nothing during a transaction, so uncommitted changes aren't overwritten.
         """
-        if self.age >= self.timeout:
+        if self._transaction_depth:
+            return
+
+        if self.is_stale():
+            self._counter.miss()
             self.fetch()
+        else:
+            self._counter.hit()
+
+    def exists(self) -> bool:
+        """
+        Check if this meta has been stored yet.
+        """
+        return self._backend.exists(self.file)
+
+    def delete(self) -> None:
+        """
+        Delete the stored meta, along with its blobs.
+        """
+        self._backend.delete(self.file)
+        shutil.rmtree(self.blob_folder, ignore_errors=True)
+
+    def invalidate(self) -> None:
+        """
+        Mark the cache as stale, so the file is re-read next time it's accessed, whatever `self._freshness` is.
+        """
+        self._cache_born = 0.0
+
+    @property
+    def _write_key(self) -> Tuple[int, Path]:
+        return id(self._backend), self.file
 
     def write(self) -> None:
         """
         Overwrite contents of cache into file.
+
+        If the stored contents have changed since they were fetched, the changes made since then are merged into the
+        newer contents instead.
+
+        If `self._write_behind`, this is queued to happen in the background, see `Meta.flush`.
         """
-        jsons = self._cache.model_dump_json(
+        body, blobs = self._dump(self._cache)
+        cache = (
+            self._cache.model_copy(deep=True)
+            if self._validation == "cached"
+            else self._cache
+        )
+        changes, self._changes = self._changes, {}
+
+        if self._write_behind:
+            with self._unsaved_lock:
+                self._unsaved.update(changes)
+            self._writer.submit(
+                self._write_key, lambda: self._write_unsaved(body, blobs, cache)
+            )
+        else:
+            merged = self._commit(body, blobs, cache, changes)
+            if merged is not None:
+                self._cache, self._blobs = merged.cache, merged.blobs
+                self._loaded = set()
+
+    def _write_unsaved(
+        self, body: bytes, blobs: Dict[str, bytes], cache: MetaCache
+    ) -> None:
+        """
+        Background write job, writes all the changes made since the last one.
+        """
+        # held until they're written, so changes can't be added between taking and merging them.
+        with self._unsaved_lock, self._backend.lock(self.file):
+            changes, self._unsaved = self._unsaved, {}
+            merged = self._commit(body, blobs, cache, changes)
+
+        if merged is not None:
+            self.invalidate()  # the cache doesn't have the changes we merged in.
+
+    def _dump(self, cache: MetaCache) -> Tuple[bytes, Dict[str, bytes]]:
+        """
+        Serialise `cache`, moving values that are too big, or whose field is marked `external`, into blobs.
+
+        Updates `self._blobs` to reference the blobs the serialised contents use.
+
+        Returns
+        -------
+        body : bytes
+            The serialised contents.
+        blobs : Dict[str, bytes]
+            The serialised values moved into blobs, keyed by their digest.
+        """
+        body = cache.model_dump_json(
             exclude_defaults=True, exclude={"__pydantic_extra__"}
+        ).encode("utf-8")
+        external = _external_fields(self.model)
+        threshold = self.blob_threshold
+
+        small = threshold is None or len(body) <= threshold
+
+        if small and not self._blobs and not external:
+            return body, {}
+
+        # values that weren't loaded are left where they are.
+        refs = {
+            key: digest
+            for key, digest in self._blobs.items()
+            if key not in self._loaded
+        }
+        contents = cache.model_dump(
+            mode="json", exclude={"__pydantic_extra__"}, exclude_defaults=True
         )
-        with self.file.open("w", encoding="utf-8") as f:
-            f.write(jsons)
+        blobs = {}
+
+        for key, value in list(contents.items()):
+            if key in refs:
+                del contents[key]
+                continue
+
+            if key not in external and threshold is None:
+                continue
+
+            encoded = _to_json(value)
+
+            if key in external or len(encoded) > cast(int, threshold):
+                digest = hashlib.blake2b(encoded, digest_size=16).hexdigest()
+                refs[key] = digest
+                blobs[digest] = encoded
+                del contents[key]
+
+        self._loaded = set(
+            key for key in refs if key in self._loaded or refs[key] in blobs
+        )
+        self._blobs = refs
+
+        if refs:
+            contents[self.BLOBS_KEY] = refs
+
+        return _to_json(contents), blobs
+
+    def _commit(
+        self,
+        body: bytes,
+        blobs: Dict[str, bytes],
+        cache: MetaCache,
+        changes: Dict[str, bool],
+    ) -> Optional[_Stored]:
+        """
+        Write `body`, the serialised form of `cache`, and `blobs`, to the backend.
+
+        If someone else has changed the stored contents since they were last read or written, `changes` (key -> `True`
+        if set, `False` if deleted) are merged into them instead, and the merged contents are returned.
+        """
+        merged = None
+
+        with self._backend.lock(self.file):
+            # even without changes, newer contents mustn't be overwritten with stale ones.
+            if self._backend.signature(self.file) != self._signature:
+                data = self._backend.read(self.file)
+
+                # the signature alone can change without the contents changing e.g. if the file is touched.
+                if data is not None and _digest(data) != self._digest:
+                    theirs = self._validate_json(data)
+                    body, merged = self._merge(body, theirs, changes)
+                    cache = merged.cache
+
+            self._write_blobs(blobs)
+
+            data = body
+            self._signature = self._backend.write(self.file, data)
+            self._digest = _digest(data)
+
+            refs = merged.blobs if merged else self._refs(body)
+            self._clean_blobs(refs)
+
+        if self._validation == "cached" and self._signature:
+            # we've just validated these contents, so no need to do it again when they're read.
+            self._validated[(self.file, self.model)] = (
+                self._signature,
+                self._digest,
+                _Stored(
+                    cache if merged is None else cache.model_copy(deep=True),
+                    self._digest,
+                    refs,
+                ),
+            )
+
+        return merged
+
+    def _refs(self, body: bytes) -> Dict[str, str]:
+        """
+        Get the blob references from the serialised contents `body`.
+        """
+        if self.BLOBS_KEY.encode("utf-8") not in body:
+            return {}
+
+        return json.loads(body).get(self.BLOBS_KEY, {})
+
+    def _merge(
+        self, body: bytes, theirs: _Stored, changes: Dict[str, bool]
+    ) -> Tuple[bytes, _Stored]:
+        """
+        Apply `changes` from our serialised contents, `body`, to newer stored contents, `theirs`.
+        """
+        contents = theirs.cache.model_dump(
+            mode="json", exclude={"__pydantic_extra__"}, exclude_defaults=True
+        )
+        refs = dict(theirs.blobs)
+        ours = json.loads(body)
+        our_refs = ours.pop(self.BLOBS_KEY, {})
+
+        for key, was_set in changes.items():
+            contents.pop(key, None)
+            refs.pop(key, None)
+
+            if was_set and key in ours:
+                contents[key] = ours[key]
+            elif was_set and key in our_refs:
+                refs[key] = our_refs[key]
+
+        if refs:
+            contents[self.BLOBS_KEY] = refs
+
+        body = _to_json(contents)
+
+        return body, self._validate_json(body)
+
+    def _write_blobs(self, blobs: Dict[str, bytes]) -> None:
+        """
+        Write blobs that don't exist yet. Blobs are named after their digest, so existing ones never need rewriting.
+        """
+        if not blobs:
+            return
+
+        self.blob_folder.mkdir(parents=True, exist_ok=True)
+
+        for digest, encoded in blobs.items():
+            path = self.blob_folder / f"{digest}.json"
+            if not path.exists():
+                atomic_write(path, encoded)
+
+    def _clean_blobs(self, refs: Dict[str, str]) -> None:
+        """
+        Remove blobs no longer referenced by `refs`.
+        """
+        if not self.blob_folder.exists():
+            return
+
+        keep = set(f"{digest}.json" for digest in refs.values())
+
+        for entry in os.scandir(self.blob_folder):
+            if entry.name.endswith(".json") and entry.name not in keep:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(entry.path)
+
+    @classmethod
+    def flush(cls, timeout: Optional[float] = None) -> None:
+        """
+        Wait for all pending background writes (from any `Meta` object) to finish.
+
+        Raises the first exception any of them caused.
+
+        Parameters
+        ----------
+        timeout : Optional[float]
+            Maximum time to wait in secs. Raises `TimeoutError` if exceeded. By default waits forever.
+        """
+        cls._writer.flush(timeout)
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[Self]:
+        """
+        Context manager for making several changes with a single read and write of the meta file.
+
+        The meta file is fetched once on entry, all assignments and deletions are then applied to the cache only, and
+        the result is written once on exit. Transactions can be nested, in which case only the outermost writes.
+
+        If an exception is raised (e.g. a `MetaValidationError`), the changes are discarded and nothing is written.
+
+        Example
+        -------
+        ```pycon
+        >>> with meta.transaction():
+        ...     meta['a'] = 1
+        ...     meta['b'] = 2
+        ```
+        """
+        if self._transaction_depth:
+            self._transaction_depth += 1
+            try:
+                yield self
+            finally:
+                self._transaction_depth -= 1
+            return
+
+        self.fetch()
+        snapshot = self._cache.model_copy(), dict(self._blobs), set(self._loaded)
+        self._changes = {}
+        self._transaction_depth = 1
+
+        try:
+            yield self
+        except BaseException:
+            self._cache, self._blobs, self._loaded = snapshot
+            self._changes = {}
+            raise
+        finally:
+            self._transaction_depth = 0
+
+        self.write()
 
     def __getitem__(self, item: str) -> Any:
         self.refresh()
+        if self._blobs:
+            self._load_blob(item)
         try:
             return getattr(self._cache, item)
         except AttributeError as e:
@@ -289,6 +937,8 @@ class Meta:
 
     def __getattr__(self, item: str) -> Any:
         self.refresh()
+        if self._blobs:
+            self._load_blob(item)
         try:
             return getattr(self._cache, item)
         except KeyError:
@@ -297,28 +947,31 @@ class Meta:
     def __setattr__(self, name: str, value: Any) -> None:
         if name in self.my_attrs:
             super().__setattr__(name, value)
+        elif name in (self.VERSION_KEY, self.BLOBS_KEY):
+            raise KeyError(f"{name} is reserved for cassini's own use")
         else:
-            self.fetch()
+            with self.transaction():
+                try:
+                    setattr(self._cache, name, value)
+                except ValidationError as e:
+                    raise MetaValidationError(validation_error=e, file=self.file)
+                self._changes[name] = True
+                if name in self._blobs:
+                    self._loaded.add(name)
 
+    def __delitem__(self, key: str) -> None:
+        with self.transaction():
+            excluded = self._cache.model_dump(
+                exclude={"__pydantic_extra__", key}, exclude_defaults=True
+            )
+            # it might not be possible for this to happen, because all fields have to have defaults.
             try:
-                setattr(self._cache, name, value)
+                self._cache = self.model.model_validate(excluded)
             except ValidationError as e:
                 raise MetaValidationError(validation_error=e, file=self.file)
-
-            self.write()
-
-    def __delitem__(self, key: str) -> None:
-        self.fetch()
-        excluded = self._cache.model_dump(
-            exclude={"__pydantic_extra__", key}, exclude_defaults=True
-        )
-        # it might not be possible for this to happen, because all fields have to have defaults.
-        try:
-            self._cache = self.model.model_validate(excluded)
-        except ValidationError as e:
-            raise MetaValidationError(validation_error=e, file=self.file)
-
-        self.write()
+            self._changes[key] = False
+            self._blobs.pop(key, None)
+            self._loaded.discard(key)
 
     def __repr__(self) -> str:
         self.refresh()
@@ -336,11 +989,15 @@ class Meta:
     def keys(self) -> KeysView[str]:
         """
         like `dict.keys`
+
+        Includes keys stored in blobs, without loading them.
         """
         self.refresh()
-        return self._cache.model_dump(
+        keys = self._cache.model_dump(
             exclude={"__pydantic_extra__"}, exclude_defaults=True
-        ).keys()
+        )
+        keys.update(dict.fromkeys(self._blobs))
+        return keys.keys()
 
     @classmethod
     def build_meta_model(thisCls, wrappedCls):
@@ -390,7 +1047,15 @@ class Meta:
         )
 
     @classmethod
-    def create_meta(cls, path: Union[str, Path], owner: object):
+    def create_meta(
+        cls,
+        path: Union[str, Path],
+        owner: object,
+        freshness: Optional[FreshnessPolicy] = None,
+        validation: Optional[ValidationPolicy] = None,
+        backend: Optional[MetaBackend] = None,
+        write_behind: Optional[bool] = None,
+    ):
         """
         Create meta object, that stores its data at `path` which is owned by `owner`.
 
@@ -406,6 +1071,14 @@ class Meta:
             The object this meta object will belong to. If the owner has `meta_model` attribute, this is passed to the `Meta`.
 
             If not, `build_meta_model` is used to build a model for that object.
+        freshness : Optional[FreshnessPolicy]
+            Freshness policy passed to the created `Meta`.
+        validation : Optional[ValidationPolicy]
+            Validation policy passed to the created `Meta`.
+        backend : Optional[MetaBackend]
+            Backend passed to the created `Meta`.
+        write_behind : Optional[bool]
+            Whether the created `Meta` writes in the background.
 
         Returns
         -------
@@ -417,7 +1090,14 @@ class Meta:
         else:
             model = cls.build_meta_model(owner.__class__)
 
-        return Meta(path, model)
+        return Meta(
+            path,
+            model,
+            freshness=freshness,
+            validation=validation,
+            backend=backend,
+            write_behind=write_behind,
+        )
 
 
 def _null_func(val: Any) -> Any:
@@ -486,6 +1166,9 @@ class MetaAttr(Generic[AttrType, JSONType]):
         Warning
         -------
         `'core'` is reserved for cassini internals, such as `started`.
+    external : bool
+        If `True`, this attribute's value is always stored in a separate blob file, and only loaded when it's accessed,
+        however big it is. Useful for large values that are rarely needed. See `Meta.blob_threshold`.
 
     """
 
@@ -498,6 +1181,7 @@ class MetaAttr(Generic[AttrType, JSONType]):
         name: Union[str, None] = None,
         default: Union[AttrType, None] = None,
         cas_field: Union[None, Literal["core"], Literal["private"]] = None,
+        external: bool = False,
     ):
         self.json_type = json_type
         self.attr_type = attr_type
@@ -509,6 +1193,7 @@ class MetaAttr(Generic[AttrType, JSONType]):
         self.default = default
 
         self.cas_field = cas_field
+        self.external = external
 
     def __set_name__(self, owner: object, name: str) -> None:
         if self.name is None:
@@ -537,15 +1222,20 @@ class MetaAttr(Generic[AttrType, JSONType]):
         """
         Converts this `MetaAttr` into a `Field` to pass to pydantic, for building models.
         """
+        json_schema_extra: Dict[str, JsonValue] = {}
+
         if self.cas_field:
+            json_schema_extra["x-cas-field"] = self.cas_field
+
+        if self.external:
+            json_schema_extra["x-cas-external"] = True
+
+        if json_schema_extra:
             return self.name, (
                 self.json_type,
                 cast(
                     FieldInfo,
-                    Field(
-                        default=self.default,
-                        json_schema_extra={"x-cas-field": self.cas_field},
-                    ),
+                    Field(default=self.default, json_schema_extra=json_schema_extra),
                 ),
             )
         else:
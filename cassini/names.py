@@ -0,0 +1,193 @@
+"""
+In memory index of the names of the tiers that exist in a project, for completing and checking names without touching
+the filesystem.
+
+```python
+project.complete("WP3.1")  # ['WP3.1', 'WP3.1a', 'WP3.1b', 'WP3.10', ...]
+project.exists_name("WP3.1c")  # False
+```
+
+The names are found with one scan of the project the first time they're needed (using `project.index` if it's being
+served, otherwise [Project.walk][cassini.core.Project.walk]). Tiers created or removed in this interpreter keep them up to
+date, but changes made elsewhere aren't seen until `project.names.refresh()` is called.
+
+Completing `project['...` with tab doesn't wait for the scan, which can take a while for big projects. Instead the scan is
+started in a background thread, and the names found so far are offered, with more each time tab is pressed.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, insort
+from typing import Iterator, List, Optional, Set, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .core import Project
+
+
+class NameIndex:
+    """
+    Sorted names of the existing tiers in a project. Usually accessed via `project.names`.
+
+    Names are kept in a sorted list, so the names starting with a prefix are found by bisecting, and in a set, so
+    checking a name is just hashing it.
+
+    Parameters
+    ----------
+    project : Project
+        Project whose tier names are indexed.
+    """
+
+    def __init__(self, project: Project) -> None:
+        self.project = project
+        self._sorted: List[str] = []
+        self._names: Set[str] = set()
+        self._built = False
+        # names found by a background scan, that aren't in `_sorted` yet.
+        self._pending: List[str] = []
+        self._building: Optional[threading.Thread] = None
+        self._lock = threading.RLock()
+
+    def _scan(self) -> Iterator[str]:
+        index = self.project._index
+
+        if index is not None and index.serving:
+            return (entry.name for entry in index if entry.exists)
+
+        return (tier.name for tier in self.project.walk())
+
+    def refresh(self) -> None:
+        """
+        Re-scan the project for the names of the tiers that exist.
+        """
+        names = set(self._scan())
+
+        with self._lock:
+            self._names = names
+            self._sorted = sorted(names)
+            self._pending = []
+            self._built = True
+
+    def _ensure_built(self) -> None:
+        if not self._built:
+            self.refresh()
+
+    def build_in_background(self) -> Optional[threading.Thread]:
+        """
+        Start scanning the project for names in a background thread, unless they've been scanned already, or are
+        being. The names are available to `complete(..., wait=False)` as soon as they're found.
+
+        Returns
+        -------
+        thread : Optional[threading.Thread]
+            The thread doing the scan, or `None` if the names have been scanned already.
+        """
+        with self._lock:
+            if self._building is None and not self._built:
+                self._building = threading.Thread(
+                    target=self._build, name="cassini-names", daemon=True
+                )
+                self._building.start()
+
+            return self._building
+
+    def _build(self) -> None:
+        try:
+            for name in self._scan():
+                with self._lock:
+                    if self._built:  # refreshed in the meantime.
+                        return
+
+                    if name not in self._names:
+                        self._names.add(name)
+                        self._pending.append(name)
+
+            with self._lock:
+                if not self._built:
+                    self._merge_pending()
+                    self._built = True
+        finally:
+            with self._lock:
+                self._building = None
+
+    def _merge_pending(self) -> None:
+        if self._pending:
+            # both runs are sorted, so sorting just merges them.
+            self._sorted = sorted(self._sorted + sorted(self._pending))
+            self._pending = []
+
+    def add(self, name: str) -> None:
+        """
+        Record that the tier called `name` exists. Does nothing if the names haven't been scanned yet.
+        """
+        with self._lock:
+            if name in self._names:
+                return
+
+            if self._built:
+                self._names.add(name)
+                insort(self._sorted, name)
+            elif self._building is not None:
+                self._names.add(name)
+                self._pending.append(name)
+
+    def discard(self, name: str) -> None:
+        """
+        Record that the tier called `name` no longer exists. Does nothing if the names haven't been scanned yet.
+        """
+        with self._lock:
+            if name in self._names:
+                self._names.discard(name)
+
+                if name in self._pending:
+                    self._pending.remove(name)
+                else:
+                    del self._sorted[bisect_left(self._sorted, name)]
+
+    def complete(
+        self, prefix: str, limit: Optional[int] = 20, wait: bool = True
+    ) -> List[str]:
+        """
+        Get the names of existing tiers that start with `prefix`, in alphabetical order.
+
+        Parameters
+        ----------
+        prefix : str
+            Start of the names to find.
+        limit : Optional[int]
+            Maximum number of names to return. `None` for all of them.
+        wait : bool
+            If `False`, and the names haven't been scanned yet, the scan is started in the background (see
+            `build_in_background`), and only the names found so far are searched.
+        """
+        if wait:
+            self._ensure_built()
+        elif not self._built:
+            self.build_in_background()
+
+        with self._lock:
+            self._merge_pending()
+            names = self._sorted
+            found: List[str] = []
+            i = bisect_left(names, prefix)
+
+            while i < len(names) and names[i].startswith(prefix):
+                if limit is not None and len(found) >= limit:
+                    break
+                found.append(names[i])
+                i += 1
+
+            return found
+
+    def __contains__(self, name: str) -> bool:
+        self._ensure_built()
+        return name in self._names
+
+    def __len__(self) -> int:
+        self._ensure_built()
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[str]:
+        self._ensure_built()
+        with self._lock:
+            return iter(list(self._sorted))
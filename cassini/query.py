@@ -0,0 +1,395 @@
+"""
+Querying the meta of many tiers at once.
+
+```python
+query = (
+    project.query(Sample)
+    .where(started__gte=datetime.datetime(2024, 3, 1, tzinfo=datetime.timezone.utc), description__contains="anneal")
+    .order_by("-started")
+    .limit(50)
+    .fields("description", "conclusion")
+)
+
+for row in query:
+    print(row.name, row.values["description"])
+```
+
+Conditions are given as `key__op=value`, where `op` is one of `eq` (the default if `__op` is left off), `ne`, `lt`,
+`lte`, `gt`, `gte`, `contains`, `icontains`, `startswith`, `in` and `isnull`. Values are converted to the type of the
+corresponding `MetaAttr` before comparing, so e.g. `started__gte="2024-03-01T00:00:00Z"` compares as a datetime.
+
+If the project's index is being served (see [cassini.index][cassini.index]), and it stores every key used in the query,
+the query is answered from the index without reading any meta files. Otherwise, the tiers are found using the index
+or [Project.walk][cassini.core.Project.walk], and their meta is read in parallel.
+"""
+
+from __future__ import annotations
+
+import operator
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    TYPE_CHECKING,
+    cast,
+)
+
+from pydantic import TypeAdapter, ValidationError
+
+if TYPE_CHECKING:
+    from .core import Project, TierABC, NotebookTierBase
+
+
+class QueryRow(NamedTuple):
+    """
+    Result of a query, with the values of the keys selected with `Query.fields`.
+    """
+
+    name: str
+    identifiers: Tuple[str, ...]
+    values: Dict[str, Any]
+
+
+def _contains(value: Any, other: Any) -> bool:
+    return other in value
+
+
+def _icontains(value: Any, other: Any) -> bool:
+    return str(other).lower() in str(value).lower()
+
+
+def _startswith(value: Any, other: Any) -> bool:
+    return str(value).startswith(other)
+
+
+def _in(value: Any, other: Any) -> bool:
+    return value in other
+
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "contains": _contains,
+    "icontains": _icontains,
+    "startswith": _startswith,
+    "in": _in,
+}
+"""
+Operators that can be used in `Query.where`, as well as `isnull`.
+"""
+
+
+class _Condition(NamedTuple):
+    key: str
+    op: str
+    value: Any
+
+    def __call__(self, values: Dict[str, Any]) -> bool:
+        value = values.get(self.key)
+
+        if self.op == "isnull":
+            return (value is None) == bool(self.value)
+
+        if value is None:
+            return self.op == "ne" and self.value is not None
+
+        try:
+            return OPERATORS[self.op](value, self.value)
+        except TypeError:
+            return False
+
+
+class Query:
+    """
+    Lazily evaluated query over the meta of all the tiers of one type. Usually created by
+    [Project.query][cassini.core.Project.query].
+
+    Each method returns a new query, so queries can be built up and reused.
+
+    Parameters
+    ----------
+    project : Project
+        Project to query.
+    tier_cls : Type[NotebookTierBase]
+        Type of tier to query.
+    use_index : Optional[bool]
+        Whether to use the project's index to answer the query. By default it's used if it is being served.
+    workers : Optional[int]
+        Number of threads used to read meta, if needed. Default lets `ThreadPoolExecutor` decide.
+
+    Attributes
+    ----------
+    batch_size : int
+        Number of tiers each thread reads the meta of at a time. Only 2 batches per thread are read ahead of the
+        results being used, so a query that's stopped early (e.g. by `limit`) doesn't read the meta of every tier.
+    """
+
+    def __init__(
+        self,
+        project: Project,
+        tier_cls: Type[NotebookTierBase],
+        use_index: Optional[bool] = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        self.project = project
+        self.tier_cls = tier_cls
+        self.use_index = use_index
+        self.workers = workers
+        self.batch_size = 64
+        self._conditions: Tuple[_Condition, ...] = ()
+        self._order: Tuple[Tuple[str, bool], ...] = ()
+        self._limit: Optional[int] = None
+        self._fields: Optional[Tuple[str, ...]] = None
+
+    def _copy(self, **attrs: Any) -> Query:
+        query = object.__new__(Query)
+        query.__dict__.update(self.__dict__, **attrs)
+        return query
+
+    def _coerce(self, key: str, value: Any) -> Any:
+        """
+        Convert `value` to the type of the `MetaAttr` for `key`, if there is one.
+        """
+        if value is None:
+            return value
+
+        field = self.tier_cls.meta_model.model_fields.get(key)
+
+        if field is None:
+            return value
+
+        try:
+            return _adapter(field.annotation).validate_python(value, strict=False)
+        except ValidationError:
+            return value
+
+    def where(self, **conditions: Any) -> Query:
+        """
+        Only include tiers whose meta meets all of `conditions`, given as `key__op=value`, or `key=value` for
+        equality. See [cassini.query][cassini.query] for the available operators.
+
+        `name` can be used as a key to filter on the name of the tier.
+        """
+        parsed = []
+
+        for lookup, value in conditions.items():
+            key, _, op = lookup.rpartition("__")
+
+            if not key or (op not in OPERATORS and op != "isnull"):
+                key, op = lookup, "eq"
+
+            if op == "in":
+                value = [self._coerce(key, v) for v in value]
+            elif op not in ("isnull", "contains", "icontains", "startswith"):
+                value = self._coerce(key, value)
+
+            parsed.append(_Condition(key, op, value))
+
+        return self._copy(_conditions=self._conditions + tuple(parsed))
+
+    def order_by(self, *keys: str) -> Query:
+        """
+        Sort the results by `keys`. Prefix a key with `-` to sort in descending order. Tiers without a value for a key
+        always come last.
+
+        By default, results are in the same order as [Project.walk][cassini.core.Project.walk].
+        """
+        order = tuple(
+            (key[1:], True) if key.startswith("-") else (key, False) for key in keys
+        )
+        return self._copy(_order=order)
+
+    def limit(self, count: Optional[int]) -> Query:
+        """
+        Only return the first `count` results.
+        """
+        return self._copy(_limit=count)
+
+    def fields(self, *keys: str) -> Query:
+        """
+        Select the meta `keys` to return. Once set, iterating over the query yields [QueryRow][cassini.query.QueryRow]s
+        with these values, instead of tiers.
+        """
+        return self._copy(_fields=keys)
+
+    @property
+    def keys(self) -> Tuple[str, ...]:
+        """
+        All the meta keys needed to answer this query.
+        """
+        keys = [condition.key for condition in self._conditions]
+        keys += [key for key, _ in self._order]
+        keys += self._fields or ()
+        return tuple(dict.fromkeys(key for key in keys if key != "name"))
+
+    def _index_used(self) -> bool:
+        if self.use_index is None:
+            index = self.project._index
+            return index is not None and index.serving
+        return self.use_index
+
+    @property
+    def answered_by_index(self) -> bool:
+        """
+        Whether this query will be answered from the project's index alone, without reading meta.
+        """
+        return self._index_used() and set(self.keys) <= set(
+            self.project.index.meta_fields
+        )
+
+    def _indexed(self) -> Iterator[QueryRow]:
+        keys = self.keys
+
+        for entry in self.project.index.entries(tier_type=self.tier_cls.__name__):
+            if entry.exists:
+                yield QueryRow(
+                    entry.name,
+                    entry.identifiers,
+                    {key: self._coerce(key, entry.meta.get(key)) for key in keys},
+                )
+
+    def _tiers(self) -> Iterator[NotebookTierBase]:
+        if self._index_used():
+            index = self.project.index
+
+            for entry in index.entries(tier_type=self.tier_cls.__name__):
+                if entry.exists:
+                    yield cast("NotebookTierBase", index.tier(entry))
+        else:
+            for tier in self.project.walk(workers=self.workers, prune=[self.tier_cls]):
+                if isinstance(tier, self.tier_cls):
+                    yield tier
+
+    def _scanned(self) -> Iterator[QueryRow]:
+        keys = self.keys
+
+        def read(tier: NotebookTierBase) -> QueryRow:
+            meta = tier.meta
+            if keys:
+                meta.fetch()
+            return QueryRow(
+                tier.name, tier.identifiers, {key: meta.get(key) for key in keys}
+            )
+
+        def read_batch(tiers: List[NotebookTierBase]) -> List[QueryRow]:
+            return [read(tier) for tier in tiers]
+
+        tiers = self._tiers()
+        # tiers are read in batches, as a future per tier costs about as much as reading its meta.
+        batches: Iterator[List[NotebookTierBase]] = iter(
+            lambda: list(islice(tiers, self.batch_size)), []
+        )
+
+        # same as ThreadPoolExecutor's default.
+        workers = self.workers or min(32, (os.cpu_count() or 1) + 4)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending: Deque[Future[List[QueryRow]]] = deque(
+                pool.submit(read_batch, batch) for batch in islice(batches, workers * 2)
+            )
+
+            try:
+                while pending:
+                    rows = pending.popleft().result()
+
+                    for batch in islice(batches, 1):
+                        pending.append(pool.submit(read_batch, batch))
+
+                    yield from rows
+            finally:
+                # stopped early, so don't read batches that haven't started.
+                for future in pending:
+                    future.cancel()
+
+    def _results(self) -> Iterator[QueryRow]:
+        rows = self._indexed() if self.answered_by_index else self._scanned()
+
+        conditions = self._conditions
+
+        def matches(row: QueryRow) -> bool:
+            values = {"name": row.name, **row.values}
+            return all(condition(values) for condition in conditions)
+
+        if conditions:
+            rows = filter(matches, rows)
+
+        if self._order:
+            ordered = list(rows)
+
+            for key, descending in reversed(self._order):
+                ordered.sort(
+                    key=lambda row: _sort_key(row, key, descending), reverse=descending
+                )
+
+            rows = iter(ordered)
+
+        return islice(rows, self._limit)
+
+    def rows(self) -> Iterator[QueryRow]:
+        """
+        Iterate over the results as [QueryRow][cassini.query.QueryRow]s, with the values of the keys selected by
+        `fields`.
+        """
+        fields = self._fields or ()
+
+        for row in self._results():
+            yield row._replace(values={key: row.values.get(key) for key in fields})
+
+    def tiers(self) -> Iterator[TierABC]:
+        """
+        Iterate over the tiers matching the query.
+        """
+        for row in self._results():
+            yield self.project.get_tier(row.identifiers)
+
+    def __iter__(self) -> Iterator[Union[QueryRow, TierABC]]:
+        if self._fields is not None:
+            return self.rows()
+        return self.tiers()
+
+    def first(self) -> Optional[Union[QueryRow, TierABC]]:
+        """
+        Get the first result, or `None` if there aren't any.
+        """
+        return next(iter(self.limit(1)), None)
+
+    def count(self) -> int:
+        """
+        Count the results.
+        """
+        return sum(1 for _ in self._results())
+
+    def __repr__(self) -> str:
+        return f"<Query {self.tier_cls.__name__} ({len(self._conditions)} conditions)>"
+
+
+def _sort_key(row: QueryRow, key: str, descending: bool) -> Tuple[bool, Any]:
+    value = row.name if key == "name" else row.values.get(key)
+    # missing values last, whichever way we're sorting.
+    return (value is not None, value) if descending else (value is None, value)
+
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def _adapter(annotation: Any) -> TypeAdapter:
+    adapter = _adapters.get(annotation)
+    if adapter is None:
+        adapter = _adapters[annotation] = TypeAdapter(annotation)
+    return adapter
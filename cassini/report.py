@@ -0,0 +1,388 @@
+"""
+Static report of the highlights of every tier in a project (or below some tier), e.g. for group meetings:
+
+```python
+project.highlights_report(project["WP1"], "reports/WP1")  # writes reports/WP1/index.html
+```
+
+The report is a folder holding the document, `index.html` or `index.md`, with the images in the highlights written as
+separate files, named after their contents:
+
+```
+reports/WP1/
+    index.html
+    manifest.json
+    tiers/
+        WP1.1.html
+        WP1.1a.html
+    images/
+        3f2a...png
+```
+
+Each tier's highlights are rendered to a fragment in `tiers/`, and `manifest.json` records the stat signature of the
+highlights each fragment was rendered from. Rebuilding the report only re-renders the tiers whose highlights have
+changed since, the rest are just stitched back into the document.
+
+Highlights are read one at a time, so the outputs of the whole project are never held in memory at once.
+
+In `'html'` reports, markdown is rendered with the optional [mistune](https://github.com/lepture/mistune) package,
+installed with `pip install cassini[report]`. Without it, markdown is shown as plain text, in a `<pre>` block. Reports
+are re-rendered in full once mistune is installed or removed.
+"""
+
+from __future__ import annotations
+
+import base64
+import functools
+import hashlib
+import html
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+from .utils import atomic_write
+
+if TYPE_CHECKING:
+    from .core import NotebookTierBase, Project, TierABC
+
+ReportFormat = Literal["html", "markdown"]
+
+IMAGE_MIMETYPES: Dict[str, str] = {
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/svg+xml": ".svg",
+}
+"""
+Mimetypes of highlight outputs that are written to image files, and the suffix given to each.
+"""
+
+MIMETYPE_ORDER: Tuple[str, ...] = (
+    *IMAGE_MIMETYPES,
+    "text/html",
+    "text/markdown",
+    "text/plain",
+)
+"""
+Mimetypes that can be rendered, most preferred first. Only the first an output has is rendered.
+"""
+
+
+def _text(value: Any) -> str:
+    # nbformat allows multiline strings to be split into a list of lines.
+    return "".join(value) if isinstance(value, list) else str(value)
+
+
+@functools.lru_cache(maxsize=None)
+def have_mistune() -> bool:
+    """
+    Check if mistune is installed, which is needed to render markdown in html reports.
+    """
+    try:
+        import mistune  # type: ignore[import-not-found] # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _markdown_to_html(text: str) -> str:
+    if not have_mistune():
+        return f'<pre class="markdown">{html.escape(text)}</pre>'
+
+    import mistune
+
+    # with its default html renderer, mistune gives a str.
+    return str(mistune.markdown(text))
+
+
+class HighlightsReport:
+    """
+    Static report of the highlights of a project's tiers, kept in `out_dir`. Usually built with
+    [Project.highlights_report][cassini.core.Project.highlights_report].
+
+    Parameters
+    ----------
+    project : Project
+        Project whose highlights are reported.
+    out_dir : Path
+        Folder the report is written to.
+    format : ReportFormat
+        `'html'` or `'markdown'`. In `'html'` reports, markdown is rendered with `mistune`, if it's installed,
+        otherwise it's shown as plain text.
+
+    Attributes
+    ----------
+    SUFFIXES : Dict[ReportFormat, str]
+        (class attribute) Suffix of the document and fragments of each format.
+    version : int
+        (class attribute) Version of the rendering. Reports rendered by a different version are re-rendered in full.
+    manifest_name : str
+        (class attribute) Name of the manifest within `out_dir`.
+    """
+
+    SUFFIXES: ClassVar[Dict[ReportFormat, str]] = {
+        "html": ".html",
+        "markdown": ".md",
+    }
+    version: ClassVar[int] = 1
+    manifest_name: ClassVar[str] = "manifest.json"
+
+    def __init__(
+        self, project: Project, out_dir: Path, format: ReportFormat = "html"
+    ) -> None:
+        if format not in self.SUFFIXES:
+            raise ValueError(f"Unknown report format {format}")
+
+        self.project = project
+        self.out_dir = Path(out_dir)
+        self.format = format
+
+    @property
+    def document(self) -> Path:
+        """
+        Path to the report's document.
+        """
+        return self.out_dir / f"index{self.SUFFIXES[self.format]}"
+
+    @property
+    def manifest_file(self) -> Path:
+        return self.out_dir / self.manifest_name
+
+    def _fragment(self, name: str) -> Path:
+        return self.out_dir / "tiers" / f"{name}{self.SUFFIXES[self.format]}"
+
+    def _read_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            manifest = json.loads(self.manifest_file.read_bytes())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+        if (
+            manifest.get("format"),
+            manifest.get("version"),
+            manifest.get("mistune"),
+        ) != (self.format, self.version, have_mistune()):
+            return {}
+
+        return manifest.get("tiers", {})
+
+    def _write_image(self, data: bytes, suffix: str) -> str:
+        """
+        Write `data` to an image file named after its contents, if it doesn't already exist, returning its name.
+        """
+        name = hashlib.sha256(data).hexdigest() + suffix
+        path = self.out_dir / "images" / name
+
+        if not path.exists():
+            atomic_write(path, data)
+
+        return name
+
+    def _heading(self, level: int, text: str) -> str:
+        if self.format == "html":
+            return f"<h{level}>{html.escape(text)}</h{level}>\n"
+        return f"{'#' * level} {text}\n\n"
+
+    def _render_output(self, output: Any, images: List[str]) -> str:
+        bundle = output.get("data") if isinstance(output, dict) else None
+
+        if not isinstance(bundle, dict):
+            return ""
+
+        for mimetype in MIMETYPE_ORDER:
+            if mimetype in bundle:
+                value = bundle[mimetype]
+                break
+        else:
+            return ""
+
+        if mimetype in IMAGE_MIMETYPES:
+            if mimetype == "image/svg+xml":
+                data = _text(value).encode("utf-8")
+            else:
+                data = base64.b64decode(_text(value))
+
+            name = self._write_image(data, IMAGE_MIMETYPES[mimetype])
+            images.append(name)
+
+            if self.format == "html":
+                return f'<img src="images/{name}">\n'
+            return f"![](images/{name})\n\n"
+
+        text = _text(value)
+
+        if self.format == "html":
+            if mimetype == "text/html":
+                return text + "\n"
+            elif mimetype == "text/markdown":
+                return _markdown_to_html(text) + "\n"
+            return f"<pre>{html.escape(text)}</pre>\n"
+
+        if mimetype == "text/plain":
+            return f"```\n{text}\n```\n\n"
+        return text + "\n\n"
+
+    def render(self, tier: NotebookTierBase) -> Tuple[Optional[str], List[str]]:
+        """
+        Render the highlights of `tier`, writing any images they contain.
+
+        Returns
+        -------
+        fragment : Optional[str]
+            The rendered highlights, `None` if `tier` has none.
+        images : List[str]
+            Names of the image files used by `fragment`.
+        """
+        store = tier.highlights
+        titles = store.titles() if store is not None else []
+
+        if store is None or not titles:
+            return None, []
+
+        parts = [self._heading(2, tier.name)]
+        images: List[str] = []
+
+        for title in titles:
+            try:
+                outputs = store[title]
+            except KeyError:  # removed since the titles were read
+                continue
+
+            parts.append(self._heading(3, title))
+
+            for output in outputs:
+                parts.append(self._render_output(output, images))
+
+        return "".join(parts), list(dict.fromkeys(images))
+
+    def _render_tier(
+        self, tier: NotebookTierBase, signature: List[int]
+    ) -> Dict[str, Any]:
+        fragment, images = self.render(tier)
+
+        if fragment is not None:
+            atomic_write(self._fragment(tier.name), fragment.encode("utf-8"))
+
+        return {"signature": signature, "images": images, "empty": fragment is None}
+
+    def _wrap(self, title: str, body: bytes) -> bytes:
+        if self.format == "html":
+            head = (
+                '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+                f"<title>{html.escape(title)}</title>\n"
+                "<style>img { max-width: 100%; }</style>\n</head>\n<body>\n"
+                f"{self._heading(1, title)}"
+            )
+            return head.encode("utf-8") + body + b"</body>\n</html>\n"
+
+        return self._heading(1, title).encode("utf-8") + body
+
+    def _remove_unused(
+        self, previous: Dict[str, Dict[str, Any]], entries: Dict[str, Dict[str, Any]]
+    ) -> None:
+        for name in previous.keys() - entries.keys():
+            self._fragment(name).unlink(missing_ok=True)
+
+        for name, entry in entries.items():
+            if entry["empty"]:
+                self._fragment(name).unlink(missing_ok=True)
+
+        used = {image for entry in entries.values() for image in entry["images"]}
+
+        try:
+            files = list(os.scandir(self.out_dir / "images"))
+        except FileNotFoundError:
+            return
+
+        for file in files:
+            if file.name not in used and not file.name.startswith("."):
+                Path(file.path).unlink(missing_ok=True)
+
+    def build(
+        self, root: Optional[TierABC] = None, workers: Optional[int] = None
+    ) -> int:
+        """
+        Bring the report up to date with the highlights of `root` and the tiers below it, only re-rendering tiers
+        whose highlights have changed since the report was last built.
+
+        Parameters
+        ----------
+        root : Optional[TierABC]
+            Tier to report on, along with all the tiers below it. Defaults to `project.home`.
+        workers : Optional[int]
+            Number of threads used to walk the project and render tiers. Default lets `ThreadPoolExecutor` decide.
+
+        Returns
+        -------
+        count : int
+            Number of tiers that were (re-)rendered.
+        """
+        from .core import NotebookTierBase
+
+        if root is None:
+            root = self.project.home
+
+        (self.out_dir / "tiers").mkdir(parents=True, exist_ok=True)
+        (self.out_dir / "images").mkdir(exist_ok=True)
+
+        previous = self._read_manifest()
+        entries: Dict[str, Dict[str, Any]] = {}
+        rendering: Dict[str, Future[Dict[str, Any]]] = {}
+        order = []
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for tier in self.project.walk(root, workers=workers):
+                if not isinstance(tier, NotebookTierBase) or tier.highlights is None:
+                    continue
+
+                signature = tier.highlights.signature()
+
+                if signature is None:
+                    continue
+
+                order.append(tier.name)
+                entry = previous.get(tier.name)
+
+                if (
+                    entry is not None
+                    and entry["signature"] == list(signature)
+                    and (entry["empty"] or self._fragment(tier.name).exists())
+                ):
+                    entries[tier.name] = entry
+                else:
+                    rendering[tier.name] = pool.submit(
+                        self._render_tier, tier, list(signature)
+                    )
+
+            for name, future in rendering.items():
+                entries[name] = future.result()
+
+        body = b"".join(
+            self._fragment(name).read_bytes()
+            for name in order
+            if not entries[name]["empty"]
+        )
+        atomic_write(self.document, self._wrap(f"Highlights: {root.name}", body))
+
+        self._remove_unused(previous, entries)
+
+        manifest = {
+            "format": self.format,
+            "version": self.version,
+            "mistune": have_mistune(),
+            "root": root.name,
+            "tiers": {name: entries[name] for name in order},
+        }
+        atomic_write(self.manifest_file, json.dumps(manifest).encode("utf-8"))
+
+        return len(rendering)
@@ -0,0 +1,467 @@
+"""
+Full-text search over the meta and highlights of the tiers in a project.
+
+The text of every string meta value (e.g. `description` and `conclusion`), and the titles and text/markdown outputs of
+each tier's highlights, are split into terms and stored in an inverted index, in an SQLite database at
+`project_folder / config.CASSINI_DIR / 'search.sqlite'`. Searching then only needs to look up the query's terms,
+rather than reading every file:
+
+```python
+project.search_index.update()  # only re-reads tiers whose meta or highlights have changed.
+
+for result in project.search("XRD peak shift", tier_types=[Experiment]):
+    print(result.name, result.score)
+```
+
+Results are ranked with [BM25](https://en.wikipedia.org/wiki/Okapi_BM25). A term ending in `*` matches any term
+starting with it, e.g. `"anneal*"` matches "annealed" and "annealing".
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    TYPE_CHECKING,
+)
+
+from .config import config
+from .highlights import HighlightStore, _blob_ref
+from .index import open_database
+from .utils import stat_signature
+
+if TYPE_CHECKING:
+    from .core import Project, TierABC, NotebookTierBase
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+"""
+Pattern used to find the terms in a piece of text.
+"""
+
+TEXT_MIMETYPES = ("text/plain", "text/markdown")
+"""
+Mimetypes of highlight outputs that are indexed.
+"""
+TEXT_MIMETYPES_SET = frozenset(TEXT_MIMETYPES)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split `text` into lowercase terms.
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _highlights_text(store: Optional[HighlightStore]) -> Iterator[str]:
+    """
+    Get the titles and text outputs of the highlights in `store`.
+
+    Only the payloads of highlights with text outputs are read, and only text outputs are read from blobs, so images
+    are never read.
+    """
+    if store is None:
+        return
+
+    for title in store.titles():
+        yield title
+
+        if TEXT_MIMETYPES_SET.isdisjoint(store.info(title).mimetypes):
+            continue
+
+        try:
+            outputs = store.load(title, resolve=False)
+        except KeyError:  # removed since the titles were read
+            continue
+
+        for output in outputs if isinstance(outputs, list) else ():
+            data = output.get("data", {}) if isinstance(output, dict) else {}
+
+            for mimetype in TEXT_MIMETYPES:
+                value = data.get(mimetype)
+                digest = _blob_ref(value)
+
+                if digest is not None and store.blobs is not None:
+                    try:
+                        value = json.loads(store.blobs.get(digest))
+                    except KeyError:
+                        continue
+
+                if isinstance(value, list):
+                    yield "".join(v for v in value if isinstance(v, str))
+                elif isinstance(value, str):
+                    yield value
+
+
+class SearchResult(NamedTuple):
+    """
+    A tier found by [Project.search][cassini.core.Project.search].
+    """
+
+    name: str
+    identifiers: Tuple[str, ...]
+    tier_type: str
+    score: float
+
+
+class SearchIndex:
+    """
+    Inverted index of the text in the meta and highlights of a project's tiers. Usually accessed via
+    `project.search_index`.
+
+    Parameters
+    ----------
+    project : Project
+        Project to index.
+    database : Optional[Union[str, Path]]
+        Path to the database. Defaults to `project.project_folder / config.CASSINI_DIR / 'search.sqlite'`.
+
+    Attributes
+    ----------
+    k1 : float
+        BM25 term frequency saturation.
+    b : float
+        BM25 document length normalisation.
+    batch_size : int
+        Number of tiers each thread reads at a time when updating.
+    """
+
+    schema_version = 1
+
+    def __init__(
+        self, project: Project, database: Optional[Union[str, Path]] = None
+    ) -> None:
+        self.project = project
+        self.database: Path = (
+            Path(database)
+            if database
+            else project.project_folder / config.CASSINI_DIR / "search.sqlite"
+        )
+        self.k1 = 1.2
+        self.b = 0.75
+        self.batch_size = 64
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        Connection to the database for the current thread. Creates the database if needed.
+        """
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            connection = open_database(
+                self.database,
+                self.schema_version,
+                [
+                    "DROP TABLE IF EXISTS postings",
+                    "DROP TABLE IF EXISTS docs",
+                    "CREATE TABLE docs ("
+                    "doc_id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL, identifiers TEXT NOT NULL, "
+                    "tier_type TEXT NOT NULL, length INTEGER NOT NULL, signature TEXT NOT NULL)",
+                    "CREATE TABLE postings ("
+                    "term TEXT NOT NULL, doc_id INTEGER NOT NULL, tf INTEGER NOT NULL, "
+                    "PRIMARY KEY (term, doc_id)) WITHOUT ROWID",
+                    "CREATE INDEX postings_doc ON postings (doc_id)",
+                ],
+            )
+            self._local.connection = connection
+
+        return connection
+
+    def close(self) -> None:
+        """
+        Close this thread's connection to the database.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    @staticmethod
+    def signature(tier: NotebookTierBase) -> str:
+        """
+        Fingerprint of the files that are indexed for `tier`, which changes whenever they do.
+        """
+        return json.dumps(
+            [
+                tier.meta._backend.signature(tier.meta_file),
+                stat_signature(tier.highlights_file) if tier.highlights_file else None,
+            ]
+        )
+
+    def text(self, tier: NotebookTierBase) -> Iterator[str]:
+        """
+        Get the pieces of text that are indexed for `tier`.
+        """
+        meta = tier.meta
+        meta.fetch()
+
+        for key in meta.keys():
+            value = meta.get(key)
+            if isinstance(value, str):
+                yield value
+
+        yield from _highlights_text(tier.highlights)
+
+    def _terms(self, tier: NotebookTierBase) -> Counter:
+        terms: Counter = Counter()
+        for text in self.text(tier):
+            terms.update(tokenize(text))
+        return terms
+
+    def _tiers(self, workers: Optional[int]) -> Iterator[NotebookTierBase]:
+        from .core import NotebookTierBase
+
+        index = self.project._index
+
+        if index is not None and index.serving:
+            tiers: Iterable[TierABC] = (
+                index.tier(entry) for entry in index if entry.exists
+            )
+        else:
+            tiers = self.project.walk(workers=workers)
+
+        for tier in tiers:
+            if isinstance(tier, NotebookTierBase):
+                yield tier
+
+    def update(self, workers: Optional[int] = None) -> int:
+        """
+        Bring the index up to date, only re-reading tiers whose meta or highlights have changed since they were last
+        indexed. Tiers that no longer exist are dropped.
+
+        If `project.index` is being served, it's used to find the tiers, otherwise the project is walked.
+
+        Parameters
+        ----------
+        workers : Optional[int]
+            Number of threads used to scan the project. Default lets `ThreadPoolExecutor` decide.
+
+        Returns
+        -------
+        count : int
+            Number of tiers that were (re-)indexed or removed.
+        """
+        previous = dict(self.connection.execute("SELECT name, signature FROM docs"))
+
+        def read(tier: NotebookTierBase) -> Tuple[NotebookTierBase, Optional[str]]:
+            signature = self.signature(tier)
+            return tier, None if previous.get(tier.name) == signature else signature
+
+        def read_batch(tiers: List[NotebookTierBase]) -> List[_Document]:
+            documents = []
+
+            for tier, signature in map(read, tiers):
+                terms = None if signature is None else self._terms(tier)
+                documents.append(_Document(tier, signature, terms))
+
+            return documents
+
+        tiers = self._tiers(workers)
+        # tiers are read in batches, as a future per tier costs about as much as reading it.
+        batches = iter(lambda: list(islice(tiers, self.batch_size)), [])
+        found = set()
+        changed = []
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for documents in pool.map(read_batch, batches):
+                for document in documents:
+                    found.add(document.tier.name)
+                    if document.signature is not None:
+                        changed.append(document)
+
+        removed = previous.keys() - found
+        self._store(changed, removed)
+        return len(changed) + len(removed)
+
+    def rebuild(self, workers: Optional[int] = None) -> int:
+        """
+        Re-index the whole project from scratch.
+
+        Returns
+        -------
+        count : int
+            Number of tiers indexed.
+        """
+        self._store([], removed=None)
+        return self.update(workers)
+
+    def _store(
+        self, documents: List[_Document], removed: Optional[Iterable[str]]
+    ) -> None:
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+
+        try:
+            if removed is None:
+                connection.execute("DELETE FROM postings")
+                connection.execute("DELETE FROM docs")
+            else:
+                for name in removed:
+                    self._delete(name)
+
+            for document in documents:
+                tier, terms = document.tier, document.terms
+                assert terms is not None  # only changed documents are stored.
+                self._delete(tier.name)
+                doc_id = connection.execute(
+                    "INSERT INTO docs (name, identifiers, tier_type, length, signature) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        tier.name,
+                        json.dumps(tier.identifiers),
+                        type(tier).__name__,
+                        sum(terms.values()),
+                        document.signature,
+                    ),
+                ).lastrowid
+                connection.executemany(
+                    "INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                    ((term, doc_id, tf) for term, tf in terms.items()),
+                )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        else:
+            connection.execute("COMMIT")
+
+    def _delete(self, name: str) -> None:
+        connection = self.connection
+        row = connection.execute(
+            "SELECT doc_id FROM docs WHERE name = ?", (name,)
+        ).fetchone()
+
+        if row:
+            connection.execute("DELETE FROM postings WHERE doc_id = ?", row)
+            connection.execute("DELETE FROM docs WHERE doc_id = ?", row)
+
+    def __len__(self) -> int:
+        (count,) = self.connection.execute("SELECT count(*) FROM docs").fetchone()
+        return count
+
+    def _postings(
+        self, term: str, tier_types: Optional[Sequence[str]]
+    ) -> List[Tuple[int, int, int]]:
+        if term.endswith("*"):
+            prefix = term[:-1]
+            condition, params = "p.term >= ? AND p.term < ?", [
+                prefix,
+                prefix + "\U0010ffff",
+            ]
+        else:
+            condition, params = "p.term = ?", [term]
+
+        if tier_types is not None:
+            condition += f" AND d.tier_type IN ({', '.join('?' * len(tier_types))})"
+            params += tier_types
+
+        return self.connection.execute(
+            "SELECT p.doc_id, p.tf, d.length FROM postings p JOIN docs d ON p.doc_id = d.doc_id WHERE "
+            + condition,
+            params,
+        ).fetchall()
+
+    def search(
+        self,
+        text: str,
+        tier_types: Optional[Iterable[Union[str, Type[TierABC]]]] = None,
+        limit: Optional[int] = 20,
+    ) -> List[SearchResult]:
+        """
+        Find the tiers whose text best matches `text`.
+
+        Parameters
+        ----------
+        text : str
+            Terms to search for. Terms ending in `*` match any term they are the start of.
+        tier_types : Optional[Iterable[Union[str, Type[TierABC]]]]
+            Only find tiers of these types. By default, all tiers are searched.
+        limit : Optional[int]
+            Maximum number of results. `None` for all of them.
+
+        Returns
+        -------
+        results : List[SearchResult]
+            Matching tiers, best match first.
+        """
+        types = (
+            None
+            if tier_types is None
+            else [t if isinstance(t, str) else t.__name__ for t in tier_types]
+        )
+        terms = [
+            term + "*" if part.endswith("*") else term
+            for part in text.split()
+            for term in tokenize(part)
+        ]
+
+        count, average = self.connection.execute(
+            "SELECT count(*), avg(length) FROM docs"
+        ).fetchone()
+
+        if not count or not terms:
+            return []
+
+        k1, b = self.k1, self.b
+        scores: Dict[int, float] = {}
+
+        for term in dict.fromkeys(terms):
+            # a prefix matches several terms, so their postings are combined per document, so df can't exceed count.
+            matched: Dict[int, Tuple[int, int]] = {}
+
+            for doc_id, tf, length in self._postings(term, types):
+                previous = matched.get(doc_id, (0, length))
+                matched[doc_id] = (previous[0] + tf, length)
+
+            df = len(matched)
+            idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+
+            for doc_id, (tf, length) in matched.items():
+                norm = tf + k1 * (1 - b + b * length / (average or 1))
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / norm
+
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+        if not best:
+            return []
+
+        rows = {
+            doc_id: (name, identifiers, tier_type)
+            for doc_id, name, identifiers, tier_type in self.connection.execute(
+                "SELECT doc_id, name, identifiers, tier_type FROM docs WHERE doc_id IN "
+                f"({', '.join('?' * len(best))})",
+                [doc_id for doc_id, _ in best],
+            )
+        }
+        results = []
+
+        for doc_id, score in best:
+            name, identifiers, tier_type = rows[doc_id]
+            results.append(
+                SearchResult(name, tuple(json.loads(identifiers)), tier_type, score)
+            )
+
+        return results
+
+
+class _Document(NamedTuple):
+    tier: NotebookTierBase
+    signature: Optional[str]
+    terms: Optional[Counter]
@@ -719,7 +719,15 @@ class ShareableProject:
 
             if stier.meta:
                 print("Copying Meta")
-                shutil.copy(stier.meta.file, meta_file)
+                data = stier.meta._backend.read(stier.meta.file)
+                if data is not None:
+                    meta_file.write_bytes(data)
+                if stier.meta.blob_folder.exists():
+                    shutil.copytree(
+                        stier.meta.blob_folder,
+                        meta_file.parent / stier.meta.blob_folder.name,
+                        dirs_exist_ok=True,
+                    )
                 print("Success")
 
             with open(frozen_file, "w") as fs:
@@ -0,0 +1,200 @@
+"""
+Cache of downscaled previews of the images in highlights, so headers don't have to send every full size image to the
+browser just to show it small.
+
+Thumbnails are made of `image/png` and `image/jpeg` outputs with [Pillow](https://python-pillow.org), if it's
+installed, and kept in `project_folder / config.CASSINI_DIR / 'thumbnails'`. Each is named after the digest of the image
+it was made from, i.e. its blob digest if it's stored in the project's [BlobStore][cassini.blobs.BlobStore], so once
+made, showing a thumbnail doesn't need the full image to be read:
+
+```python
+store = tier.highlights
+store.load("Peak fitting", thumbnails=project.thumbnails)  # images replaced by their thumbnails
+store["Peak fitting"]  # full size images
+```
+
+Thumbnails are never out of date, as a changed image has a different digest. The folder is only a cache, so can be
+deleted at any time.
+
+Images Pillow can't read (e.g. corrupt ones) are shown full size instead. Pillow is an optional dependency, installed
+with `pip install cassini[thumbnails]`.
+"""
+
+from __future__ import annotations
+
+import base64
+import functools
+import io
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .blobs import BlobStore
+from .highlights import _blob_ref
+from .utils import atomic_write
+
+THUMBNAIL_MIMETYPES: Dict[str, str] = {
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+}
+"""
+Mimetypes of the outputs thumbnails are made of, and the suffix given to the thumbnail of each.
+"""
+
+
+def _pillow() -> Any:
+    try:
+        from PIL import Image  # type: ignore[import-not-found]
+    except ImportError:
+        raise ImportError(
+            "Making thumbnails requires the Pillow package, install it with `pip install cassini[thumbnails]`"
+        ) from None
+
+    return Image
+
+
+@functools.lru_cache(maxsize=None)
+def have_pillow() -> bool:
+    """
+    Check if Pillow is installed, which is needed to make thumbnails.
+    """
+    try:
+        _pillow()
+    except ImportError:
+        return False
+    return True
+
+
+def _downscale(data: bytes, mimetype: str, max_size: int) -> Optional[bytes]:
+    """
+    Shrink the image `data` to fit in a `max_size` square, keeping its aspect ratio and format. Returns `None` if `data`
+    can't be read as an image.
+    """
+    Image = _pillow()
+    out = io.BytesIO()
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.thumbnail((max_size, max_size))
+
+            if mimetype == "image/jpeg":
+                image.convert("RGB").save(out, "JPEG", quality=85)
+            else:
+                image.save(out, "PNG", optimize=True)
+    # UnidentifiedImageError is an OSError, and Pillow raises SyntaxError for some malformed files.
+    except (OSError, ValueError, SyntaxError, Image.DecompressionBombError):
+        return None
+
+    return out.getvalue()
+
+
+class ThumbnailCache:
+    """
+    Cache of thumbnails of highlight images, in `folder`. Usually accessed via `project.thumbnails`.
+
+    Parameters
+    ----------
+    folder : Path
+        Folder the thumbnails are kept in.
+    max_size : Optional[int]
+        Thumbnails are shrunk to fit in a square this many pixels across. `None` disables thumbnails.
+    blobs : Optional[BlobStore]
+        Store images given as blob references are read from, when their thumbnail isn't cached.
+    """
+
+    def __init__(
+        self,
+        folder: Path,
+        max_size: Optional[int] = 320,
+        blobs: Optional[BlobStore] = None,
+    ) -> None:
+        self.folder = folder
+        self.max_size = max_size
+        self.blobs = blobs
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether thumbnails can be made, i.e. `max_size` isn't `None` and Pillow is installed.
+        """
+        return self.max_size is not None and have_pillow()
+
+    def key(self, value: Any) -> str:
+        """
+        Get the digest an image is cached under, given its base64 encoded value or a reference to its blob.
+        """
+        digest = _blob_ref(value)
+
+        if digest is not None:
+            return digest
+
+        # the same digest the image would be stored under as a blob.
+        return BlobStore.digest(json.dumps(value).encode("utf-8"))
+
+    def _path(self, key: str, mimetype: str) -> Path:
+        return (
+            self.folder
+            / key[:2]
+            / f"{key}-{self.max_size}{THUMBNAIL_MIMETYPES[mimetype]}"
+        )
+
+    def _original(self, value: Any) -> str:
+        """
+        Get the base64 encoded full size image, reading it from its blob if `value` is a reference to one.
+        """
+        digest = _blob_ref(value)
+
+        if digest is not None:
+            if self.blobs is None:
+                raise KeyError(
+                    "Image is stored in a blob, but this cache has no BlobStore"
+                )
+            value = json.loads(self.blobs.get(digest))
+
+        return "".join(value) if isinstance(value, list) else value
+
+    def get(self, mimetype: str, value: Any) -> str:
+        """
+        Get the base64 encoded thumbnail of an image, making it if it isn't cached. If the image can't be read, the
+        full size image is returned instead.
+
+        Parameters
+        ----------
+        mimetype : str
+            Mimetype of the image, one of `THUMBNAIL_MIMETYPES`.
+        value : Any
+            The base64 encoded image, as in a highlight's outputs, or a reference to the blob it's stored in.
+
+        Raises
+        ------
+        ImportError
+            If Pillow isn't installed and the thumbnail isn't cached.
+        """
+        if mimetype not in THUMBNAIL_MIMETYPES:
+            raise ValueError(f"Can't make thumbnails of {mimetype}")
+
+        if self.max_size is None:
+            raise ValueError("Thumbnails are disabled, max_size is None")
+
+        path = self._path(self.key(value), mimetype)
+
+        try:
+            thumbnail = path.read_bytes()
+        except FileNotFoundError:
+            original = self._original(value)
+
+            try:
+                data = base64.b64decode(original)
+            except ValueError:  # binascii.Error
+                return original
+
+            made = _downscale(data, mimetype, self.max_size)
+
+            if made is None:
+                return original
+
+            thumbnail = made
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(path, thumbnail)
+
+        return base64.b64encode(thumbnail).decode("ascii")
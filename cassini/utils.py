@@ -1,9 +1,16 @@
+import atexit
+import contextlib
 import importlib
 from pathlib import Path
 import os
 import sys
 import functools
+import tempfile
+import threading
+import time
 from typing import (
+    Dict,
+    Hashable,
     MutableMapping,
     Type,
     Union,
@@ -13,6 +20,7 @@ from typing import (
     Tuple,
     TypeVar,
     Generic,
+    Optional,
 )
 from jupyterlab.labapp import LabApp, LabServerApp
 from typing_extensions import Self, ParamSpec
@@ -80,12 +88,20 @@ class FileMaker:
     def __init__(self) -> None:
         self.folders_made: List[Path] = []
         self.files_made: List[Path] = []
+        self.rollbacks: List[Callable[[], Any]] = []
 
     def __enter__(self) -> Self:
         self.files_made = []
         self.folders_made = []
+        self.rollbacks = []
         return self
 
+    def add_rollback(self, func: Callable[[], Any]) -> None:
+        """
+        Register a function to call if rolling back, for undoing changes that aren't just making files or folders.
+        """
+        self.rollbacks.append(func)
+
     def mkdir(self, path: Path, exist_ok: bool = False) -> Union[Path, None]:
         """
         Make a directory.
@@ -122,6 +138,9 @@ class FileMaker:
     def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
         if exc_type:
             print(f"{exc_type} occured, rolling back")
+            for rollback in reversed(self.rollbacks):
+                rollback()
+
             for file in self.files_made:
                 print("Deleting", file)
                 file.unlink()
@@ -134,6 +153,150 @@ class FileMaker:
             raise exc_type(exc_val)
 
 
+def atomic_write(path: Union[str, Path], data: bytes) -> None:
+    """
+    Write `data` to `path`, such that readers either see the old contents or the new, never a partially written file.
+
+    The data is written to a temporary file in the same folder, which then replaces `path`.
+    """
+    path = Path(path)
+    fd, temp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(temp)
+        raise
+
+
+StatSignature = Tuple[int, int, int]
+
+
+def stat_signature(path: Union[str, Path]) -> Optional[StatSignature]:
+    """
+    Cheap fingerprint of a file's state on disk, made from its `(st_mtime_ns, st_size, st_ino)`.
+
+    If the signature of a file hasn't changed, you can assume its contents haven't either.
+
+    Returns
+    -------
+    signature : Optional[StatSignature]
+        The signature, or `None` if the file does not exist.
+    """
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class BackgroundWriter:
+    """
+    Runs write jobs on a background thread, so the caller doesn't have to wait for them.
+
+    Jobs are submitted with a key, e.g. the path being written to. If a job is submitted while another with the same
+    key is still waiting, the older one is replaced i.e. repeated writes to the same file are coalesced.
+
+    Exceptions raised by jobs are kept, and raised by the next call to `flush`. Pending jobs are flushed when the
+    interpreter exits.
+
+    Parameters
+    ----------
+    name : str
+        Name of the writer, used to name its thread.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._pending: Dict[Hashable, Callable[[], Any]] = {}
+        self._running: Union[Hashable, None] = None
+        self._errors: List[BaseException] = []
+        self._condition = threading.Condition()
+        self._thread: Union[threading.Thread, None] = None
+
+        atexit.register(self._flush_at_exit)
+
+    def submit(self, key: Hashable, job: Callable[[], Any]) -> None:
+        """
+        Queue `job` to be run in the background, replacing any waiting job with the same `key`.
+        """
+        with self._condition:
+            self._pending.pop(key, None)
+            self._pending[key] = job
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"cassini-{self.name}-writer", daemon=True
+                )
+                self._thread.start()
+
+            self._condition.notify_all()
+
+    def is_pending(self, key: Hashable) -> bool:
+        """
+        Check if a job with this `key` is waiting or running.
+        """
+        with self._condition:
+            return key in self._pending or self._running == key
+
+    def flush(self, timeout: Union[float, None] = None) -> None:
+        """
+        Wait for all submitted jobs to finish. If any of them failed, the first exception is raised.
+
+        Parameters
+        ----------
+        timeout : Union[float, None]
+            Maximum time to wait in secs. Raises `TimeoutError` if exceeded. By default waits forever.
+        """
+        with self._condition:
+            done = self._condition.wait_for(
+                lambda: not self._pending and self._running is None, timeout
+            )
+
+            if not done:
+                raise TimeoutError(
+                    f"Timed out waiting for {self.name} writes to finish"
+                )
+
+            errors, self._errors = self._errors, []
+
+        if errors:
+            raise errors[0]
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._pending:
+                    self._thread = None
+                    return
+
+                key = next(iter(self._pending))
+                job = self._pending.pop(key)
+                self._running = key
+
+            try:
+                job()
+            except BaseException as e:
+                with self._condition:
+                    self._errors.append(e)
+            finally:
+                with self._condition:
+                    self._running = None
+                    self._condition.notify_all()
+
+    def _flush_at_exit(self) -> None:
+        try:
+            self.flush()
+        except BaseException as e:
+            print(
+                f"Error writing {self.name} in the background:",
+                repr(e),
+                file=sys.stderr,
+            )
+
+
 R = TypeVar("R")
 P = ParamSpec("P")
 
@@ -222,6 +385,165 @@ def win_open_file(filename: Union[str, Path]) -> None:
     os.startfile(filename)  # type: ignore[attr-defined]
 
 
+LOCK_TIMEOUT: float = 60.0
+"""
+Seconds `lock_file` waits for a lock on Windows before giving up, so a process stuck holding a lock can't leave every
+other waiting forever.
+"""
+
+
+@XPlatform
+def lock_file(fd: int) -> None:
+    """
+    Block until an exclusive advisory lock is acquired on the open file `fd`.
+
+    *Nix implementation, uses `fcntl.flock`.
+    """
+    import fcntl
+
+    fcntl.flock(fd, fcntl.LOCK_EX)
+
+
+@lock_file.add("win32")
+def win_lock_file(fd: int) -> None:
+    """
+    Block until an exclusive lock is acquired on the open file `fd`.
+
+    Windows implementation, uses `msvcrt.locking`, trying again with a growing delay between attempts, for up to
+    `LOCK_TIMEOUT` seconds.
+
+    Raises
+    ------
+    TimeoutError
+        If the lock isn't acquired within `LOCK_TIMEOUT` seconds.
+    """
+    import msvcrt
+
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    delay = 0.001
+
+    while True:
+        os.lseek(fd, 0, os.SEEK_SET)  # the lock is on the first byte.
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)  # type: ignore[attr-defined]
+            return
+        except OSError:
+            pass
+
+        if time.monotonic() >= deadline:
+            raise TimeoutError(
+                f"Couldn't acquire lock within {LOCK_TIMEOUT}s, another process may be stuck holding it"
+            )
+
+        time.sleep(delay)
+        delay = min(delay * 2, 0.1)
+
+
+@XPlatform
+def unlock_file(fd: int) -> None:
+    """
+    Release a lock acquired with `lock_file`.
+
+    *Nix implementation.
+    """
+    import fcntl
+
+    fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@unlock_file.add("win32")
+def win_unlock_file(fd: int) -> None:
+    """
+    Release a lock acquired with `lock_file`.
+
+    Windows implementation.
+    """
+    import msvcrt
+
+    os.lseek(fd, 0, os.SEEK_SET)
+    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)  # type: ignore[attr-defined]
+
+
+class FileLock:
+    """
+    Re-entrant lock that is shared between threads, and between processes via an advisory lock on `path`.
+
+    The lock file is created if it doesn't exist, and is left in place afterwards. Its folder must already exist.
+
+    Parameters
+    ----------
+    path : Union[str, Path]
+        File to lock.
+    folder : bool
+        If `True`, `path` is an existing folder, which is locked itself, so nothing is left behind. Not supported on
+        Windows.
+
+    Example
+    -------
+    ```python
+    lock = FileLock('data.lock')
+
+    with lock:
+        data = read_data()
+        write_data(modify(data))
+    ```
+    """
+
+    def __init__(self, path: Union[str, Path], folder: bool = False) -> None:
+        self.path: Path = Path(path)
+        self.folder: bool = folder
+        self._lock = threading.RLock()
+        self._depth: int = 0
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> None:
+        """
+        Block until the lock is acquired.
+        """
+        self._lock.acquire()
+
+        if self._depth == 0:
+            try:
+                flags = os.O_RDONLY if self.folder else os.O_RDWR | os.O_CREAT
+                fd = os.open(self.path, flags)
+                try:
+                    lock_file(fd)
+                except TimeoutError as e:
+                    os.close(fd)
+                    raise TimeoutError(f"{self.path}: {e}") from None
+                except BaseException:
+                    os.close(fd)
+                    raise
+            except BaseException:
+                self._lock.release()
+                raise
+            self._fd = fd
+
+        self._depth += 1
+
+    def release(self) -> None:
+        """
+        Release the lock. Only really released once it's released as many times as it was acquired.
+        """
+        self._depth -= 1
+
+        if self._depth == 0 and self._fd is not None:
+            fd, self._fd = self._fd, None
+            try:
+                unlock_file(fd)
+            finally:
+                os.close(fd)
+
+        self._lock.release()
+
+    def __enter__(self) -> Self:
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+
 def find_project(import_string=None):
     """
     Find the Project instance for this Python interpretter.
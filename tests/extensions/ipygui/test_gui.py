@@ -96,3 +96,52 @@ def test_search_widget(patched_ipygui_project, monkeypatch):
     search.go_btn.click()
 
     mock_getitem.assert_called_with('WP1')
+
+
+def test_search_widget_text(patched_ipygui_project, monkeypatch):
+    project, make_tiers = patched_ipygui_project
+    Home, WP1, WP2 = make_tiers(['Home', 'WP1', 'WP2'])
+    WP2.description = 'XRD peak shift'
+
+    shown = []
+    monkeypatch.setattr('cassini.ext.ipygui.components.display', shown.append)
+    monkeypatch.setattr(BaseTierGui, 'header', lambda self: self.tier.name)
+
+    search = SearchWidget()
+    search.search.value = 'peak'
+    assert shown == ['WP2']
+
+    search.search.value = 'nothing'
+    assert shown == ['WP2']
+
+    # changes since the last search are found without updating the index by hand.
+    WP1.description = 'another peak'
+    search.search.value = 'another'
+    assert shown == ['WP2', 'WP1']
+
+
+def test_highlights_accordion_thumbnails(patched_ipygui_project, monkeypatch):
+    from cassini import thumbnails
+
+    project, make_tiers = patched_ipygui_project
+    WP1, WP1_1 = make_tiers(['WP1', 'WP1.1'])
+
+    WP1_1.add_highlight('Figure', [{'data': {'image/png': 'abc' * 10000}, 'metadata': {}}])
+    WP1_1.add_highlight('Text', [{'data': {'text/plain': 'text'}, 'metadata': {}}])
+
+    monkeypatch.setattr(thumbnails, 'have_pillow', lambda: True)
+    monkeypatch.setattr(thumbnails, '_downscale', lambda data, mimetype, max_size: b'thumb')
+
+    shown = []
+    monkeypatch.setattr('cassini.ext.ipygui.components.publish_display_data', lambda data, metadata: shown.append(data))
+
+    accordion = WP1_1.gui._build_highlights_accordion()
+    figure, text = accordion.children
+
+    assert shown == [{'image/png': 'dGh1bWI='}, {'text/plain': 'text'}]
+
+    out, full_btn = figure.children
+    full_btn.click()
+
+    assert shown[-1] == {'image/png': 'abc' * 10000}
+    assert not hasattr(text, 'children')  # no images, so no button.
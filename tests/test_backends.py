@@ -0,0 +1,249 @@
+import json
+import pathlib
+import sys
+
+import pytest # type: ignore[import]
+
+from cassini import DEFAULT_TIERS
+from cassini.backends import (
+    FileMetaBackend,
+    SQLiteMetaBackend,
+    ConsolidatedMetaBackend,
+    convert_meta_backend,
+)
+from cassini.meta import Meta
+from cassini.testing_utils import get_Project
+
+
+@pytest.fixture(params=['file', 'sqlite', 'consolidated'])
+def backend(request, tmp_path):
+    if request.param == 'file':
+        yield FileMetaBackend()
+    elif request.param == 'consolidated':
+        yield ConsolidatedMetaBackend()
+    else:
+        backend = SQLiteMetaBackend(tmp_path)
+        yield backend
+        backend.close()
+
+
+def test_backend_operations(backend, tmp_path):
+    folder = tmp_path / '.wps'
+    folder.mkdir()
+
+    file = folder / 'WP1.json'
+
+    assert backend.signature(file) is None
+    assert backend.read(file) is None
+    assert not backend.exists(file)
+    assert list(backend.iter_names(folder)) == []
+
+    signature = backend.write(file, b'{"a": 1}')
+
+    assert signature == backend.signature(file)
+    assert backend.exists(file)
+    assert backend.read(file) == b'{"a": 1}'
+    assert list(backend.iter_names(folder)) == ['WP1']
+
+    assert backend.write(file, b'{"a": 2}') != signature
+    assert backend.read(file) == b'{"a": 2}'
+
+    backend.delete(file)
+
+    assert not backend.exists(file)
+
+    with pytest.raises(FileNotFoundError):
+        backend.delete(file)
+
+
+def test_meta_with_backend(backend, tmp_path):
+    folder = tmp_path / '.wps'
+    folder.mkdir()
+
+    meta = Meta(folder / 'WP1.json', backend=backend, freshness='stat')
+
+    assert not meta.exists()
+
+    meta['a'] = 1
+    assert meta.exists()
+
+    other = Meta(folder / 'WP1.json', backend=backend, freshness='stat')
+    assert other['a'] == 1
+
+    other['a'] = 2
+    assert meta['a'] == 2
+
+
+def test_backend_lock_merge(backend, tmp_path):
+    folder = tmp_path / '.wps'
+    folder.mkdir()
+    file = folder / 'WP1.json'
+
+    with backend.lock(file):
+        with backend.lock(file):  # re-entrant
+            backend.write(file, b'{"a": 1}')
+
+    meta1 = Meta(file, backend=backend)
+    meta2 = Meta(file, backend=backend)
+
+    with meta1.transaction():
+        meta1['b'] = 2
+        meta2['c'] = 3
+
+    assert json.loads(backend.read(file)) == {'a': 1, 'b': 2, 'c': 3}
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='folders are locked via a lock file on Windows')
+def test_lock_leaves_no_file(tmp_path):
+    folder = tmp_path / '.wps'
+    folder.mkdir()
+    file = folder / 'WP1.json'
+
+    meta = Meta(file)
+
+    with meta.transaction():
+        meta['a'] = 1
+
+    assert [path.name for path in folder.iterdir()] == ['WP1.json']
+
+
+def test_sqlite_project(get_Project, tmp_path):
+    Project = get_Project
+    project = Project(DEFAULT_TIERS, tmp_path, meta_backend=SQLiteMetaBackend(tmp_path))
+    project.setup_files()
+
+    wp = project['WP1']
+    wp.setup_files()
+    wp.description = 'in a database'
+
+    exp = project['WP1.1']
+    exp.setup_files()
+
+    assert wp.exists()
+    assert not wp.meta_file.exists()
+    assert (tmp_path / '.cassini' / 'meta.sqlite').exists()
+
+    assert [tier.name for tier in project.home] == ['WP1']
+    assert [tier.name for tier in wp] == ['WP1.1']
+    assert wp.description == 'in a database'
+    assert wp.started
+
+    exp.remove_files()
+    assert not exp.exists()
+    assert list(wp) == []
+
+
+def test_convert_meta_backend(get_Project, tmp_path):
+    Project = get_Project
+    project = Project(DEFAULT_TIERS, tmp_path)
+    project.setup_files()
+
+    for name in ['WP1', 'WP1.1', 'WP1.1a', 'WP1.1b', 'WP2']:
+        tier = project[name]
+        tier.setup_files()
+        tier.description = name
+
+    file_backend = project.meta_backend
+    sqlite_backend = SQLiteMetaBackend(tmp_path)
+
+    assert convert_meta_backend(project, sqlite_backend, delete=True) == 5
+    assert project.meta_backend is sqlite_backend
+    assert not project['WP1.1a'].meta_file.exists()
+    assert project['WP1.1a'].description == 'WP1.1a'
+
+    assert convert_meta_backend(project, file_backend) == 5
+    assert project.meta_backend is file_backend
+    assert json.loads(project['WP1.1a'].meta_file.read_text())['description'] == 'WP1.1a'
+
+
+def test_consolidated_project(get_Project, tmp_path):
+    Project = get_Project
+    project = Project(DEFAULT_TIERS, tmp_path, meta_backend=ConsolidatedMetaBackend())
+    project.setup_files()
+
+    project['WP1'].setup_files()
+
+    for name in ['WP1.1', 'WP1.2', 'WP1.3']:
+        tier = project[name]
+        tier.setup_files()
+        tier.description = name
+        tier.add_highlight('a highlight', [{'data': {}}])
+
+    record_file = project['WP1'].folder / '.exps' / 'meta.jsonl'
+
+    assert record_file.exists()
+    assert not project['WP1.1'].meta_file.exists()
+    assert sorted(tier.name for tier in project['WP1']) == ['WP1.1', 'WP1.2', 'WP1.3']
+    assert project['WP1.2'].description == 'WP1.2'
+    assert project['WP1.2'].get_highlights()
+
+
+def test_consolidated_compaction(tmp_path):
+    backend = ConsolidatedMetaBackend(compact_threshold=4)
+    file = tmp_path / 'WP1.json'
+    other = tmp_path / 'WP2.json'
+    record_file = tmp_path / 'meta.jsonl'
+
+    backend.write(other, b'{"other": true}')
+
+    for i in range(5):
+        backend.write(file, json.dumps({'i': i}).encode())
+
+    assert len(record_file.read_bytes().splitlines()) == 6
+
+    backend.write(file, b'{"i": 5}')  # 5 dead records > threshold and live records, so compacts.
+
+    assert len(record_file.read_bytes().splitlines()) == 2
+    assert backend.read(file) == b'{"i": 5}'
+    assert backend.read(other) == b'{"other": true}'
+
+    backend.delete(other)
+    backend.compact(tmp_path)
+
+    assert record_file.read_bytes() == b'WP1.json\t{"i": 5}\n'
+
+
+def test_consolidated_external_changes(tmp_path):
+    backend = ConsolidatedMetaBackend()
+    other_process = ConsolidatedMetaBackend()
+
+    file = tmp_path / 'WP1.json'
+
+    backend.write(file, b'{"a": 1}')
+    signature = backend.signature(file)
+
+    other_process.write(tmp_path / 'WP2.json', b'{"b": 1}')
+
+    assert backend.signature(file) == signature  # unaffected by changes to other entries
+    assert sorted(backend.iter_names(tmp_path)) == ['WP1', 'WP2']
+
+    other_process.write(file, b'{"a": 2}')
+
+    assert backend.signature(file) != signature
+    assert backend.read(file) == b'{"a": 2}'
+
+    backend.write(file, b'{"a": 3}')
+    assert other_process.read(file) == b'{"a": 3}'
+
+
+def test_consolidated_single_read(tmp_path, monkeypatch):
+    backend = ConsolidatedMetaBackend()
+
+    for i in range(10):
+        backend.write(tmp_path / f'WP{i}.json', json.dumps({'i': i}).encode())
+
+    fresh = ConsolidatedMetaBackend()
+
+    reads = []
+    original_read_bytes = pathlib.Path.read_bytes
+
+    def counting_read_bytes(self):
+        reads.append(self)
+        return original_read_bytes(self)
+
+    monkeypatch.setattr(pathlib.Path, 'read_bytes', counting_read_bytes)
+
+    for name in fresh.iter_names(tmp_path):
+        assert json.loads(fresh.read(tmp_path / f'{name}.json'))['i'] == int(name[2:])
+
+    assert len(reads) == 1
@@ -0,0 +1,116 @@
+import json
+
+import pytest # type: ignore[import]
+
+from cassini import DEFAULT_TIERS
+from cassini.blobs import BlobStore
+from cassini.config import config
+from cassini.highlights import BLOB_KEY
+from cassini.testing_utils import get_Project
+
+
+def test_blob_store(tmp_path):
+    store = BlobStore(tmp_path / 'blobs')
+
+    digest = store.put(b'hello')
+    assert store.put(b'hello') == digest
+    assert store.get(digest) == b'hello'
+    assert digest in store
+    assert list(store) == [digest]
+    assert (tmp_path / 'blobs' / digest[:2] / digest).read_bytes() == b'hello'
+
+    with pytest.raises(KeyError):
+        store.get('0' * 64)
+
+
+def test_blob_store_compression(tmp_path):
+    plain = BlobStore(tmp_path)
+    digest = plain.put(b'a' * 1000)
+
+    store = BlobStore(tmp_path, compression='zlib')
+    other = store.put(b'b' * 1000)
+
+    assert (tmp_path / other[:2] / f'{other}.zlib').stat().st_size < 1000
+    assert store.get(other) == b'b' * 1000
+    assert store.get(digest) == b'a' * 1000
+    assert plain.get(other) == b'b' * 1000
+
+    with pytest.raises(ValueError):
+        BlobStore(tmp_path, compression='lzma')
+
+    try:
+        import zstandard
+    except ImportError:
+        with pytest.raises(ImportError):
+            BlobStore(tmp_path, compression='zstd')
+    else:
+        zstd = BlobStore(tmp_path, compression='zstd')
+        assert zstd.get(zstd.put(b'c' * 1000)) == b'c' * 1000
+
+
+def test_blob_store_gc(tmp_path):
+    store = BlobStore(tmp_path)
+    keep = store.put(b'keep')
+    old = store.put(b'old')
+
+    assert store.gc({keep}) == 0  # within grace period
+    assert store.gc({keep}, grace=0) == 1
+    assert list(store) == [keep]
+
+
+def test_highlights_inline_by_default(get_Project, tmp_path):
+    Project = get_Project
+    project = Project(DEFAULT_TIERS, tmp_path)
+    project.setup_files()
+    project['WP1'].setup_files()
+
+    exp = project['WP1.1']
+    exp.setup_files()
+
+    figure = [{'data': {'image/png': 'abc' * 10000, 'text/plain': '<Figure>'}, 'metadata': {}}]
+    exp.add_highlight('Figure', figure)
+
+    assert list(project.blobs) == []
+    assert exp.highlights.load('Figure', resolve=False) == figure
+    assert exp.highlights.info('Figure').blobs == ()
+
+
+def test_highlight_blobs(get_Project, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'HIGHLIGHT_BLOB_THRESHOLD', 4 * 1024)
+
+    Project = get_Project
+    project = Project(DEFAULT_TIERS, tmp_path)
+    project.setup_files()
+    project['WP1'].setup_files()
+
+    figure = [{'data': {'image/png': 'abc' * 10000, 'text/plain': '<Figure>'}, 'metadata': {}}]
+
+    exps = []
+    for name in ['WP1.1', 'WP1.2']:
+        exp = project[name]
+        exp.setup_files()
+        exp.add_highlight('Figure', figure)
+        exps.append(exp)
+
+    exp1, exp2 = exps
+    exp1.add_highlight('Again', figure)
+
+    assert len(list(project.blobs)) == 1
+
+    stored = exp1.highlights.load('Figure', resolve=False)
+    digest = stored[0]['data']['image/png'][BLOB_KEY]
+    assert stored[0]['data']['text/plain'] == '<Figure>'
+    assert exp1.highlights.info('Figure').blobs == (digest,)
+    assert exp1.highlights.info('Figure').size < 1000
+
+    assert exp1.highlights['Figure'] == figure
+    assert json.loads(exp1.highlights_file.read_text()) == {'Figure': figure, 'Again': figure}
+    assert exp2.get_highlights() == {'Figure': figure}
+
+    exp1.remove_highlight('Figure')
+    exp1.remove_highlight('Again')
+    assert project.gc_blobs(grace=0) == 0
+
+    exp2.remove_highlight('Figure')
+    assert project.gc_blobs(grace=0) == 1
+    assert list(project.blobs) == []
@@ -2,7 +2,7 @@ import pytest # type: ignore[import]
 
 from cassini import FolderTierBase, NotebookTierBase, Home
 from cassini.core import TierABC
-from cassini.accessors import _CachedProp
+from cassini.accessors import _CachedProp, cached_prop
 from cassini.testing_utils import get_Project, patch_project, patched_default_project
 
 
@@ -62,6 +62,30 @@ def test_construct(patch_project):
         tier = Tier('l', project=project)
 
 
+def test_construct_cached(patched_default_project):
+    project, create_tiers = patched_default_project
+    WP1, exp, smpl = create_tiers(['WP1', 'WP1.1', 'WP1.1a'])
+
+    smpl = project['WP1.1a']
+    smpl.description = 'warm'
+    meta = smpl.meta
+
+    assert project['WP1.1a'].meta is meta
+    assert next(iter(exp)).meta is meta
+    assert meta._cache.description == 'warm'
+
+    tier = project['WP1.1b']
+    assert getattr(tier, '_meta', None) is None
+    assert getattr(tier, '_gui', None) is None
+    assert tier.gui is tier.gui
+
+    with pytest.raises(ValueError):
+        exp.child_cls('1', '1', 'a', 'x', project=project)
+
+    with pytest.raises(ValueError):
+        exp.child_cls('1', '1', '1a', project=project)
+
+
 def test_tier_attrs(patch_project):
     Tier, project = patch_project
 
@@ -128,6 +152,87 @@ def test_tier_accessors(patch_project):
         obj.doesnt_have
 
 
+def test_tier_slots(patched_default_project):
+    project, create_tiers = patched_default_project
+    WP1, exp, smpl = create_tiers(['WP1', 'WP1.1', 'WP1.1a'])
+
+    smpl = project['WP1.1a']
+
+    assert not hasattr(smpl, '__dict__')
+    assert smpl.name == 'WP1.1a'
+    assert smpl.name is smpl.name
+    assert smpl.parent is exp
+    assert smpl.meta_file == exp.folder / '.smpls' / 'WP1.1a.json'
+    assert smpl.file == exp.folder / 'WP1.1a.ipynb'
+
+    other = project['WP1.1b']
+    assert other.identifiers[0] is smpl.identifiers[0]
+    assert other.identifiers[1] is smpl.identifiers[1]
+
+    with pytest.raises(AttributeError):
+        smpl.extra = 'not allowed'
+
+
+def test_tier_slots_cached_prop(get_Project, tmp_path):
+    calls = []
+
+    class Slotted(NotebookTierBase):
+        __slots__ = ()
+        pretty_type = 'Slotted'
+
+        @cached_prop
+        def extra(self):
+            calls.append(self)
+            return self.name.lower()
+
+    project = get_Project([Home, Slotted], tmp_path)
+    tier = Slotted('1', project=project)
+
+    assert not hasattr(tier, '__dict__')
+    assert tier.extra == 'slotted1'
+    assert tier.extra == 'slotted1'
+    assert calls == [tier]
+
+    with pytest.raises(AttributeError):
+        tier.extra = 'not allowed'
+
+
+def test_cached_prop_storage():
+    from cassini import env
+
+    class Plain:
+        @cached_prop
+        def value(self):
+            return object()
+
+    class Slotted:
+        __slots__ = ('_cached_value', '__weakref__')
+
+        @cached_prop
+        def value(self):
+            return object()
+
+    plain, slotted = Plain(), Slotted()
+
+    # the __dict__ and slot are both named after the property.
+    assert plain.value is plain.__dict__['_cached_value'] is plain.value
+    assert slotted.value is slotted._cached_value is slotted.value
+    assert not Slotted.value.values
+
+    (info,) = env.cache_stats('cached_prop')
+    assert info.hits >= 2 and info.misses >= 2
+
+
+def test_tier_subclass_dict(patch_project):
+    Tier, project = patch_project
+
+    obj = Tier('1', project=project)
+    obj.extra = 'allowed'
+
+    assert obj.extra == 'allowed'
+    assert obj.name is obj.name
+
+
 def test_meta_attr(patched_default_project):
     project, make_tiers = patched_default_project
     WP1, = make_tiers(['WP1'])
@@ -34,6 +34,17 @@ def test_parse_name(mk_project):
     assert project.parse_name('INVALIDATE WP572.573foobar3-123new to me') == tuple()
 
 
+
+def test_parse_name_hierarchy_change(mk_project):
+    project = mk_project
+    assert project.parse_name('WP1.2c') == ('1', '2', 'c')
+    assert project.parse_name('WP1.2c') == ('1', '2', 'c')  # cached
+
+    project.hierarchy = DEFAULT_TIERS[:3]
+
+    assert project.parse_name('WP1.2c') == tuple()
+    assert project.parse_name('WP1.2') == ('1', '2')
+
 def test_get_home(mk_project):
     project = mk_project
     home = project['Home']
@@ -127,6 +138,57 @@ def test_sample(mk_project):
     assert set(smpl1) == set([dataset1])
 
 
+def test_dataset_index(mk_project, monkeypatch):
+    project = mk_project
+
+    exp = project['WP1.1']
+    exp.parent.setup_files()
+    exp.setup_files()
+
+    smpl_a = exp['a']
+    smpl_a.setup_files()
+    smpl_b = exp['b']
+    smpl_b.setup_files()
+
+    xrd = smpl_a['XRD']
+    xrd.setup_files()
+    sem = smpl_b['SEM']
+    sem.setup_files()
+
+    (exp.folder / 'XRD' / '.ipynb_checkpoints').mkdir()
+    (exp.folder / 'XRD' / '1bad').mkdir()
+
+    index = exp.dataset_index
+
+    assert set(exp.techniques) == {'XRD', 'SEM'}
+    assert dict(index) == {('XRD', 'a'): xrd, ('SEM', 'b'): sem}
+    assert index['XRD', 'a'] is xrd
+    assert smpl_a.datasets == [xrd]
+    assert list(smpl_b) == [sem]
+
+    with pytest.raises(KeyError):
+        index['XRD', 'b']
+
+    scans = []
+    scan_samples = index._scan_samples
+    monkeypatch.setattr(index, '_scan_samples', lambda tech: scans.append(tech) or scan_samples(tech))
+
+    smpl_a.datasets
+    smpl_b.datasets
+    assert scans == []
+
+    (exp.folder / 'SEM' / 'a').mkdir()
+    os.utime(exp.folder / 'SEM', ns=(0, 0))  # in case the mkdir was too quick to change the mtime
+
+    assert set(smpl_a.datasets) == {xrd, smpl_a['SEM']}
+    assert scans == ['SEM']
+
+    (exp.folder / 'SEM' / 'a').rmdir()
+    os.utime(exp.folder / 'SEM', ns=(1, 1))
+
+    assert smpl_a.datasets == [xrd]
+
+
 def test_datasets(mk_project):
     project = mk_project
 
@@ -149,3 +211,77 @@ def test_datasets(mk_project):
     mock_file.write_text('test')
 
     assert list(dataset)[0].path == list(os.scandir(dataset))[0].path
+
+
+def test_children_prefetch_meta(mk_project):
+    project = mk_project
+
+    exp = project['WP1.1']
+    exp.parent.setup_files()
+    exp.setup_files()
+
+    for id in 'abcdef':
+        smpl = exp[id]
+        smpl.setup_files()
+        smpl.description = f'sample {id}'
+
+    children = exp.children()
+    assert sorted(child.name for child in children) == [f'WP1.1{id}' for id in 'abcdef']
+
+    children = exp.children(prefetch_meta=True, workers=3)
+
+    for child in children:
+        assert child.meta.age < child.meta.timeout
+        assert child.meta._cache.description == f'sample {child.id}'
+
+    assert project.load_meta([project.home, exp]) == [project.home, exp]
+
+
+def test_load_meta_stays_warm(mk_project, monkeypatch):
+    project = mk_project
+
+    exp = project['WP1.1']
+    exp.parent.setup_files()
+    exp.setup_files()
+
+    for id in 'abc':
+        exp[id].setup_files()
+        exp[id].description = f'sample {id}'
+
+    smpls = project.load_meta(exp.children())
+    assert all(smpl.meta._freshness == 'stat' for smpl in smpls)
+
+    # well after the ttl would have expired, the caches are still used.
+    monkeypatch.setattr(type(smpls[0].meta), 'timeout', 0)
+    fetched = []
+    monkeypatch.setattr(type(smpls[0].meta), 'fetch', lambda self: fetched.append(self))
+
+    assert sorted(smpl.description for smpl in smpls) == ['sample a', 'sample b', 'sample c']
+    assert fetched == []
+
+
+def test_walk(mk_project):
+    project = mk_project
+
+    for name in ['WP2', 'WP10', 'WP2.1', 'WP2.1b', 'WP2.1a', 'WP10.2']:
+        project[name].setup_files()
+
+    exp = project['WP2.1']
+    exp.setup_technique('XRD')
+    project['WP2.1a-XRD'].setup_files()
+
+    names = [tier.name for tier in project.walk(workers=2)]
+    assert names == ['Home', 'WP2', 'WP2.1', 'WP2.1a', 'WP2.1a-XRD', 'WP2.1b', 'WP10', 'WP10.2']
+
+    assert [tier.name for tier in project.walk(max_depth=1)] == ['Home', 'WP2', 'WP10']
+    assert [tier.name for tier in project.walk(exp)] == ['WP2.1', 'WP2.1a', 'WP2.1a-XRD', 'WP2.1b']
+    assert [tier.name for tier in project.walk(prune=[Experiment])] == ['Home', 'WP2', 'WP2.1', 'WP10', 'WP10.2']
+
+
+def test_ignore_dir_reexported():
+    from cassini.defaults import datasets, tiers
+
+    assert tiers.ignore_dir is datasets.ignore_dir
+    assert tiers.ignore_dir('.ipynb_checkpoints')
+    assert tiers.ignore_dir('_private')
+    assert not tiers.ignore_dir('XRD')
@@ -0,0 +1,154 @@
+import gc
+import threading
+
+import pytest # type: ignore[import]
+
+from cassini import env, Sample
+from cassini.environment import Cache, LRUCache, WeakCache
+from cassini.testing_utils import get_Project, patched_default_project
+
+
+class Value:
+    pass
+
+
+def test_create_cache():
+    assert type(env.create_cache('test.unbounded')) is Cache
+    assert isinstance(env.create_cache('test.lru', 'lru', 2), LRUCache)
+    assert isinstance(env.create_cache('test.weak', 'weak'), WeakCache)
+
+    with pytest.raises(ValueError):
+        env.create_cache('test.lru', 'lru')
+
+    with pytest.raises(ValueError):
+        env.create_cache('test.nonsense', 'nonsense')
+
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache['a'] == 1
+    cache['c'] = 3
+
+    assert list(cache) == ['a', 'c']
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+
+
+def test_weak_cache():
+    cache = WeakCache(keep=1)
+    a, b = Value(), Value()
+    cache['a'] = a
+    cache['b'] = b
+    cache['c'] = Value()
+
+    assert cache['c']  # kept alive as most recent
+    del a
+    gc.collect()
+
+    assert set(cache) == {'b', 'c'}
+    cache['b']
+    gc.collect()
+
+    assert set(cache) == {'b'}
+
+
+def test_tier_cache_bounded(patched_default_project, monkeypatch):
+    project, create_tiers = patched_default_project
+    monkeypatch.setattr(Sample, '_cache', WeakCache(keep=5))
+
+    smpl = project['WP1.1a']
+    for i in range(50):
+        project[f'WP1.1b{i}'].name
+
+    gc.collect()
+
+    assert len(Sample._cache) == 6
+    assert project['WP1.1a'] is smpl
+
+
+def test_cache_stats():
+    cache = env.create_cache('test.stats', 'lru', 2)
+    cache['a'] = 'value'
+    cache.get('a')
+    cache.get('b')
+    cache['b'] = 'value'
+    cache['c'] = 'value'
+
+    (info,) = env.cache_stats('test.stats')
+    assert info.name == 'test.stats'
+    assert info.policy == 'lru'
+    assert (info.hits, info.misses, info.evictions, info.size, info.maxsize) == (1, 1, 1, 2, 2)
+    assert info.memory > 0
+
+    env.clear_caches('test.st*')
+    assert len(cache) == 0
+
+    (info,) = env.cache_stats('test.stats')
+    assert (info.hits, info.misses, info.evictions) == (0, 0, 0)
+
+
+def test_create_cache_unnamed():
+    cache = env.create_cache()
+    assert type(cache) is Cache
+    assert cache.name.startswith('cache')
+
+    counter = env.create_counter('test.counter')
+    counter.hit()
+    counter.miss()
+
+    env.clear_caches('test.counter')
+    assert (counter.info().hits, counter.info().misses) == (0, 0)
+
+
+def test_weak_cache_stats():
+    cache = WeakCache()
+    a = Value()
+    cache['a'] = a
+    cache['b'] = Value()
+    gc.collect()
+
+    assert cache.info().evictions == 1
+    cache.clear()
+    assert cache.info().evictions == 1
+
+
+def test_tier_cache_stats(patched_default_project):
+    project, create_tiers = patched_default_project
+    create_tiers(['WP1', 'WP1.1'])
+
+    exp = project['WP1.1']
+    exp.description
+
+    stats = {info.name: info for info in env.cache_stats()}
+    assert stats['tiers.Experiment'].hits >= 1
+    assert stats['meta'].hits + stats['meta'].misses >= 1
+    assert stats['cached_prop'].hits >= 1
+
+    env.clear_caches('tiers.*')
+    assert project['WP1.1'] is not exp
+
+
+def test_weak_cache_threads():
+    cache = WeakCache(keep=4)
+    values = [Value() for i in range(50)]
+    errors = []
+
+    def hammer(offset):
+        try:
+            for i in range(2000):
+                key = (i + offset) % len(values)
+                cache[key] = values[key]
+                cache.get((key + 1) % len(values))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=hammer, args=(i * 7,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(cache._recent) == 4
@@ -1,3 +1,5 @@
+import json
+
 import pytest # type: ignore[import]
 
 from cassini import DEFAULT_TIERS, Project
@@ -61,3 +63,115 @@ def test_add_highlight(mk_project):
     with pytest.raises(AttributeError):
         assert dset.highlights_file is None 
 
+
+
+def test_highlight_store(mk_project):
+    project = mk_project
+
+    exp = project['WP1.1']
+    store = exp.highlights
+
+    assert store is not None
+    assert store.titles() == []
+    assert exp.get_highlights() == {}
+
+    exp.add_highlight('first', [{'data': {'text/plain': 'one'}, 'metadata': {}}])
+    exp.add_highlight('second', [{'data': {'image/png': 'abc' * 1000}, 'metadata': {}}])
+
+    expected = {
+        'first': [{'data': {'text/plain': 'one'}, 'metadata': {}}],
+        'second': [{'data': {'image/png': 'abc' * 1000}, 'metadata': {}}],
+    }
+
+    # other readers, e.g. the JupyterLab extension, read the highlights file directly.
+    assert json.loads(exp.highlights_file.read_text()) == expected
+    assert store.index_file.exists()
+
+    assert store.titles() == ['first', 'second']
+    assert store.info('second').mimetypes == ('image/png',)
+    assert exp.get_highlights() == expected
+
+    # titles are listed without reading payloads.
+    (store.folder / f"{store.key('second')}.json").unlink()
+    assert store.titles() == ['first', 'second']
+
+    exp.add_highlight('first', [{'data': {'text/plain': 'uno'}, 'metadata': {}}])
+    assert store.titles() == ['first', 'second']
+    assert store['first'] == [{'data': {'text/plain': 'uno'}, 'metadata': {}}]
+
+    with pytest.raises(KeyError):
+        exp.add_highlight('first', [], overwrite=False)
+
+    exp.remove_highlight('second')
+    assert list(store) == ['first']
+    assert json.loads(exp.highlights_file.read_text()) == {'first': [{'data': {'text/plain': 'uno'}, 'metadata': {}}]}
+
+    with pytest.raises(KeyError):
+        exp.remove_highlight('second')
+
+
+def test_highlight_store_legacy(mk_project):
+    project = mk_project
+
+    smpl = project['WP1.1a']
+    legacy = {'old': [{'data': {'text/plain': 'old'}, 'metadata': {}}]}
+    smpl.highlights_file.write_text(json.dumps(legacy))
+
+    assert smpl.get_highlights() == legacy
+    assert smpl.highlights.titles() == ['old']
+
+    smpl.add_highlight('new', [{'data': {}}])
+
+    assert json.loads(smpl.highlights_file.read_text()) == {**legacy, 'new': [{'data': {}}]}
+    assert smpl.get_highlights() == {**legacy, 'new': [{'data': {}}]}
+    assert smpl.highlights.index_file.exists()
+
+
+def test_highlight_store_external_write(mk_project):
+    project = mk_project
+
+    exp = project['WP1.1']
+    store = exp.highlights
+
+    exp.add_highlight('first', [{'data': {'text/plain': 'one'}, 'metadata': {}}])
+    exp.add_highlight('second', [{'data': {'text/plain': 'two'}, 'metadata': {}}])
+
+    # e.g. by an older version of cassini, which doesn't update the index.
+    external = {'second': [{'data': {'text/plain': 'deux'}, 'metadata': {}}]}
+    exp.highlights_file.write_text(json.dumps(external))
+
+    assert store.titles() == ['second']
+    assert store['second'] == external['second']
+
+    exp.add_highlight('third', [{'data': {'text/plain': 'three'}, 'metadata': {}}])
+
+    expected = {**external, 'third': [{'data': {'text/plain': 'three'}, 'metadata': {}}]}
+    assert json.loads(exp.highlights_file.read_text()) == expected
+
+    # the index and payloads are rebuilt, and the payload of the removed highlight is gone.
+    fresh = type(store)(store.path)
+    assert fresh.titles() == ['second', 'third']
+    assert dict(fresh.items()) == expected
+    assert json.loads((store.folder / f"{store.key('second')}.json").read_text()) == external['second']
+    assert not (store.folder / f"{store.key('first')}.json").exists()
+
+
+def test_add_highlight_background(mk_project):
+    project = mk_project
+
+    exp = project['WP1.1']
+
+    for i in range(5):
+        exp.add_highlight('bg', [{'data': {'text/plain': str(i)}, 'metadata': {}}], background=True)
+    exp.add_highlight('other', [{'data': {'text/plain': 'other'}, 'metadata': {}}], background=True)
+
+    exp.highlights.flush(timeout=10)
+
+    assert exp.highlights.titles() == ['bg', 'other']
+    assert exp.highlights['bg'] == [{'data': {'text/plain': '4'}, 'metadata': {}}]
+
+    exp.add_highlight('bg', [], overwrite=False, background=True)
+
+    with pytest.raises(KeyError):
+        exp.highlights.flush(timeout=10)
+
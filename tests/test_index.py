@@ -0,0 +1,105 @@
+import json
+
+import pytest # type: ignore[import]
+
+from cassini import DEFAULT_TIERS
+from cassini.testing_utils import get_Project, patched_default_project
+
+
+@pytest.fixture
+def indexed_project(patched_default_project):
+    project, create_tiers = patched_default_project
+    WP1, WP2, exp, smpl = create_tiers(['WP1', 'WP2', 'WP1.1', 'WP1.1a'])
+
+    WP1.description = 'first'
+    exp.conclusion = 'done'
+
+    assert project.index.rebuild(workers=2) == 5
+    return project
+
+
+def test_rebuild(indexed_project):
+    project = indexed_project
+    index = project.index
+
+    assert index.database == project.project_folder / '.cassini' / 'index.sqlite'
+    assert len(index) == 5
+    assert [entry.name for entry in index] == ['Home', 'WP1', 'WP1.1', 'WP1.1a', 'WP2']
+
+    entry = index.get('WP1.1')
+    assert entry.identifiers == ('1', '1')
+    assert entry.tier_type == 'Experiment'
+    assert entry.parent == 'WP1'
+    assert entry.exists
+    assert entry.meta_file == project['WP1.1'].meta_file
+    assert entry.meta['conclusion'] == 'done'
+    assert 'started' in entry.meta
+
+    assert index.get('WP3') is None
+    assert 'WP2' in index
+
+    assert [entry.name for entry in index.entries(parent='WP1')] == ['WP1.1']
+    assert [entry.name for entry in index.entries(tier_type='WorkPackage')] == ['WP1', 'WP2']
+    assert index.tier(entry) is project['WP1.1']
+
+
+def test_refresh(indexed_project):
+    project = indexed_project
+    index = project.index
+
+    assert index.refresh() == 0
+
+    project['WP2'].description = 'changed'
+    project['WP1.1a'].meta_file.unlink()  # removed by another process
+
+    assert index.refresh() == 2
+    assert index.get('WP2').meta['description'] == 'changed'
+    assert index.get('WP1.1a') is None
+
+
+def test_refresh_skips_unchanged(indexed_project, monkeypatch):
+    project = indexed_project
+    index = project.index
+
+    reads = []
+    original_read = index._read_meta_fields
+
+    def counting_read(data):
+        reads.append(data)
+        return original_read(data)
+
+    monkeypatch.setattr(index, '_read_meta_fields', counting_read)
+
+    project['WP2'].description = 'changed'
+    index.refresh()
+
+    assert len(reads) == 1
+
+
+def test_serve(indexed_project):
+    project = indexed_project
+    index = project.index
+    index.serve = True
+
+    WP1 = project['WP1']
+
+    assert [child.name for child in WP1] == ['WP1.1']
+    assert project['WP3'].exists() is False
+
+    # changes from elsewhere aren't seen until a refresh.
+    project['WP1.2'].meta_file.write_text('{}')
+    assert [child.name for child in WP1] == ['WP1.1']
+
+    index.refresh()
+    assert sorted(child.name for child in WP1) == ['WP1.1', 'WP1.2']
+
+    # but changes made here are.
+    project['WP3'].setup_files()
+    assert project['WP3'].exists()
+    assert [tier.name for tier in project.home] == ['WP1', 'WP2', 'WP3']
+
+    project['WP3'].remove_files()
+    assert [tier.name for tier in project.home] == ['WP1', 'WP2']
+
+    index.serve = False
+    assert project['WP1.2'].exists() is False  # no notebook
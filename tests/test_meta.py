@@ -1,11 +1,14 @@
 import json
 import pathlib
 import datetime
+import threading
+from concurrent.futures import ProcessPoolExecutor
 
 from typing_extensions import assert_type
 
 import pytest # type: ignore[import]
-from cassini import HomeTierBase, NotebookTierBase
+from cassini import HomeTierBase, NotebookTierBase, env
+from cassini.backends import FileMetaBackend
 from cassini.meta import MetaAttr, Meta, MetaCache, MetaValidationError
 from cassini.testing_utils import get_Project, patch_project, patched_default_project
 
@@ -384,3 +387,438 @@ def test_meta_manager_cas_field():
     
     _, (_, field) = attr.as_field()
     assert field.json_schema_extra == {'x-cas-field': 'private'}
+
+
+def test_transaction_single_write(mk_meta, monkeypatch):
+    meta = mk_meta
+
+    writes = []
+    original_write = Meta.write
+
+    def counting_write(self):
+        writes.append(self)
+        original_write(self)
+
+    monkeypatch.setattr(Meta, 'write', counting_write)
+
+    with meta.transaction():
+        meta['a_str'] = 'new'
+        meta.an_int = 5
+        meta['extra'] = [1, 2]
+        del meta['a_float']
+
+        assert meta['a_str'] == 'new'
+        assert not writes
+
+    assert len(writes) == 1
+
+    on_disk = json.loads(meta.file.read_text())
+    assert on_disk == {'a_str': 'new', 'an_int': 5, 'extra': [1, 2]}
+
+
+def test_transaction_nested(mk_meta):
+    meta = mk_meta
+
+    with meta.transaction():
+        with meta.transaction():
+            meta['a_str'] = 'inner'
+
+        assert json.loads(meta.file.read_text())['a_str'] == 'val'
+
+    assert json.loads(meta.file.read_text())['a_str'] == 'inner'
+
+
+def test_transaction_invalid_writes_nothing(tmp_path):
+    class Model(MetaCache):
+        strict_str: str = 'default'
+
+    file = tmp_path / 'test.json'
+    file.write_text('{"strict_str": "value"}')
+
+    meta = Meta(file, Model)
+
+    with pytest.raises(MetaValidationError):
+        with meta.transaction():
+            meta['other'] = 'changed'
+            meta['strict_str'] = 10
+
+    assert json.loads(file.read_text()) == {'strict_str': 'value'}
+    assert meta.get('other') is None
+
+
+def test_tier_batch(patched_default_project):
+    project, create_tiers = patched_default_project
+    WP1, = create_tiers(['WP1'])
+
+    with WP1.batch():
+        WP1.description = 'description'
+        WP1.conclusion = 'conclusion'
+
+    on_disk = json.loads(WP1.meta_file.read_text())
+    assert on_disk['description'] == 'description'
+    assert on_disk['conclusion'] == 'conclusion'
+
+
+def test_stat_freshness(mk_meta, monkeypatch):
+    meta = Meta(mk_meta.file, freshness='stat')
+
+    assert meta['a_str'] == 'val'
+
+    monkeypatch.setattr(Meta, 'timeout', 1000)
+
+    reads = []
+    original_fetch = Meta.fetch
+
+    def counting_fetch(self):
+        reads.append(self)
+        return original_fetch(self)
+
+    monkeypatch.setattr(Meta, 'fetch', counting_fetch)
+
+    assert meta['an_int'] == 1
+    assert meta['a_float'] == 1.5
+    assert not reads
+
+    meta.file.write_text(json.dumps({'manual': 1, 'padding': 'changes the size'}))
+
+    assert meta['manual'] == 1
+    assert len(reads) == 1
+
+    meta['manual'] = 2  # our own writes shouldn't trigger a re-read.
+    reads.clear()
+
+    assert meta['manual'] == 2
+    assert not reads
+
+
+def test_trust_freshness(mk_meta, monkeypatch):
+    monkeypatch.setattr(Meta, 'timeout', 0.0)
+
+    meta = Meta(mk_meta.file, freshness='trust')
+
+    assert meta['a_str'] == 'val'
+
+    meta.file.write_text(json.dumps({'a_str': 'changed'}))
+
+    assert meta['a_str'] == 'val'
+
+    meta.invalidate()
+
+    assert meta['a_str'] == 'changed'
+
+
+def test_model_freshness(tmp_path):
+    class Model(MetaCache):
+        meta_freshness = 'stat'
+
+    assert Meta(tmp_path / 'test.json')._freshness == Meta.default_freshness
+    assert Meta(tmp_path / 'test.json', Model)._freshness == 'stat'
+    assert Meta(tmp_path / 'test.json', Model, freshness='trust')._freshness == 'trust'
+
+
+@pytest.mark.parametrize('key', ['freshness', 'validation', 'backend', 'write_behind'])
+def test_policy_names_are_keys(mk_meta, key):
+    mk_meta[key] = 'a value'
+    setattr(mk_meta, key, 'another value')
+
+    assert json.loads(mk_meta.file.read_text())[key] == 'another value'
+    assert Meta(mk_meta.file)[key] == 'another value'
+
+    mk_meta['a_str'] = 'still written'
+    assert Meta(mk_meta.file)['a_str'] == 'still written'
+
+
+def test_cached_validation(mk_meta, monkeypatch):
+    validated = []
+    original_validate = Meta._validate_json
+
+    def counting_validate(self, data, *args):
+        validated.append(data)
+        return original_validate(self, data, *args)
+
+    monkeypatch.setattr(Meta, '_validate_json', counting_validate)
+
+    meta1 = Meta(mk_meta.file, validation='cached')
+    meta2 = Meta(mk_meta.file, validation='cached')
+
+    assert meta1['a_str'] == 'val'
+    assert meta2['a_str'] == 'val'
+    assert len(validated) == 1
+
+    meta1['a_str'] = 'new'  # cassini's own writes are trusted.
+    meta2.fetch()
+    assert meta2['a_str'] == 'new'
+    assert len(validated) == 1
+
+    meta1['a_str'] = 'newer'  # values aren't shared between instances until written
+    assert meta2['a_str'] == 'new'
+
+    contents = mk_meta.file.read_text()
+    mk_meta.file.write_text(contents + ' ')  # same contents, different signature
+    mk_meta.file.write_text(contents)
+    meta2.fetch()
+    assert meta2['a_str'] == 'newer'
+    assert len(validated) == 1
+
+    mk_meta.file.write_text(json.dumps({'a_str': 'changed'}))
+    meta2.fetch()
+    assert meta2['a_str'] == 'changed'
+    assert len(validated) == 2
+
+
+def test_cached_validation_isolated(tmp_path):
+    file = tmp_path / 'test.json'
+    file.write_text(json.dumps({'tags': ['a'], 'info': {'k': 1}}))
+
+    meta1 = Meta(file, validation='cached')
+    meta2 = Meta(file, validation='cached')
+
+    meta1['tags'].append('b')
+    meta1['info']['k'] = 2
+
+    assert meta2['tags'] == ['a']
+    assert meta2['info'] == {'k': 1}
+    assert Meta(file, validation='cached')['tags'] == ['a']
+
+    meta1['tags'] = ['c']
+    meta1['tags'].append('d')  # changed after being written
+
+    assert Meta(file, validation='cached')['tags'] == ['c']
+
+
+def test_cached_validation_errors(tmp_path):
+    class Model(MetaCache):
+        strict_str: str = 'default'
+
+    file = tmp_path / 'test.json'
+    file.write_text('{"strict_str": 10}')
+
+    meta = Meta(file, Model, validation='cached')
+
+    with pytest.raises(MetaValidationError):
+        meta.fetch()
+
+    with pytest.raises(MetaValidationError):
+        meta.fetch()
+
+
+class SlowBackend(FileMetaBackend):
+    def __init__(self):
+        self.release = threading.Event()
+        self.written = []
+
+    def write(self, file, data):
+        self.release.wait(5)
+        self.written.append(data)
+        return super().write(file, data)
+
+
+def test_write_behind(mk_meta):
+    backend = SlowBackend()
+    meta = Meta(mk_meta.file, backend=backend, write_behind=True, freshness='stat')
+
+    meta['a_str'] = 'first'
+    meta['a_str'] = 'second'
+    meta['a_str'] = 'third'
+
+    assert meta['a_str'] == 'third'  # visible straight away
+    assert meta.fetch().a_str == 'third'  # a pending write isn't overwritten by a fetch
+    assert json.loads(mk_meta.file.read_text())['a_str'] == 'val'
+
+    backend.release.set()
+    env.flush_meta()
+
+    assert json.loads(mk_meta.file.read_text())['a_str'] == 'third'
+    assert len(backend.written) <= 2  # the first may already have started, but the rest are coalesced.
+
+
+def test_write_behind_errors(tmp_path):
+    meta = Meta(tmp_path / 'missing' / 'test.json', write_behind=True)
+
+    meta['a'] = 1
+
+    with pytest.raises(FileNotFoundError):
+        Meta.flush()
+
+    Meta.flush()  # errors are only raised once
+
+
+def test_no_version_stored(mk_meta):
+    contents = json.loads(mk_meta.file.read_text())
+    mk_meta.file.write_text(json.dumps({Meta.VERSION_KEY: 3, **contents}))  # written by an earlier version
+
+    assert Meta.VERSION_KEY not in mk_meta.keys()
+
+    mk_meta['a_str'] = 'new'
+    assert json.loads(mk_meta.file.read_text()) == {**contents, 'a_str': 'new'}
+
+
+@pytest.mark.parametrize('validation', ['always', 'cached'])
+def test_external_edit_merged(mk_meta, validation):
+    meta = Meta(mk_meta.file, validation=validation)
+    assert meta['a_str'] == 'val'
+
+    # e.g. edited in a text editor, or the JupyterLab extension, which know nothing of versions.
+    contents = json.loads(mk_meta.file.read_text())
+    mk_meta.file.write_text(json.dumps({**contents, 'an_int': 10, 'edited': 'by hand'}))
+
+    meta['a_str'] = 'ours'
+
+    on_disk = json.loads(mk_meta.file.read_text())
+    assert on_disk == {**contents, 'a_str': 'ours', 'an_int': 10, 'edited': 'by hand'}
+    assert meta['edited'] == 'by hand'
+
+
+def test_reserved_keys(mk_meta):
+    meta = mk_meta
+
+    with pytest.raises(KeyError):
+        meta[Meta.VERSION_KEY] = 10
+
+    with pytest.raises(KeyError):
+        meta[Meta.BLOBS_KEY] = {}
+
+    assert Meta.VERSION_KEY not in meta.keys()
+
+
+def test_concurrent_updates_merged(mk_meta):
+    meta1 = Meta(mk_meta.file)
+    meta2 = Meta(mk_meta.file)
+
+    with meta2.transaction():
+        meta2['an_int'] = 2
+        del meta2['a_float']
+
+        meta1['a_str'] = 'from 1'  # written while meta2 is in the middle of its transaction
+
+    on_disk = json.loads(mk_meta.file.read_text())
+    assert on_disk == {'a_str': 'from 1', 'an_int': 2}
+    assert meta2['a_str'] == 'from 1'
+
+
+@pytest.mark.parametrize('write_behind', [False, True])
+def test_unchanged_write_keeps_newer(mk_meta, write_behind):
+    meta1 = Meta(mk_meta.file, write_behind=write_behind)
+    meta2 = Meta(mk_meta.file)
+
+    meta1.fetch()
+    meta2['a_str'] = 'from 2'
+
+    meta1.write()  # nothing changed, so mustn't overwrite meta2's write with stale contents.
+    Meta.flush()
+
+    assert json.loads(mk_meta.file.read_text())['a_str'] == 'from 2'
+
+
+def _set_keys(file, prefix, n):
+    meta = Meta(file)
+    for i in range(n):
+        meta[f'{prefix}{i}'] = i
+
+
+def test_concurrent_processes(tmp_path):
+    file = tmp_path / 'test.json'
+    file.write_text('{}')
+
+    with ProcessPoolExecutor(4) as executor:
+        list(executor.map(_set_keys, [file] * 4, 'abcd', [10] * 4))
+
+    on_disk = json.loads(file.read_text())
+    assert on_disk == {f'{prefix}{i}': i for prefix in 'abcd' for i in range(10)}
+
+
+@pytest.fixture
+def small_blobs(monkeypatch):
+    monkeypatch.setattr(Meta, 'blob_threshold', 100)
+
+
+def test_blobs_off_by_default(mk_meta):
+    big = list(range(100_000))
+
+    mk_meta['big'] = big
+
+    assert json.loads(mk_meta.file.read_text())['big'] == big
+    assert not mk_meta.blob_folder.exists()
+
+
+def test_blobs(mk_meta, small_blobs):
+    big = list(range(100))
+
+    mk_meta['big'] = big
+    assert mk_meta['big'] == big
+
+    on_disk = json.loads(mk_meta.file.read_text())
+    assert 'big' not in on_disk
+    digest = on_disk[Meta.BLOBS_KEY]['big']
+    blob = mk_meta.blob_folder / f'{digest}.json'
+    assert json.loads(blob.read_text()) == big
+
+    other = Meta(mk_meta.file)
+    assert other['a_str'] == 'val'
+    assert 'big' in other.keys()
+    assert 'big' not in other._loaded
+
+    other['a_str'] = 'new'  # blob left alone if not loaded
+    assert json.loads(mk_meta.file.read_text())[Meta.BLOBS_KEY] == {'big': digest}
+    assert 'big' not in other._loaded
+    assert other['big'] == big
+
+    other['big'] = big + [1]  # replaced blob is removed
+    assert not blob.exists()
+    assert mk_meta.fetch() and mk_meta['big'] == big + [1]
+
+    mk_meta['big'] = [1]  # small values are stored inline
+    assert json.loads(mk_meta.file.read_text())['big'] == [1]
+    assert list(mk_meta.blob_folder.iterdir()) == []
+
+    mk_meta['big'] = big
+    del mk_meta['big']
+    assert mk_meta.get('big') is None
+    assert Meta.BLOBS_KEY not in json.loads(mk_meta.file.read_text())
+    assert list(mk_meta.blob_folder.iterdir()) == []
+
+
+def test_blobs_lazy(mk_meta, small_blobs, monkeypatch):
+    mk_meta['big'] = list(range(100))
+
+    reads = []
+    original_read_bytes = pathlib.Path.read_bytes
+
+    def counting_read_bytes(self):
+        reads.append(self)
+        return original_read_bytes(self)
+
+    monkeypatch.setattr(pathlib.Path, 'read_bytes', counting_read_bytes)
+
+    other = Meta(mk_meta.file)
+    assert other['a_str'] == 'val'
+    assert reads == [mk_meta.file]
+
+    assert other['big'] == list(range(100))
+    assert reads[1].parent == mk_meta.blob_folder
+
+
+def test_blobs_external(tmp_path):
+    class MyClass:
+        def __init__(self):
+            self.meta = Meta.create_meta(tmp_path / 'test.json', owner=self)
+
+        small = MetaAttr(str, str, external=True)
+
+    obj = MyClass()
+    obj.small = 'small value'
+
+    assert 'small' not in json.loads(obj.meta.file.read_text())
+    assert MyClass().small == 'small value'
+
+
+def test_blobs_merged(mk_meta, small_blobs):
+    meta1 = Meta(mk_meta.file)
+    meta2 = Meta(mk_meta.file)
+
+    with meta2.transaction():
+        meta2['big'] = list(range(100))
+        meta1['a_str'] = 'from 1'
+
+    assert Meta(mk_meta.file)['big'] == list(range(100))
+    assert meta2['a_str'] == 'from 1'
@@ -0,0 +1,76 @@
+import threading
+
+import pytest # type: ignore[import]
+
+from cassini.testing_utils import get_Project, patched_default_project
+
+
+def test_complete(patched_default_project):
+    project, create_tiers = patched_default_project
+    create_tiers(['WP1', 'WP1.1', 'WP1.1a', 'WP1.1b', 'WP1.10', 'WP10'])
+
+    assert project.complete('WP1') == ['WP1', 'WP1.1', 'WP1.10', 'WP1.1a', 'WP1.1b', 'WP10']
+    assert project.complete('WP1.1') == ['WP1.1', 'WP1.10', 'WP1.1a', 'WP1.1b']
+    assert project.complete('WP1.1', limit=2) == ['WP1.1', 'WP1.10']
+    assert project.complete('WP2') == []
+    assert project.complete('', limit=None)[0] == 'Home'
+    assert len(project.names) == 7
+
+
+def test_exists_name(patched_default_project):
+    project, create_tiers = patched_default_project
+    WP1, exp = create_tiers(['WP1', 'WP1.1'])
+
+    assert project.exists_name('WP1.1')
+    assert not project.exists_name('WP1.2')
+    assert not project.exists_name('not a name')
+
+    smpl = project['WP1.1a']
+    smpl.setup_files()
+
+    assert project.exists_name('WP1.1a')
+    assert project.complete('WP1.1a') == ['WP1.1a']
+
+    smpl.remove_files()
+
+    assert not project.exists_name('WP1.1a')
+    assert project.complete('WP1.1') == ['WP1.1']
+
+
+def test_key_completions(patched_default_project):
+    project, create_tiers = patched_default_project
+    create_tiers(['WP1', 'WP2'])
+
+    project._ipython_key_completions_()
+    thread = project.names.build_in_background()
+
+    if thread:
+        thread.join()
+
+    assert project._ipython_key_completions_() == ['Home', 'WP1', 'WP2']
+
+
+def test_key_completions_dont_block(patched_default_project, monkeypatch):
+    project, create_tiers = patched_default_project
+    create_tiers(['WP1', 'WP2'])
+
+    release = threading.Event()
+    walk = type(project).walk
+
+    def slow_walk(self, *args, **kwargs):
+        for tier in walk(self, *args, **kwargs):
+            yield tier
+            release.wait(5)
+
+    monkeypatch.setattr(type(project), 'walk', slow_walk)
+
+    found = project._ipython_key_completions_()
+    assert len(found) < 3
+    assert not project.names._built
+
+    thread = project.names.build_in_background()
+    release.set()
+    thread.join()
+
+    assert project._ipython_key_completions_() == ['Home', 'WP1', 'WP2']
+    assert project.names.complete('WP') == ['WP1', 'WP2']
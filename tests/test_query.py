@@ -0,0 +1,108 @@
+import datetime
+
+import pytest # type: ignore[import]
+
+from cassini import Sample, Experiment
+from cassini.query import QueryRow
+from cassini.testing_utils import get_Project, patched_default_project
+
+
+@pytest.fixture(params=['scan', 'index'])
+def query_project(request, patched_default_project):
+    project, create_tiers = patched_default_project
+    WP1, exp, a, b, c = create_tiers(['WP1', 'WP1.1', 'WP1.1a', 'WP1.1b', 'WP1.1c'])
+
+    a.description = 'Annealed at 400C'
+    a.started = datetime.datetime(2024, 3, 5, tzinfo=datetime.timezone.utc)
+    b.description = 'as deposited'
+    b.started = datetime.datetime(2024, 2, 1, tzinfo=datetime.timezone.utc)
+    c.description = 'anneal again'
+    c.started = datetime.datetime(2024, 3, 20, tzinfo=datetime.timezone.utc)
+    c.conclusion = 'cracked'
+
+    if request.param == 'index':
+        project.index.rebuild(workers=2)
+        project.index.serve = True
+
+    return project
+
+
+def test_query_where(query_project):
+    project = query_project
+    march = datetime.datetime(2024, 3, 1, tzinfo=datetime.timezone.utc)
+
+    query = project.query(Sample).where(started__gte=march, description__icontains='anneal')
+    assert [smpl.name for smpl in query] == ['WP1.1a', 'WP1.1c']
+    assert query.answered_by_index == project.index.serve
+
+    assert [smpl.name for smpl in project.query(Sample).where(started__lt='2024-03-01T00:00:00Z')] == ['WP1.1b']
+    assert [smpl.name for smpl in project.query(Sample).where(conclusion='cracked')] == ['WP1.1c']
+    assert [smpl.name for smpl in project.query(Sample).where(conclusion__isnull=True)] == ['WP1.1a', 'WP1.1b']
+    assert [smpl.name for smpl in project.query(Sample).where(name__in=['WP1.1b', 'WP1.1c'])] == ['WP1.1b', 'WP1.1c']
+    assert project.query(Sample).where(description__contains='anneal').count() == 1
+    assert project.query(Experiment).count() == 1
+
+
+def test_query_order_fields(query_project):
+    project = query_project
+
+    query = project.query(Sample).order_by('-started').limit(2).fields('description', 'conclusion')
+    rows = list(query)
+
+    assert rows == [
+        QueryRow('WP1.1c', ('1', '1', 'c'), {'description': 'anneal again', 'conclusion': 'cracked'}),
+        QueryRow('WP1.1a', ('1', '1', 'a'), {'description': 'Annealed at 400C', 'conclusion': None}),
+    ]
+
+    assert [smpl.name for smpl in project.query(Sample).order_by('conclusion', 'started')] == [
+        'WP1.1c', 'WP1.1b', 'WP1.1a'
+    ]
+    assert [smpl.name for smpl in project.query(Sample).order_by('-conclusion', '-name')] == [
+        'WP1.1c', 'WP1.1b', 'WP1.1a'
+    ]
+
+    first = project.query(Sample).order_by('started').first()
+    assert first is project['WP1.1b']
+    assert first.started == datetime.datetime(2024, 2, 1, tzinfo=datetime.timezone.utc)
+
+
+def test_query_unindexed_keys(patched_default_project):
+    project, create_tiers = patched_default_project
+    WP1, exp, smpl = create_tiers(['WP1', 'WP1.1', 'WP1.1a'])
+
+    project.index.rebuild()
+    project.index.serve = True
+
+    smpl.meta['custom'] = 5
+
+    query = project.query(Sample).where(custom__gt=3)
+    assert not query.answered_by_index
+    assert list(query) == [smpl]
+
+
+
+def test_query_limit_lazy(patched_default_project, monkeypatch):
+    from cassini.query import Query
+
+    project, create_tiers = patched_default_project
+    create_tiers(['WP1', 'WP1.1'] + [f'WP1.1{chr(ord("a") + i)}' for i in range(20)])
+
+    taken = []
+    tiers = Query._tiers
+
+    def counted(self):
+        for tier in tiers(self):
+            taken.append(tier)
+            yield tier
+
+    monkeypatch.setattr(Query, '_tiers', counted)
+
+    query = project.query(Sample, use_index=False, workers=2).fields('description')
+    query.batch_size = 2
+
+    assert len(list(query.limit(1))) == 1
+    assert len(taken) <= (2 * 2 + 1) * 2  # only the batches in flight, not all 20 samples.
+
+    taken.clear()
+    assert len(list(query)) == 20
+    assert len(taken) == 20
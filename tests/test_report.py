@@ -0,0 +1,108 @@
+import base64
+import json
+
+import pytest # type: ignore[import]
+
+from cassini import DEFAULT_TIERS
+from cassini import report as report_module
+from cassini.report import HighlightsReport
+from cassini.testing_utils import get_Project
+
+
+PNG = base64.b64encode(b'\x89PNG fake image').decode()
+
+
+@pytest.fixture
+def mk_project(get_Project, tmp_path):
+    Project = get_Project
+    project = Project(DEFAULT_TIERS, tmp_path / 'project')
+    project.setup_files()
+    project['WP1'].setup_files()
+
+    for name in ['WP1.1', 'WP1.2']:
+        exp = project[name]
+        exp.setup_files()
+        exp.add_highlight('Figure', [{'data': {'image/png': PNG, 'text/plain': '<Figure>'}, 'metadata': {}}])
+
+    project['WP1.1'].add_highlight('Notes', [{'data': {'text/markdown': '**bold**', 'text/plain': 'bold'}, 'metadata': {}}])
+    return project
+
+
+def test_highlights_report(mk_project, tmp_path):
+    project = mk_project
+    out = tmp_path / 'report'
+
+    document = project.highlights_report(project['WP1'], out)
+
+    assert document == out / 'index.html'
+    text = document.read_text()
+    assert text.index('WP1.1') < text.index('Notes') < text.index('WP1.2')
+    assert 'bold' in text
+    assert '&lt;Figure&gt;' not in text  # only the preferred mimetype is rendered.
+
+    images = list((out / 'images').iterdir())
+    assert len(images) == 1  # the same image in both experiments is written once.
+    assert images[0].read_bytes() == b'\x89PNG fake image'
+    assert f'images/{images[0].name}' in text
+
+    manifest = json.loads((out / 'manifest.json').read_text())
+    assert list(manifest['tiers']) == ['WP1.1', 'WP1.2']
+
+
+def test_highlights_report_incremental(mk_project, tmp_path):
+    project = mk_project
+    report = HighlightsReport(project, tmp_path / 'report')
+
+    assert report.build(project['WP1']) == 2
+    assert report.build(project['WP1']) == 0
+
+    project['WP1.2'].add_highlight('Table', [{'data': {'text/html': '<table id="t"></table>'}, 'metadata': {}}])
+
+    assert report.build(project['WP1']) == 1
+    assert '<table id="t"></table>' in report.document.read_text()
+
+    for name in ['WP1.1', 'WP1.2']:
+        project[name].remove_highlight('Figure')
+
+    assert report.build(project['WP1']) == 2
+    assert list((tmp_path / 'report' / 'images').iterdir()) == []
+
+    project['WP1.1'].remove_highlight('Notes')
+
+    assert report.build(project['WP1']) == 1
+    assert 'WP1.1' not in report.document.read_text()
+    assert not (tmp_path / 'report' / 'tiers' / 'WP1.1.html').exists()
+
+
+def test_highlights_report_markdown(mk_project, tmp_path):
+    project = mk_project
+
+    document = project.highlights_report(None, tmp_path / 'report', format='markdown')
+
+    assert document.name == 'index.md'
+    text = document.read_text()
+    assert '## WP1.1' in text
+    assert '### Notes' in text
+    assert '**bold**' in text
+    assert '![](images/' in text
+
+    # a different format is rendered from scratch.
+    assert HighlightsReport(project, tmp_path / 'report').build() == 2
+
+    with pytest.raises(ValueError):
+        HighlightsReport(project, tmp_path / 'report', format='pdf')
+
+
+def test_highlights_report_no_mistune(mk_project, tmp_path, monkeypatch):
+    project = mk_project
+    out = tmp_path / 'report'
+
+    monkeypatch.setattr(report_module, 'have_mistune', lambda: False)
+    document = project.highlights_report(None, out)
+
+    assert '<pre class="markdown">**bold**</pre>' in document.read_text()
+    assert HighlightsReport(project, out)._read_manifest()
+
+    # installing mistune means markdown is rendered differently, so everything is re-rendered.
+    monkeypatch.setattr(report_module, 'have_mistune', lambda: True)
+    assert not HighlightsReport(project, out)._read_manifest()
@@ -0,0 +1,94 @@
+import pytest # type: ignore[import]
+
+from cassini import Experiment, Sample
+from cassini.search import tokenize
+from cassini.testing_utils import get_Project, patched_default_project
+
+
+@pytest.fixture
+def search_project(patched_default_project):
+    project, create_tiers = patched_default_project
+    WP1, exp, a, b = create_tiers(['WP1', 'WP1.1', 'WP1.1a', 'WP1.1b'])
+
+    exp.description = 'XRD of annealed films'
+    exp.conclusion = 'The XRD peak shift is due to strain'
+    a.description = 'annealing at 400C'
+    b.description = 'as deposited'
+    b.add_highlight('Peak fitting', [{'data': {'text/markdown': ['The peak ', 'moved'], 'image/png': 'abc'}, 'metadata': {}}])
+
+    assert project.search_index.update(workers=2) == 4
+    return project
+
+
+def test_tokenize():
+    assert tokenize('The XRD peak-shift, at 400C!') == ['the', 'xrd', 'peak', 'shift', 'at', '400c']
+
+
+def test_search(search_project):
+    project = search_project
+
+    assert project.search_index.database == project.project_folder / '.cassini' / 'search.sqlite'
+    assert len(project.search_index) == 4
+
+    results = project.search('XRD peak shift')
+    assert [result.name for result in results] == ['WP1.1', 'WP1.1b']
+    assert results[0].score > results[1].score
+    assert results[0].tier_type == 'Experiment'
+    assert results[0].identifiers == ('1', '1')
+
+    assert [result.name for result in project.search('peak', tier_types=[Sample])] == ['WP1.1b']
+    assert [result.name for result in project.search('moved')] == ['WP1.1b']
+    assert {result.name for result in project.search('anneal*')} == {'WP1.1', 'WP1.1a'}
+    assert project.search('annealed', tier_types=[Sample]) == []
+    assert project.search('nothing') == []
+    assert project.search('') == []
+
+
+def test_search_update(search_project):
+    project = search_project
+    index = project.search_index
+
+    assert index.update() == 0
+
+    smpl = project['WP1.1a']
+    smpl.conclusion = 'Cracked after the XRD run'
+    project['WP1.1b'].remove_files()
+
+    assert index.update() == 2
+    assert len(index) == 3
+    assert [result.name for result in project.search('cracked')] == ['WP1.1a']
+    assert project.search('moved') == []
+
+    assert index.rebuild() == 3
+
+
+def test_search_prefix_scores(search_project):
+    project = search_project
+
+    smpl = project['WP1.1a']
+    smpl.conclusion = 'annealed, annealing, anneals, annealer'
+    project.search_index.update()
+
+    # more matching terms shouldn't lower a tier's score, even when the prefix matches more terms than there are tiers.
+    results = project.search('anneal*')
+    assert results[0].name == 'WP1.1a'
+    assert all(result.score > 0 for result in results)
+
+
+def test_search_text_skips_images(search_project, monkeypatch):
+    project = search_project
+    exp = project['WP1.1']
+    monkeypatch.setattr(exp.highlights, 'blob_threshold', 4 * 1024)
+
+    exp.add_highlight('Figure', [{'data': {'image/png': 'abc' * 10000, 'text/plain': '<Figure>'}, 'metadata': {}}])
+    exp.add_highlight('Notes', [{'data': {'text/markdown': 'long ' * 2000}, 'metadata': {}}])
+
+    read = []
+    get = type(project.blobs).get
+    monkeypatch.setattr(type(project.blobs), 'get', lambda self, digest: read.append(digest) or get(self, digest))
+
+    text = list(project.search_index.text(exp))
+
+    assert '<Figure>' in text
+    assert 'long ' * 2000 in text  # text outputs in blobs are still read.
+    assert read and read == list(exp.highlights.info('Notes').blobs)
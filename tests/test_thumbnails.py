@@ -0,0 +1,111 @@
+import base64
+import io
+
+import pytest # type: ignore[import]
+
+from cassini import DEFAULT_TIERS
+from cassini import thumbnails as thumbnails_module
+from cassini.config import config
+from cassini.testing_utils import get_Project
+
+
+IMAGE = base64.b64encode(b'full size image' * 1000).decode()
+
+
+@pytest.fixture
+def mk_exp(get_Project, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'HIGHLIGHT_BLOB_THRESHOLD', 4 * 1024)
+
+    Project = get_Project
+    project = Project(DEFAULT_TIERS, tmp_path)
+    project.setup_files()
+    project['WP1'].setup_files()
+
+    exp = project['WP1.1']
+    exp.setup_files()
+    exp.add_highlight('Figure', [{'data': {'image/png': IMAGE, 'text/plain': '<Figure>'}, 'metadata': {}}])
+    return exp
+
+
+@pytest.fixture
+def fake_pillow(monkeypatch):
+    calls = []
+
+    def downscale(data, mimetype, max_size):
+        calls.append(data)
+        return b'thumbnail'
+
+    monkeypatch.setattr(thumbnails_module, 'have_pillow', lambda: True)
+    monkeypatch.setattr(thumbnails_module, '_downscale', downscale)
+    return calls
+
+
+def test_thumbnails(mk_exp, fake_pillow):
+    exp = mk_exp
+    project = exp.project
+    thumbnails = project.thumbnails
+
+    assert thumbnails.enabled
+
+    thumb = exp.highlights.load('Figure', thumbnails=thumbnails)
+    assert thumb == [{'data': {'image/png': base64.b64encode(b'thumbnail').decode(), 'text/plain': '<Figure>'}, 'metadata': {}}]
+    assert fake_pillow == [b'full size image' * 1000]
+
+    # cached under the digest of the image's blob.
+    digest, = exp.highlights.info('Figure').blobs
+    assert thumbnails.key(IMAGE) == digest
+    assert list(thumbnails.folder.rglob(f'{digest}-*.png'))
+
+    assert exp.highlights.load('Figure', thumbnails=thumbnails) == thumb
+    assert len(fake_pillow) == 1
+
+    assert exp.highlights['Figure'][0]['data']['image/png'] == IMAGE
+
+    with pytest.raises(ValueError):
+        thumbnails.get('image/gif', IMAGE)
+
+
+def test_thumbnails_disabled(mk_exp, monkeypatch):
+    exp = mk_exp
+    thumbnails = exp.project.thumbnails
+
+    monkeypatch.setattr(thumbnails_module, 'have_pillow', lambda: False)
+    assert not thumbnails.enabled
+    assert exp.highlights.load('Figure', thumbnails=thumbnails) == exp.highlights['Figure']
+
+    monkeypatch.setattr(thumbnails_module, 'have_pillow', lambda: True)
+    monkeypatch.setattr(thumbnails, 'max_size', None)
+    assert not thumbnails.enabled
+
+
+def test_downscale():
+    Image = pytest.importorskip('PIL.Image')
+
+    buffer = io.BytesIO()
+    Image.new('RGB', (1000, 500)).save(buffer, 'PNG')
+
+    thumb = thumbnails_module._downscale(buffer.getvalue(), 'image/png', 100)
+
+    with Image.open(io.BytesIO(thumb)) as image:
+        assert image.size == (100, 50)
+        assert image.format == 'PNG'
+
+
+def test_thumbnails_corrupt(get_Project, tmp_path):
+    pytest.importorskip('PIL.Image')
+
+    Project = get_Project
+    project = Project(DEFAULT_TIERS, tmp_path)
+    project.setup_files()
+    project['WP1'].setup_files()
+
+    exp = project['WP1.1']
+    exp.setup_files()
+    corrupt = base64.b64encode(b'\x89PNG\r\n\x1a\n not really a png' * 100).decode()
+    exp.add_highlight('Figure', [{'data': {'image/png': corrupt}, 'metadata': {}}])
+
+    thumbnails = project.thumbnails
+    assert exp.highlights.load('Figure', thumbnails=thumbnails) == exp.highlights['Figure']
+    assert not list(thumbnails.folder.rglob('*.png'))
+
+    assert thumbnails.get('image/png', 'not base64!') == 'not base64!'
@@ -111,3 +111,27 @@ def test_find_project(cas_project, refresh_project):
     assert project.test_project
     assert project.project_folder == cas_project[2]
 
+
+
+
+@pytest.mark.skipif(sys.platform != 'win32', reason='msvcrt locking is Windows only')
+def test_win_lock_file_timeout(tmp_path, monkeypatch):
+    from cassini import utils
+
+    monkeypatch.setattr(utils, 'LOCK_TIMEOUT', 0.5)
+    path = tmp_path / 'file.lock'
+
+    with utils.FileLock(path):
+        fd = os.open(path, os.O_RDWR)
+        try:
+            with pytest.raises(TimeoutError):
+                utils.lock_file(fd)
+        finally:
+            os.close(fd)
+
+    fd = os.open(path, os.O_RDWR)
+    try:
+        utils.lock_file(fd)
+        utils.unlock_file(fd)
+    finally:
+        os.close(fd)